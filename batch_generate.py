@@ -0,0 +1,259 @@
+"""
+Génération headless de profils OpenHoldem en lot
+Transforme un répertoire de fichiers de paramètres JSON (format export_settings)
+en fichiers .ohf en répartissant le travail sur un pool de processus
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from generators.profile_builder import ProfileBuilder, load_settings
+from generators.profile_writer import FileSink, HashSink, TeeSink, write_chunks
+from generators.section_cache import SectionCache
+from openppl.callgraph import analyze_call_graph, call_graph_errors
+from openppl.complexity import analyze_profile, check_budgets, load_budgets
+from openppl.dead_code import eliminate_dead_functions, load_library
+from openppl.minify import NAME_MAP_SUFFIX, minify_profile, write_name_map
+
+# Constructeur de profils propre à chaque processus de travail
+_builder = None
+
+# Bibliothèque de scénarios, racines de l'élimination des fonctions inaccessibles
+_library = None
+
+
+def _get_builder():
+    """
+    Renvoie le constructeur de profils du processus courant, créé à la demande
+    Le cache de sections est partagé par tous les profils traités par ce processus
+
+    Returns:
+        ProfileBuilder: Constructeur réutilisé pour toutes les tâches du processus
+    """
+    global _builder
+    if _builder is None:
+        _builder = ProfileBuilder(SectionCache())
+    return _builder
+
+
+def generate_one(settings_path, output_path, eliminate_dead_code=False, minify=False, short_names=False,
+                 budgets=None, check_calls=False):
+    """
+    Génère un profil à partir d'un fichier de paramètres et l'écrit sur disque
+
+    Args:
+        settings_path (str): Chemin du fichier de paramètres JSON
+        output_path (str): Chemin du fichier .ohf à écrire
+        eliminate_dead_code (bool): Supprimer les fonctions inaccessibles avant l'écriture
+        minify (bool): Écrire la version de production (sans commentaires ni lignes vides)
+        short_names (bool): Raccourcir aussi les noms des fonctions internes (correspondance
+            écrite dans <output_path>.names.json)
+        budgets (dict): Budgets de complexité par street (voir openppl.complexity); un
+            dépassement est une erreur, le profil est tout de même écrit
+        check_calls (bool): Les symboles indéfinis et cycles d'appel sont des erreurs
+            (voir openppl.callgraph), le profil est tout de même écrit
+
+    Returns:
+        tuple: (settings_path, output_path, taille en octets, durée en secondes, erreur ou None)
+    """
+    start = time.perf_counter()
+    try:
+        settings = load_settings(settings_path)
+        hash_sink = HashSink()
+        errors = []
+        with FileSink(output_path) as file_sink:
+            if eliminate_dead_code or minify or short_names or budgets or check_calls:
+                # L'analyse du graphe d'appel et la minification demandent le texte complet
+                profile = _get_builder().generate_profile(settings)
+                if eliminate_dead_code:
+                    profile, _ = eliminate_dead_functions(profile, _get_library())
+                if budgets:
+                    errors.extend("over budget: " + violation
+                                  for violation in check_budgets(analyze_profile(profile, _get_library()), budgets))
+                if check_calls:
+                    errors.extend(call_graph_errors(analyze_call_graph(profile, _get_library())))
+                if minify or short_names:
+                    profile, report = minify_profile(profile, short_names, _get_library())
+                    if short_names:
+                        write_name_map(output_path + NAME_MAP_SUFFIX, report.renamed)
+                write_chunks([profile], TeeSink(file_sink, hash_sink))
+            else:
+                _get_builder().write_profile(settings, TeeSink(file_sink, hash_sink))
+        if errors:
+            return settings_path, output_path, hash_sink.size, time.perf_counter() - start, "; ".join(errors)
+        return settings_path, output_path, hash_sink.size, time.perf_counter() - start, None
+    except Exception as e:
+        return settings_path, output_path, 0, time.perf_counter() - start, str(e)
+
+
+def _get_library():
+    """
+    Renvoie la bibliothèque de scénarios, chargée une fois par processus
+
+    Returns:
+        str: Texte de custom_function_library.ohf
+    """
+    global _library
+    if _library is None:
+        _library = load_library()
+    return _library
+
+
+def find_settings_files(input_dir, pattern="*.json"):
+    """
+    Liste les fichiers de paramètres à traiter, triés par nom
+
+    Args:
+        input_dir (str): Répertoire contenant les fichiers JSON
+        pattern (str): Motif glob des fichiers à traiter
+
+    Returns:
+        list: Chemins des fichiers de paramètres
+    """
+    return sorted(glob.glob(os.path.join(input_dir, pattern)))
+
+
+def output_path_for(settings_path, output_dir):
+    """
+    Calcule le chemin du .ohf correspondant à un fichier de paramètres
+
+    Args:
+        settings_path (str): Chemin du fichier de paramètres JSON
+        output_dir (str): Répertoire de sortie
+
+    Returns:
+        str: Chemin du fichier .ohf
+    """
+    base_name = os.path.splitext(os.path.basename(settings_path))[0]
+    return os.path.join(output_dir, base_name + ".ohf")
+
+
+def run_batch(settings_files, output_dir, workers=None, eliminate_dead_code=False, minify=False, short_names=False,
+              budgets=None, check_calls=False):
+    """
+    Génère tous les profils sur un pool de processus
+
+    Args:
+        settings_files (list): Fichiers de paramètres à traiter
+        output_dir (str): Répertoire de sortie des fichiers .ohf
+        workers (int): Nombre de processus (par défaut: nombre de CPU)
+        eliminate_dead_code (bool): Supprimer les fonctions inaccessibles de chaque profil
+        minify (bool): Écrire la version de production de chaque profil
+        short_names (bool): Raccourcir les noms des fonctions internes (voir generate_one)
+        budgets (dict): Budgets de complexité par street (None: pas de contrôle)
+        check_calls (bool): Faire échouer les profils qui appellent un symbole indéfini ou bouclent
+
+    Returns:
+        list: Résultats de generate_one, dans l'ordre des fichiers d'entrée
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(generate_one, path, output_path_for(path, output_dir),
+                            eliminate_dead_code, minify, short_names, budgets, check_calls): path
+            for path in settings_files
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result[0]] = result
+            if result[4] is not None:
+                print(f"FAILED {result[0]}: {result[4]}", file=sys.stderr)
+
+    return [results[path] for path in settings_files]
+
+
+def format_summary(results, elapsed):
+    """
+    Construit le résumé de débit affiché en fin de traitement
+
+    Args:
+        results (list): Résultats de run_batch
+        elapsed (float): Durée totale en secondes
+
+    Returns:
+        str: Résumé lisible
+    """
+    succeeded = [result for result in results if result[4] is None]
+    failed = len(results) - len(succeeded)
+    total_bytes = sum(result[2] for result in succeeded)
+    cpu_time = sum(result[3] for result in results)
+
+    lines = [
+        f"Profiles generated: {len(succeeded)}/{len(results)} ({failed} failed)",
+        f"Total output: {total_bytes / 1024:.1f} KB",
+        f"Wall time: {elapsed:.2f}s (worker time: {cpu_time:.2f}s)",
+    ]
+    if elapsed > 0:
+        lines.append(f"Throughput: {len(succeeded) / elapsed:.1f} profiles/s, "
+                     f"{total_bytes / 1024 / 1024 / elapsed:.2f} MB/s")
+    if succeeded:
+        lines.append(f"Mean time per profile: {1000 * cpu_time / len(results):.1f} ms")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate OpenHoldem profiles (.ohf) from a directory of exported settings JSON files."
+    )
+    parser.add_argument("input_dir", help="Directory containing settings JSON files")
+    parser.add_argument("-o", "--output-dir", help="Directory for generated .ohf files (default: input_dir)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--pattern", default="*.json", help="Glob pattern for settings files (default: *.json)")
+    parser.add_argument("--eliminate-dead-code", action="store_true",
+                        help="Drop functions unreachable from the street entry points and the scenario library")
+    parser.add_argument("--minify", action="store_true",
+                        help="Write production profiles without comments, banners or blank lines")
+    parser.add_argument("--short-names", action="store_true",
+                        help=f"Also shorten internal function names (implies --minify; map in <profile>{NAME_MAP_SUFFIX})")
+    parser.add_argument("--budgets",
+                        help="Complexity budget JSON file (see openppl.complexity); profiles over budget fail")
+    parser.add_argument("--check-calls", action="store_true",
+                        help="Fail profiles that call undefined functions or contain call cycles (see openppl.callgraph)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la génération en lot
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (0 si tous les profils ont été générés)
+    """
+    args = parse_args(argv)
+    output_dir = args.output_dir or args.input_dir
+
+    settings_files = find_settings_files(args.input_dir, args.pattern)
+    if not settings_files:
+        print(f"No settings files matching {args.pattern} in {args.input_dir}", file=sys.stderr)
+        return 1
+
+    budgets = load_budgets(args.budgets) if args.budgets else None
+    start = time.perf_counter()
+    results = run_batch(settings_files, output_dir, args.workers, args.eliminate_dead_code,
+                        args.minify, args.short_names, budgets, args.check_calls)
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(results, elapsed))
+    return 0 if all(result[4] is None for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Mesure des décisions par seconde de l'évaluateur local et du profil compilé
+Évalue le profil des paramètres par défaut (ou un fichier .ohf) sur des situations
+aléatoires reproductibles avec openppl.evaluator (parcours de l'arbre) et
+openppl.compiler (fonctions Python générées), vérifie que les décisions sont
+identiques, puis mesure le coût de compilation et du cache.
+
+Usage: python -m benchmarks.bench_evaluator [-n STATES] [--profile FILE.ohf]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_generators import DEFAULT_SETTINGS_FILE
+from generators.profile_builder import ProfileBuilder, load_settings
+from openppl.compiler import CompileCache, compile_profile
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.evaluator import Evaluator
+
+# Symboles de position: un seul vaut 1 dans une situation
+POSITIONS = (
+    "InEarlyPosition1", "InEarlyPosition2", "InEarlyPosition3", "InMiddlePosition1", "InMiddlePosition2",
+    "InMiddlePosition3", "InCutOff", "InButton", "InSmallBlind", "InBigBlind",
+)
+
+# Préfixes des symboles booléens
+BOOLEAN_PREFIXES = ("Have", "In", "Bot", "Is")
+
+# Valeurs tirées pour les autres symboles (compteurs, rangs de cartes, montants)
+COUNTER_VALUES = (0, 0, 1, 1, 2, 3, 5, 8, 11, 14)
+
+
+def random_states(symbols, count, seed=0):
+    """
+    Tire des situations aléatoires qui fournissent tous les symboles d'un profil
+
+    Args:
+        symbols (tuple): Symboles à fournir (CompiledProfile.slots)
+        count (int): Nombre de situations
+        seed (int): Graine du générateur aléatoire (résultats reproductibles)
+
+    Returns:
+        list: Situations {symbole: valeur}, betround compris
+    """
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        state = {}
+        for name in symbols:
+            if name == "handrank169":
+                state[name] = rng.randint(1, 169)
+            elif name.startswith(BOOLEAN_PREFIXES):
+                state[name] = rng.randint(0, 1)
+            else:
+                state[name] = rng.choice(COUNTER_VALUES)
+        for name in POSITIONS:
+            state[name] = 0
+        state[rng.choice(POSITIONS)] = 1
+        state["betround"] = rng.randint(1, len(ENTRY_POINTS))
+        states.append(state)
+    return states
+
+
+def time_decisions(decide, states):
+    """
+    Mesure le débit d'une fonction de décision
+
+    Args:
+        decide (callable): Fonction appelée avec chaque situation
+        states (list): Situations
+
+    Returns:
+        float: Décisions par seconde
+    """
+    start = time.perf_counter()
+    for state in states:
+        decide(state)
+    return len(states) / (time.perf_counter() - start)
+
+
+def time_call(function):
+    """
+    Args:
+        function (callable): Fonction sans argument
+
+    Returns:
+        float: Durée d'un appel en millisecondes
+    """
+    start = time.perf_counter()
+    function()
+    return 1000 * (time.perf_counter() - start)
+
+
+def check_decisions(evaluator, compiled, states):
+    """
+    Vérifie que l'évaluateur et le profil compilé prennent les mêmes décisions
+
+    Args:
+        evaluator (Evaluator): Évaluateur du profil
+        compiled (CompiledProfile): Profil compilé
+        states (list): Situations
+
+    Raises:
+        ValueError: À la première situation où les décisions diffèrent
+    """
+    for index, state in enumerate(states):
+        expected, decision = evaluator.decide(state), compiled.decide(state)
+        if decision != expected:
+            raise ValueError(
+                f"state {index} ({ENTRY_POINTS[state['betround'] - 1]}): compiled decision "
+                f"{decision.action} {decision.amount} differs from the evaluator's "
+                f"{expected.action} {expected.amount} (evaluator chain: "
+                f"{' -> '.join(rule.function for rule in expected.chain)})"
+            )
+
+
+def run(profile, library, count):
+    """
+    Mesure l'évaluateur et le profil compilé
+
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios
+        count (int): Nombre de situations
+
+    Returns:
+        tuple: (lignes (mode, décisions par seconde), lignes (étape, durée en ms))
+
+    Raises:
+        ValueError: Si les deux moteurs ne prennent pas les mêmes décisions
+    """
+    evaluator = Evaluator(profile, library)
+    compiled = compile_profile(profile, library)
+    states = random_states(compiled.slots, count)
+
+    # Les deux moteurs doivent prendre les mêmes décisions
+    check_decisions(evaluator, compiled, states[:1000])
+
+    rows = [("tree-walker (Evaluator.decide)", time_decisions(evaluator.decide, states)),
+            ("compiled (CompiledProfile.decide)", time_decisions(compiled.decide, states))]
+    entry_points = [ENTRY_POINTS[state["betround"] - 1] for state in states]
+    rows_only = [compiled.row(state) for state in states]
+    start = time.perf_counter()
+    for row, entry_point in zip(rows_only, entry_points):
+        compiled.run(row, entry_point)
+    rows.append(("compiled (CompiledProfile.run, prepared rows)", count / (time.perf_counter() - start)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory)
+        steps = [
+            ("compile", time_call(lambda: compile_profile(profile, library))),
+            ("cache miss (compile, write source)", time_call(lambda: cache.get(profile, library))),
+            ("cache hit (memory)", time_call(lambda: cache.get(profile, library))),
+            ("cache hit (disk, new process)", time_call(lambda: CompileCache(directory).get(profile, library))),
+        ]
+    return rows, steps
+
+
+def format_results(rows, steps):
+    """
+    Construit le tableau de résultats
+
+    Args:
+        rows (list): Débits (mode, décisions par seconde)
+        steps (list): Durées (étape, millisecondes)
+
+    Returns:
+        str: Tableau lisible
+    """
+    baseline = rows[0][1]
+    lines = [f"{'mode':<48} {'decisions/s':>12} {'speedup':>8}"]
+    for name, rate in rows:
+        lines.append(f"{name:<48} {rate:12.0f} {rate / baseline:7.1f}x")
+    lines.append("")
+    for name, milliseconds in steps:
+        lines.append(f"{name:<48} {milliseconds:10.2f}ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du benchmark
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the tree-walking evaluator against the compiled profile.")
+    parser.add_argument("-n", "--states", type=int, default=20000, help="Random game states (default: 20000)")
+    parser.add_argument("--profile", help="Profile .ohf file (default: generated from the default settings)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        with open(args.profile, 'r', encoding='utf-8') as file:
+            profile = file.read()
+    else:
+        profile = ProfileBuilder().generate_profile(load_settings(DEFAULT_SETTINGS_FILE))
+    try:
+        results = run(profile, load_library(DEFAULT_LIBRARY), args.states)
+    except ValueError as error:
+        print(f"Decision mismatch: {error}", file=sys.stderr)
+        return 1
+    print(format_results(*results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Banc de mesure des générateurs avec comparaison à une référence enregistrée
+Exécute chaque générateur (streets et sous-générateurs) sur les paramètres par
+défaut, sur chaque profil de PlayerProfiles et sur des paramètres aléatoires, puis
+mesure la durée par appel, le pic mémoire et la taille du code produit.
+Ne dépend pas de PyQt: utilisable sans affichage.
+
+Usage:
+    python -m benchmarks.bench_generators                   # compare à baseline.json
+    python -m benchmarks.bench_generators --update-baseline # réécrit baseline.json
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from generators.profile_builder import ProfileBuilder, STREETS, load_settings
+from generators.settings_tracer import generator_name, iter_section_generators
+from player_profiles import PlayerProfiles
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SETTINGS_FILE = os.path.join(BENCHMARK_DIR, "default_settings.json")
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# Profils prédéfinis mesurés (voir PlayerProfiles.get_profile)
+PRESETS = ("TAG", "LAG", "Nit", "Fish", "Loose Passive", "Tournament", "Cash Game", "SNG", "MTT")
+
+# Écart maximal toléré par rapport à la référence avant de signaler une régression
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.25
+
+
+def preset_settings(base_settings, preset):
+    """
+    Applique un profil prédéfini aux paramètres de base, comme ProfileManager
+
+    Args:
+        base_settings (dict): Paramètres par street
+        preset (str): Nom du profil dans PlayerProfiles
+
+    Returns:
+        dict: Copie des paramètres avec les valeurs preflop du profil
+    """
+    settings = copy.deepcopy(base_settings)
+    settings["preflop"].update(PlayerProfiles.get_profile(preset))
+    return settings
+
+
+def random_settings(base_settings, seed):
+    """
+    Perturbe aléatoirement les valeurs numériques des paramètres de base
+
+    Args:
+        base_settings (dict): Paramètres par street
+        seed (int): Graine du générateur aléatoire (résultats reproductibles)
+
+    Returns:
+        dict: Copie des paramètres perturbés
+    """
+    rng = random.Random(seed)
+    settings = copy.deepcopy(base_settings)
+    for street in STREETS:
+        for key, value in settings[street].items():
+            if key == "num_players":
+                settings[street][key] = rng.randint(2, 9)
+            elif isinstance(value, int):
+                low = -50 if value < 0 else 0
+                settings[street][key] = max(low, min(100, value + rng.randint(-15, 15)))
+    return settings
+
+
+def build_cases(base_settings, random_cases):
+    """
+    Construit la liste des jeux de paramètres mesurés
+
+    Args:
+        base_settings (dict): Paramètres par street
+        random_cases (int): Nombre de jeux aléatoires
+
+    Returns:
+        list: Paires (nom du cas, paramètres par street)
+    """
+    cases = [("default", base_settings)]
+    cases += [(f"preset:{preset}", preset_settings(base_settings, preset)) for preset in PRESETS]
+    cases += [(f"random:{seed}", random_settings(base_settings, seed)) for seed in range(random_cases)]
+    return cases
+
+
+def iter_generators(builder):
+    """
+    Énumère tous les générateurs d'un constructeur de profils
+
+    Args:
+        builder (ProfileBuilder): Constructeur sans cache
+
+    Yields:
+        tuple: (street, générateur), générateur de street en premier
+    """
+    for street in STREETS:
+        street_generator = getattr(builder, f"{street}_generator")
+        yield street, street_generator
+        for _, generator in iter_section_generators(street_generator):
+            yield street, generator
+
+
+def calibrate(repeat=50):
+    """
+    Mesure une charge de référence proche du travail des générateurs
+
+    Les durées sont divisées par cette mesure, prise juste avant chaque générateur,
+    avant la comparaison. La référence enregistrée reste ainsi utilisable sur une
+    machine plus lente ou plus rapide, ou dont la fréquence varie pendant la mesure.
+
+    Args:
+        repeat (int): Nombre d'exécutions (la plus rapide est retenue)
+
+    Returns:
+        float: Durée de la charge de référence en microsecondes
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = ""
+        for index in range(500):
+            code += f"WHEN Others AND f$Value{index} >= {index / 7:.2f} RETURN {index % 3} FORCE\n"
+        durations.append(time.perf_counter() - start)
+    return round(1e6 * min(durations), 2)
+
+
+def measure(generator, settings, repeat):
+    """
+    Mesure un générateur sur un jeu de paramètres
+
+    Args:
+        generator: Générateur (instance de Base*Generator)
+        settings (dict): Paramètres de la street
+        repeat (int): Nombre d'appels chronométrés (le plus rapide est retenu)
+
+    Returns:
+        dict: time_us (durée par appel), peak_kb (pic tracemalloc) et size (octets)
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generator.generate_code(settings)
+        durations.append(time.perf_counter() - start)
+
+    # Mesure mémoire séparée: tracemalloc ralentit fortement les allocations
+    tracemalloc.start()
+    code = generator.generate_code(settings)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time_us": round(1e6 * min(durations), 2),
+        "peak_kb": round(peak / 1024, 1),
+        "size": len(code.encode('utf-8')),
+    }
+
+
+def run_suite(base_settings, random_cases=5, repeat=50, rounds=3):
+    """
+    Exécute tous les générateurs sur tous les cas
+
+    La suite complète est répétée plusieurs fois et la mesure la plus rapide de
+    chaque cas est retenue, pour atténuer les variations de charge de la machine.
+
+    Args:
+        base_settings (dict): Paramètres par street
+        random_cases (int): Nombre de jeux de paramètres aléatoires
+        repeat (int): Nombre d'appels chronométrés par mesure
+        rounds (int): Nombre de passages sur la suite complète
+
+    Returns:
+        dict: {nom du générateur: {"calibration_us": durée de la charge de référence,
+                                   "cases": {nom du cas: mesures}}}
+    """
+    builder = ProfileBuilder()
+    cases = build_cases(base_settings, random_cases)
+    results = {}
+    for _ in range(rounds):
+        for street, generator in iter_generators(builder):
+            calibration_us = calibrate()
+            measurements = {
+                case_name: measure(generator, settings[street], repeat)
+                for case_name, settings in cases
+            }
+
+            result = results.setdefault(generator_name(generator), {
+                "calibration_us": calibration_us,
+                "cases": measurements,
+            })
+            result["calibration_us"] = min(result["calibration_us"], calibration_us)
+            for case_name, measurement in measurements.items():
+                best = result["cases"][case_name]
+                best["time_us"] = min(best["time_us"], measurement["time_us"])
+    return results
+
+
+def relative_time(result):
+    """
+    Calcule la durée totale d'un générateur sur tous ses cas, en unités de calibration
+
+    Args:
+        result (dict): Résultat d'un générateur (calibration_us et cases)
+
+    Returns:
+        float: Durée totale divisée par la durée de la charge de référence
+    """
+    return sum(case["time_us"] for case in result["cases"].values()) / result["calibration_us"]
+
+
+def compare(results, baseline, time_tolerance=DEFAULT_TIME_TOLERANCE,
+            memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    """
+    Compare les mesures à la référence
+
+    Les tailles doivent être identiques: une différence signale un changement du
+    code généré. La mémoire est comparée cas par cas et la durée totale de chaque
+    générateur, ramenée à la charge de référence, avec une tolérance.
+
+    Args:
+        results (dict): Résultats de run_suite
+        baseline (dict): Référence au même format
+        time_tolerance (float): Hausse relative de durée tolérée
+        memory_tolerance (float): Hausse relative de pic mémoire tolérée
+
+    Returns:
+        list: Messages décrivant chaque régression (vide si aucune)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference_result = baseline.get(name)
+        if reference_result is None:
+            continue
+        for case_name, current in result["cases"].items():
+            reference = reference_result["cases"].get(case_name)
+            if reference is None:
+                continue
+            label = f"{name} [{case_name}]"
+            if current["size"] != reference["size"]:
+                regressions.append(f"{label}: output size {reference['size']} -> {current['size']} bytes")
+            if current["peak_kb"] > reference["peak_kb"] * (1 + memory_tolerance):
+                regressions.append(f"{label}: peak memory {reference['peak_kb']:.1f} -> {current['peak_kb']:.1f} KB")
+
+        ratio = relative_time(result) / relative_time(reference_result)
+        if ratio > 1 + time_tolerance:
+            regressions.append(f"{name}: {ratio:.2f}x slower than baseline (all cases, calibrated)")
+    return regressions
+
+
+def format_summary(results, baseline=None):
+    """
+    Construit le tableau récapitulatif par générateur (moyenne sur les cas)
+
+    Args:
+        results (dict): Résultats de run_suite
+        baseline (dict): Référence (optionnelle) pour afficher l'évolution des durées
+
+    Returns:
+        str: Tableau lisible
+    """
+    lines = [f"{'generator':<68} {'time':>10} {'peak':>9} {'size':>8} {'vs base':>8}"]
+    for name, result in results.items():
+        cases = result["cases"].values()
+        time_us = statistics.mean(case["time_us"] for case in cases)
+        peak_kb = max(case["peak_kb"] for case in cases)
+        size = statistics.mean(case["size"] for case in cases)
+        line = f"{name:<68} {time_us:8.1f}us {peak_kb:7.1f}KB {size:8.0f}"
+        if baseline and name in baseline:
+            line += f" {relative_time(result) / relative_time(baseline[name]):7.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark every generator on presets and randomized settings against a stored baseline."
+    )
+    parser.add_argument("--settings", default=DEFAULT_SETTINGS_FILE,
+                        help="Base settings JSON file (default: benchmarks/default_settings.json)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--random-cases", type=int, default=5, help="Randomized settings cases (default: 5)")
+    parser.add_argument("-n", "--repeat", type=int, default=50, help="Timed calls per measurement (default: 50)")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the whole suite (default: 3)")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                        help="Allowed relative slowdown before reporting a regression (default: 0.5)")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help="Allowed relative peak memory increase (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du banc de mesure
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si une régression est détectée)
+    """
+    args = parse_args(argv)
+    base_settings = load_settings(args.settings)
+    results = run_suite(base_settings, args.random_cases, args.repeat, args.rounds)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+            file.write("\n")
+        print(format_summary(results))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    print(format_summary(results, baseline))
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
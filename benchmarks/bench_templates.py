@@ -0,0 +1,123 @@
+"""
+Mesure du gain apporté par les blocs précompilés (generators.templates)
+Compare le rendu à chaque génération (méthode d'origine, via __wrapped__)
+au renvoi du bloc rendu à l'import
+
+Usage: python -m benchmarks.bench_templates [-n ITERATIONS]
+"""
+import argparse
+import sys
+import timeit
+
+from generators.flop import FlopProfileGenerator
+from generators.flop.board_texture_generator import BoardTextureGenerator
+from generators.preflop import PreflopProfileGenerator
+from generators.river import RiverProfileGenerator
+from generators.turn import TurnProfileGenerator
+
+# Blocs statiques mesurés: (classe, nom de la méthode décorée)
+STATIC_SECTIONS = (
+    (PreflopProfileGenerator, "_generate_main_preflop_function"),
+    (FlopProfileGenerator, "_generate_enhanced_main_flop_function"),
+    (FlopProfileGenerator, "_generate_utility_functions"),
+    (TurnProfileGenerator, "_generate_main_turn_function"),
+    (RiverProfileGenerator, "_generate_main_river_function"),
+)
+
+# Ajustements utilisés pour le bloc de texture du board
+BOARD_TEXTURE_VALUES = {
+    "monotone_board_adjust": -25,
+    "paired_board_adjust": 15,
+    "connected_board_adjust": -20,
+    "high_card_board_adjust": 10,
+    "low_card_board_adjust": 20,
+}
+
+
+def time_call(function, iterations):
+    """
+    Mesure la durée moyenne d'un appel
+
+    Args:
+        function (callable): Fonction sans argument
+        iterations (int): Nombre d'appels
+
+    Returns:
+        float: Durée moyenne en microsecondes
+    """
+    return 1e6 * timeit.timeit(function, number=iterations) / iterations
+
+
+def run(iterations):
+    """
+    Mesure chaque bloc avec et sans précompilation
+
+    Args:
+        iterations (int): Nombre d'appels par mesure
+
+    Returns:
+        list: Lignes (nom, durée sans précompilation, durée avec précompilation) en µs
+    """
+    rows = []
+    for generator_class, name in STATIC_SECTIONS:
+        generator = generator_class()
+        method = getattr(generator_class, name)
+        # Le texte doit être identique dans les deux cas
+        assert method.__wrapped__(None) == getattr(generator, name)()
+        rows.append((
+            f"{generator_class.__name__}.{name}",
+            time_call(lambda: method.__wrapped__(None), iterations),
+            time_call(getattr(generator, name), iterations),
+        ))
+
+    board_texture = BoardTextureGenerator()
+    template = board_texture._board_texture_template()
+    build = BoardTextureGenerator._board_texture_template.__wrapped__
+    rows.append((
+        "BoardTextureGenerator (flop)",
+        time_call(lambda: build(None).format_map(BOARD_TEXTURE_VALUES), iterations),
+        time_call(lambda: template.render(**BOARD_TEXTURE_VALUES), iterations),
+    ))
+    return rows
+
+
+def format_rows(rows):
+    """
+    Construit le tableau de résultats
+
+    Args:
+        rows (list): Résultats de run
+
+    Returns:
+        str: Tableau lisible
+    """
+    lines = [f"{'section':<60} {'per build':>10} {'template':>10} {'speedup':>8}"]
+    for name, baseline, templated in rows:
+        lines.append(f"{name:<60} {baseline:8.2f}us {templated:8.2f}us {baseline / templated:7.1f}x")
+    total_baseline = sum(row[1] for row in rows)
+    total_templated = sum(row[2] for row in rows)
+    lines.append(f"{'total per profile':<60} {total_baseline:8.2f}us {total_templated:8.2f}us "
+                 f"{total_baseline / total_templated:7.1f}x")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du benchmark
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    parser = argparse.ArgumentParser(description="Benchmark precompiled static section templates.")
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="Calls per measurement (default: 2000)")
+    args = parser.parse_args(argv)
+
+    print(format_rows(run(args.iterations)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
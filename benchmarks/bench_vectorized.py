@@ -0,0 +1,166 @@
+"""
+Mesure de l'évaluation par colonnes NumPy (openppl.vectorized)
+Évalue les fonctions purement preflop (f$OpenRaise_*, f$PushFold_*) et la décision
+complète sur des lots de situations aléatoires reproductibles, avec et sans
+tables de push/fold, vérifie que les décisions sont celles du profil compilé
+(openppl.compiler), puis compare les débits.
+
+Usage: python -m benchmarks.bench_vectorized [-n STATES] [--repeat N]
+"""
+import argparse
+import copy
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_evaluator import DEFAULT_SETTINGS_FILE, random_states
+from generators.profile_builder import ProfileBuilder, load_settings
+from openppl.compiler import compile_profile
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.vectorized import VectorizedProfile, columns_from_states
+
+# Préfixes des fonctions preflop mesurées une à une
+PREFLOP_PREFIXES = ("f$OpenRaise_", "f$PushFold_")
+
+
+def best_time(function, repeat):
+    """
+    Args:
+        function (callable): Fonction sans argument
+        repeat (int): Nombre d'appels (le plus rapide est retenu)
+
+    Returns:
+        float: Durée du plus rapide en secondes
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def check_decisions(vectorized, compiled, states, columns):
+    """
+    Vérifie que la décision vectorisée est celle du profil compilé sur chaque situation
+
+    Args:
+        vectorized (VectorizedProfile): Profil évalué par colonnes
+        compiled (CompiledProfile): Profil compilé
+        states (list): Situations
+        columns (dict): Colonnes des mêmes situations (columns_from_states)
+
+    Raises:
+        ValueError: À la première situation où les actions ou les montants diffèrent
+    """
+    decision = vectorized.decide(columns)
+    for index, state in enumerate(states):
+        expected = compiled.decide(state)
+        action = expected.action or ""
+        amount = np.nan if expected.amount is None else float(expected.amount)
+        if decision.actions[index] != action or not np.isclose(decision.amounts[index], amount, equal_nan=True):
+            raise ValueError(
+                f"state {index} ({ENTRY_POINTS[state['betround'] - 1]}): vectorized decision "
+                f"{decision.actions[index] or '(value)'} {decision.amounts[index]} differs from the compiled "
+                f"{action or '(value)'} {amount}"
+            )
+
+
+def run(profile, library, count, repeat):
+    """
+    Mesure un profil
+
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios
+        count (int): Nombre de situations par lot
+        repeat (int): Nombre de mesures (la plus rapide est retenue)
+
+    Returns:
+        tuple: (lignes (fonction, µs pour 1000 situations, échelle de seuils),
+                débit de la décision vectorisée, débit du profil compilé), débits en situations par seconde
+
+    Raises:
+        ValueError: Si la décision vectorisée diffère de celle du profil compilé
+    """
+    compiled = compile_profile(profile, library)
+    vectorized = VectorizedProfile(profile, library)
+    states = random_states(compiled.slots, count)
+    columns = columns_from_states(states)
+    check_decisions(vectorized, compiled, states, columns)
+
+    functions = []
+    for name in vectorized.functions:
+        if name.startswith(PREFLOP_PREFIXES):
+            vectorized.evaluate(name, columns)
+            seconds = best_time(lambda: vectorized.evaluate(name, columns), repeat)
+            functions.append((name, 1e9 * seconds / count, name in vectorized.ladders))
+
+    vectorized_rate = count / best_time(lambda: vectorized.decide(columns), repeat)
+    rows = [compiled.row(state) for state in states]
+    entry_points = [ENTRY_POINTS[state["betround"] - 1] for state in states]
+
+    def run_compiled():
+        for row, entry_point in zip(rows, entry_points):
+            compiled.run(row, entry_point)
+    compiled_rate = count / best_time(run_compiled, 1)
+    return functions, vectorized_rate, compiled_rate
+
+
+def format_results(title, functions, vectorized_rate, compiled_rate):
+    """
+    Construit le tableau de résultats d'un profil
+
+    Args:
+        title (str): Nom du profil mesuré
+        functions (list): Lignes (fonction, µs pour 1000 situations, échelle de seuils)
+        vectorized_rate (float): Situations par seconde, décision vectorisée
+        compiled_rate (float): Situations par seconde, profil compilé
+
+    Returns:
+        str: Tableau lisible
+    """
+    lines = [title, f"{'function':<40} {'us/1000 states':>14}  mode"]
+    for name, microseconds, ladder in functions:
+        lines.append(f"{name:<40} {microseconds:14.1f}  {'ladder' if ladder else 'masks'}")
+    lines.append(f"{'decision (vectorized)':<40} {vectorized_rate:14.0f}  states/s "
+                 f"({vectorized_rate / compiled_rate:.1f}x compiled)")
+    lines.append(f"{'decision (compiled rows)':<40} {compiled_rate:14.0f}  states/s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du benchmark
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    parser = argparse.ArgumentParser(description="Benchmark batch evaluation of a profile on NumPy columns.")
+    parser.add_argument("-n", "--states", type=int, default=100000, help="States per batch (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per function (default: 5)")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(DEFAULT_SETTINGS_FILE)
+    table_settings = copy.deepcopy(settings)
+    table_settings["preflop"]["push_fold_tables"] = True
+    library = load_library(DEFAULT_LIBRARY)
+    builder = ProfileBuilder()
+    for title, case_settings in (("default settings", settings), ("push/fold tables", table_settings)):
+        profile = builder.generate_profile(case_settings)
+        try:
+            results = run(profile, library, args.states, args.repeat)
+        except ValueError as error:
+            print(f"Decision mismatch ({title}): {error}", file=sys.stderr)
+            return 1
+        print(format_results(f"{title}, {args.states} states", *results))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,22 @@ class BaseFlopGenerator(ABC):
         # 100% = toutes les mains (rang 169)
         return round(1 + (percentage / 100) * 168)
     
+    def generate_section(self, generator, settings):
+        """
+        Génère une section spécialisée, via le cache de sections s'il est configuré
+        
+        Args:
+            generator: Générateur spécialisé de la section
+            settings (dict): Paramètres du générateur
+            
+        Returns:
+            str: Code généré pour la section
+        """
+        section_cache = getattr(self, "section_cache", None)
+        if section_cache is None:
+            return generator.generate_code(settings)
+        return section_cache.render(generator, settings)
+    
     @abstractmethod
     def generate_code(self, settings):
         """
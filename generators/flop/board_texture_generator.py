@@ -3,6 +3,7 @@ Générateur pour l'analyse de texture du board au flop
 Implémentation améliorée avec une classification détaillée des textures
 """
 from generators.flop.base_generator import BaseFlopGenerator
+from generators.templates import section_template
 
 class BoardTextureGenerator(BaseFlopGenerator):
     """
@@ -29,6 +30,23 @@ class BoardTextureGenerator(BaseFlopGenerator):
         dynamic_board_adjust = settings.get("dynamic_board_adjust", -30) / 100.0
         static_board_adjust = settings.get("static_board_adjust", 25) / 100.0
         
+        # Seules les lignes d'ajustement sont complétées, le reste du bloc est rendu à l'import
+        return self._board_texture_template().render(
+            monotone_board_adjust=monotone_board_adjust * 100,
+            paired_board_adjust=paired_board_adjust * 100,
+            connected_board_adjust=connected_board_adjust * 100,
+            high_card_board_adjust=high_card_board_adjust * 100,
+            low_card_board_adjust=low_card_board_adjust * 100,
+        )
+    
+    @section_template
+    def _board_texture_template(self):
+        """
+        Construit le bloc des fonctions de texture du board, une seule fois
+        
+        Returns:
+            str: Texte du bloc, avec les ajustements de C-Bet en champs nommés
+        """
         code = "//*****************************************************************************\n"
         code += "//\n"
         code += "// BOARD TEXTURE ANALYSIS FUNCTIONS\n"
@@ -257,31 +275,31 @@ class BoardTextureGenerator(BaseFlopGenerator):
         # Rapport optimal bluff/value sur board monotone
         code += "##f$BluffValueRatioMonotone##\n"
         code += "// Optimal bluff-to-value ratio on monotone boards\n"
-        code += f"// Apply {monotone_board_adjust*100:.0f}% adjustment to C-Bet frequencies\n"
+        code += "// Apply {monotone_board_adjust:.0f}% adjustment to C-Bet frequencies\n"
         code += "WHEN Others RETURN 0.3 FORCE\n\n"
         
         # Rapport optimal bluff/value sur board paired
         code += "##f$BluffValueRatioPaired##\n"
         code += "// Optimal bluff-to-value ratio on paired boards\n"
-        code += f"// Apply {paired_board_adjust*100:.0f}% adjustment to C-Bet frequencies\n"
+        code += "// Apply {paired_board_adjust:.0f}% adjustment to C-Bet frequencies\n"
         code += "WHEN Others RETURN 0.6 FORCE\n\n"
         
         # Rapport optimal bluff/value sur board connected
         code += "##f$BluffValueRatioConnected##\n"
         code += "// Optimal bluff-to-value ratio on connected boards\n"
-        code += f"// Apply {connected_board_adjust*100:.0f}% adjustment to C-Bet frequencies\n"
+        code += "// Apply {connected_board_adjust:.0f}% adjustment to C-Bet frequencies\n"
         code += "WHEN Others RETURN 0.4 FORCE\n\n"
         
         # Rapport optimal bluff/value sur board avec cartes hautes
         code += "##f$BluffValueRatioHighCard##\n"
         code += "// Optimal bluff-to-value ratio on high card boards\n"
-        code += f"// Apply {high_card_board_adjust*100:.0f}% adjustment to C-Bet frequencies\n"
+        code += "// Apply {high_card_board_adjust:.0f}% adjustment to C-Bet frequencies\n"
         code += "WHEN Others RETURN 0.7 FORCE\n\n"
         
         # Rapport optimal bluff/value sur board avec cartes basses
         code += "##f$BluffValueRatioLowCard##\n"
         code += "// Optimal bluff-to-value ratio on low card boards\n"
-        code += f"// Apply {low_card_board_adjust*100:.0f}% adjustment to C-Bet frequencies\n"
+        code += "// Apply {low_card_board_adjust:.0f}% adjustment to C-Bet frequencies\n"
         code += "WHEN Others RETURN 0.5 FORCE\n\n"
         
         # FONCTIONS DE DETECTION DE CBET FAVORABLE
@@ -7,6 +7,7 @@ from generators.flop.cbet_generator import CBetGenerator
 from generators.flop.facing_bets_generator import FacingBetsGenerator
 from generators.flop.board_texture_generator import BoardTextureGenerator
 from generators.flop.hand_categories_generator import HandCategoriesGenerator
+from generators.templates import static_section
 
 class FlopProfileGenerator(BaseFlopGenerator):
     """
@@ -15,7 +16,15 @@ class FlopProfileGenerator(BaseFlopGenerator):
     Version améliorée utilisant toutes les fonctions disponibles
     """
     
-    def __init__(self):
+    def __init__(self, section_cache=None):
+        """
+        Initialise le générateur
+        
+        Args:
+            section_cache (SectionCache): Cache des sections générées (optionnel)
+        """
+        self.section_cache = section_cache
+        
         # Initialiser les générateurs spécialisés
         self.cbet_generator = CBetGenerator()
         self.facing_bets_generator = FacingBetsGenerator()
@@ -32,33 +41,39 @@ class FlopProfileGenerator(BaseFlopGenerator):
         Returns:
             str: Code de profil flop complet
         """
+        return "".join(self.iter_code(settings))
+    
+    def iter_code(self, settings):
+        """
+        Produit le profil flop morceau par morceau, dans l'ordre du fichier
+        
+        Args:
+            settings (dict): Paramètres du générateur
+            
+        Yields:
+            str: En-tête, fonction principale, sections spécialisées puis pied de page
+        """
         # Générer l'en-tête du profil
-        profile = self._generate_header(settings)
+        yield self._generate_header(settings)
         
         # Générer la fonction principale flop modifiée pour utiliser toutes les fonctions
-        main_flop_function = self._generate_enhanced_main_flop_function()
-        profile += main_flop_function
+        yield self._generate_enhanced_main_flop_function()
         
         # Générer chaque section spécialisée
-        cbet_code = self.cbet_generator.generate_code(settings)
-        facing_bets_code = self.facing_bets_generator.generate_code(settings)
-        board_texture_code = self.board_texture_generator.generate_code(settings)
-        hand_categories_code = self.hand_categories_generator.generate_code(settings)
+        yield self.generate_section(self.cbet_generator, settings)
+        yield self.generate_section(self.facing_bets_generator, settings)
+        yield self.generate_section(self.board_texture_generator, settings)
+        yield self.generate_section(self.hand_categories_generator, settings)
         
         # Ajouter les fonctions utilitaires supplémentaires pour la version améliorée
-        utility_functions = self._generate_utility_functions()
-        
-        # Combiner le tout
-        profile += cbet_code + facing_bets_code + board_texture_code + hand_categories_code + utility_functions
+        yield self._generate_utility_functions()
         
         # Ajouter le pied de page
-        profile += "//*****************************************************************************\n"
-        profile += "//\n"
-        profile += "// END OF FLOP PROFILE\n"
-        profile += "//\n"
-        profile += "//*****************************************************************************"
-        
-        return profile
+        yield ("//*****************************************************************************\n"
+               "//\n"
+               "// END OF FLOP PROFILE\n"
+               "//\n"
+               "//*****************************************************************************")
     
     def _generate_header(self, settings):
         """
@@ -101,6 +116,7 @@ class FlopProfileGenerator(BaseFlopGenerator):
         
         return header
     
+    @static_section
     def _generate_enhanced_main_flop_function(self):
         """
         Génère la fonction principale flop améliorée qui coordonne les différentes fonctions
@@ -191,6 +207,7 @@ class FlopProfileGenerator(BaseFlopGenerator):
 
         return code
     
+    @static_section
     def _generate_utility_functions(self):
         """
         Génère les fonctions utilitaires supplémentaires pour la version améliorée
@@ -0,0 +1,245 @@
+"""
+Génération concurrente d'un profil OpenHoldem
+Répartit les streets et les sous-générateurs preflop sur un pool de threads
+ou de processus, puis assemble le résultat dans l'ordre canonique
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from generators.profile_builder import ProfileBuilder, STREETS, STREET_SEPARATOR, load_settings
+from generators.section_cache import SectionCache
+
+# Sous-générateurs preflop répartis individuellement (les plus coûteux du profil)
+PREFLOP_SECTIONS = (
+    "open_raise_generator",
+    "three_bet_generator",
+    "squeeze_generator",
+    "push_fold_generator",
+)
+
+# Constructeurs de profils propres à chaque processus de travail, avec et sans cache
+_process_builders = {}
+
+
+def render_task(builder, street, section, settings):
+    """
+    Exécute une tâche: une street complète ou un seul sous-générateur
+
+    Args:
+        builder (ProfileBuilder): Constructeur dont les générateurs sont utilisés
+        street (str): Nom de la street
+        section (str): Nom d'attribut du sous-générateur, ou None pour la street entière
+        settings (dict): Paramètres de la street
+
+    Returns:
+        tuple: (code généré, durée en secondes)
+    """
+    start = time.perf_counter()
+    street_generator = getattr(builder, f"{street}_generator")
+    if section is None:
+        code = street_generator.generate_code(settings)
+    else:
+        code = street_generator.generate_section(getattr(street_generator, section), settings)
+    return code, time.perf_counter() - start
+
+
+def _render_in_process(use_cache, street, section, settings):
+    """
+    Exécute une tâche avec le constructeur du processus de travail courant
+
+    Args:
+        use_cache (bool): Utiliser un cache de sections propre au processus
+        street (str): Nom de la street
+        section (str): Nom d'attribut du sous-générateur, ou None
+        settings (dict): Paramètres de la street
+
+    Returns:
+        tuple: (code généré, durée en secondes)
+    """
+    builder = _process_builders.get(use_cache)
+    if builder is None:
+        builder = _process_builders[use_cache] = ProfileBuilder(SectionCache() if use_cache else None)
+    return render_task(builder, street, section, settings)
+
+
+class ProfileOrchestrator:
+    """
+    Classe qui génère un profil complet en parallélisant les streets flop, turn,
+    river et les quatre sous-générateurs preflop
+
+    Le pool est conservé entre les appels; utiliser close() ou un bloc with pour le libérer.
+    """
+
+    def __init__(self, executor="thread", workers=None, use_cache=True):
+        """
+        Initialise l'orchestrateur
+
+        Args:
+            executor (str): "thread" ou "process"
+            workers (int): Taille du pool (par défaut: choix de concurrent.futures)
+            use_cache (bool): Réutiliser les sections inchangées (un cache par processus)
+
+        Raises:
+            ValueError: Si le type d'exécuteur est inconnu
+        """
+        if executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self.executor = executor
+        self.use_cache = use_cache
+        self.builder = ProfileBuilder(SectionCache() if use_cache else None)
+        self.last_timings = {}
+
+    def _submit(self, street, section, settings):
+        """
+        Soumet une tâche au pool
+
+        Args:
+            street (str): Nom de la street
+            section (str): Nom d'attribut du sous-générateur, ou None
+            settings (dict): Paramètres de la street
+
+        Returns:
+            Future: Résultat (code, durée) de render_task
+        """
+        if self.executor == "process":
+            return self._executor.submit(_render_in_process, self.use_cache, street, section, settings)
+        return self._executor.submit(render_task, self.builder, street, section, settings)
+
+    def generate_profile(self, settings):
+        """
+        Génère le profil complet et enregistre la durée de chaque tâche dans last_timings
+
+        Args:
+            settings (dict): Paramètres par street, au format de export_settings
+
+        Returns:
+            str: Code de profil complet, identique à ProfileBuilder.generate_profile
+        """
+        start = time.perf_counter()
+
+        futures = {}
+        for section in PREFLOP_SECTIONS:
+            futures[f"preflop.{section}"] = self._submit("preflop", section, settings["preflop"])
+        for street in STREETS[1:]:
+            futures[street] = self._submit(street, None, settings[street])
+
+        timings = {}
+        sections = {}
+        for section in PREFLOP_SECTIONS:
+            sections[section], timings[f"preflop.{section}"] = futures[f"preflop.{section}"].result()
+
+        # L'en-tête et la fonction principale preflop sont assemblés ici, autour des sections reçues
+        assemble_start = time.perf_counter()
+        streets = ["".join(self.builder.preflop_generator.iter_code(settings["preflop"], sections))]
+        timings["preflop.assemble"] = time.perf_counter() - assemble_start
+
+        for street in STREETS[1:]:
+            code, timings[street] = futures[street].result()
+            streets.append(code)
+
+        profile = STREET_SEPARATOR.join(streets)
+        timings["wall"] = time.perf_counter() - start
+        self.last_timings = timings
+        return profile
+
+    def close(self):
+        """
+        Libère le pool de travail
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def format_timings(timings, sequential_time=None):
+    """
+    Construit le détail des durées d'une génération concurrente
+
+    Args:
+        timings (dict): Durées par tâche (last_timings), "wall" compris
+        sequential_time (float): Durée de la génération séquentielle de référence (optionnel)
+
+    Returns:
+        str: Tableau lisible, en millisecondes
+    """
+    task_total = sum(value for name, value in timings.items() if name != "wall")
+    lines = [f"{name:<40} {1000 * value:8.2f} ms" for name, value in timings.items() if name != "wall"]
+    lines.append(f"{'sum of tasks':<40} {1000 * task_total:8.2f} ms")
+    lines.append(f"{'wall':<40} {1000 * timings['wall']:8.2f} ms")
+    if sequential_time is not None:
+        lines.append(f"{'sequential':<40} {1000 * sequential_time:8.2f} ms")
+        lines.append(f"{'speedup':<40} {sequential_time / timings['wall']:8.2f} x")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate one profile concurrently and print a per-task timing breakdown."
+    )
+    parser.add_argument("settings_file", help="Exported settings JSON file")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread",
+                        help="Worker pool type (default: thread)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Pool size")
+    parser.add_argument("-n", "--repeat", type=int, default=20,
+                        help="Number of timed builds; the fastest is reported (default: 20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la mesure de génération concurrente
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si le profil diffère de la génération séquentielle)
+    """
+    args = parse_args(argv)
+    settings = load_settings(args.settings_file)
+
+    # Sans cache, pour mesurer le coût réel de génération
+    sequential_builder = ProfileBuilder()
+    sequential_time = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        expected = sequential_builder.generate_profile(settings)
+        elapsed = time.perf_counter() - start
+        sequential_time = elapsed if sequential_time is None else min(sequential_time, elapsed)
+
+    best = None
+    with ProfileOrchestrator(args.executor, args.workers, use_cache=False) as orchestrator:
+        for _ in range(args.repeat):
+            profile = orchestrator.generate_profile(settings)
+            if profile != expected:
+                print("Concurrent profile differs from sequential generation", file=sys.stderr)
+                return 1
+            if best is None or orchestrator.last_timings["wall"] < best["wall"]:
+                best = orchestrator.last_timings
+
+    print(format_timings(best, sequential_time))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
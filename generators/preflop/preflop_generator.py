@@ -7,6 +7,7 @@ from generators.preflop.open_raise_generator import OpenRaiseGenerator
 from generators.preflop.three_bet_generator import ThreeBetGenerator
 from generators.preflop.squeeze_generator import SqueezeGenerator
 from generators.preflop.push_fold_generator import PushFoldGenerator
+from generators.templates import static_section
 
 class PreflopProfileGenerator(BaseProfileGenerator):
     """
@@ -14,7 +15,15 @@ class PreflopProfileGenerator(BaseProfileGenerator):
     Coordonne les différents générateurs spécialisés
     """
     
-    def __init__(self):
+    def __init__(self, section_cache=None):
+        """
+        Initialise le générateur
+        
+        Args:
+            section_cache (SectionCache): Cache des sections générées (optionnel)
+        """
+        self.section_cache = section_cache
+        
         # Initialiser les générateurs spécialisés
         self.open_raise_generator = OpenRaiseGenerator()
         self.three_bet_generator = ThreeBetGenerator()
@@ -31,29 +40,53 @@ class PreflopProfileGenerator(BaseProfileGenerator):
         Returns:
             str: Code de profil preflop complet
         """
-        # Générer l'en-tête du profil
-        profile = self._generate_header(settings)
+        return "".join(self.iter_code(settings))
+    
+    def iter_code(self, settings, sections=None):
+        """
+        Produit le profil preflop morceau par morceau, dans l'ordre du fichier
         
-        # Générer chaque section spécialisée
-        open_raise_code = self.open_raise_generator.generate_code(settings)
-        three_bet_code = self.three_bet_generator.generate_code(settings)
-        squeeze_code = self.squeeze_generator.generate_code(settings)
-        push_fold_code = self.push_fold_generator.generate_code(settings)
+        Args:
+            settings (dict): Paramètres du générateur
+            sections (dict): Code déjà généré, indexé par nom d'attribut du sous-générateur (optionnel)
+            
+        Yields:
+            str: En-tête, sections spécialisées, fonction principale, push/fold puis pied de page
+        """
+        sections = sections or {}
         
-        # Générer la fonction principale preflop
-        main_preflop_function = self._generate_main_preflop_function()
+        # Générer l'en-tête du profil
+        yield self._generate_header(settings)
         
-        # Combiner le tout
-        profile += open_raise_code + three_bet_code + squeeze_code + main_preflop_function + push_fold_code
+        # Générer chaque section spécialisée, la fonction principale précédant le push/fold
+        yield self._section_code("open_raise_generator", settings, sections)
+        yield self._section_code("three_bet_generator", settings, sections)
+        yield self._section_code("squeeze_generator", settings, sections)
+        yield self._generate_main_preflop_function()
+        yield self._section_code("push_fold_generator", settings, sections)
         
         # Ajouter le pied de page
-        profile += "//*****************************************************************************\n"
-        profile += "//\n"
-        profile += "// END OF PREFLOP PROFILE\n"
-        profile += "//\n"
-        profile += "//*****************************************************************************"
+        yield ("//*****************************************************************************\n"
+               "//\n"
+               "// END OF PREFLOP PROFILE\n"
+               "//\n"
+               "//*****************************************************************************")
+    
+    def _section_code(self, name, settings, sections):
+        """
+        Renvoie le code d'une section, déjà généré ou généré à la demande
         
-        return profile
+        Args:
+            name (str): Nom d'attribut du sous-générateur (ex: "open_raise_generator")
+            settings (dict): Paramètres du générateur
+            sections (dict): Code déjà généré, indexé par nom d'attribut
+            
+        Returns:
+            str: Code de la section
+        """
+        if name in sections:
+            return sections[name]
+        return self.generate_section(getattr(self, name), settings)
     
     def _generate_header(self, settings):
         """
@@ -128,6 +161,7 @@ class PreflopProfileGenerator(BaseProfileGenerator):
         
         return header
     
+    @static_section
     def _generate_main_preflop_function(self):
         """
         Génère la fonction principale preflop qui coordonne les différentes fonctions
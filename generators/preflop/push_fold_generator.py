@@ -1,8 +1,41 @@
 """
 Générateur de stratégies Push/Fold
 """
+import math
+
 from generators.preflop.base_generator import BaseProfileGenerator
 
+# Plages de stack dans l'ordre, avec la borne haute de f$EffectiveStack de chacune
+STACK_RANGE_BOUNDS = (
+    ("1", 1), ("2", 2), ("3", 3), ("4", 4), ("5", 5), ("6", 6), ("7", 7), ("8", 8), ("9", 9), ("10", 10),
+    ("10-15", 15), ("15-20", 20), ("20-25", 25),
+)
+
+# Plage d'appel de push utilisée pour chaque plage de stack
+CALL_RANGES = {
+    "1": "1", "2": "2", "3": "3", "4": "4", "5": "5",
+    "6": "6-10", "7": "6-10", "8": "6-10", "9": "6-10", "10": "6-10",
+    "10-15": "10-15", "15-20": "15-25", "20-25": "15-25",
+}
+
+# Conditions de position des règles de push (premier à parler)
+PUSH_POSITIONS = (
+    ("EP", "(InEarlyPosition1 OR InEarlyPosition2 OR InEarlyPosition3)"),
+    ("MP", "(InMiddlePosition1 OR InMiddlePosition2 OR InMiddlePosition3)"),
+    ("CO", "InCutOff"),
+    ("BN", "InButton"),
+    ("SB", "InSmallBlind"),
+)
+
+# Conditions sur la position du pousseur des règles d'appel de push
+CALL_POSITIONS = (
+    ("vs_EP", "(LastRaiserPosition <= 3)"),
+    ("vs_MP", "(LastRaiserPosition > 3 AND LastRaiserPosition <= 6)"),
+    ("vs_CO", "(LastRaiserPosition = nplayersdealt - 2)"),
+    ("vs_BN", "(LastRaiserPosition = nplayersdealt - 1)"),
+    ("vs_SB", "(LastRaiserPosition = nplayersdealt)"),
+)
+
 class PushFoldGenerator(BaseProfileGenerator):
     """
     Classe pour générer les sections de code de Push/Fold
@@ -57,6 +90,9 @@ class PushFoldGenerator(BaseProfileGenerator):
         code += "WHEN f$EffectiveStack < 25 AND istournament RETURN true FORCE\n"
         code += "WHEN Others RETURN false FORCE\n\n"
         
+        if settings.get("push_fold_tables", False):
+            return code + self._create_push_fold_tables(push_thresholds, call_push_thresholds)
+        
         # Main Push/Fold function
         code += "##f$PushFoldPreflop##\n"
         code += "// Main push/fold function based on stack size\n"
@@ -432,11 +468,7 @@ class PushFoldGenerator(BaseProfileGenerator):
         function += f"WHEN BotsActionsOnThisRoundIncludingChecks = 0 AND Raises = 0 AND Calls > 0 AND handrank169 <= {round(push_thresholds[bb_range]['CO'] * 0.8)} RETURN RaiseMax FORCE\n\n"
         
         # Déterminer quelle plage d'appel utiliser en fonction de la taille du stack
-        call_range = bb_range
-        if bb_range in ["6", "7", "8", "9", "10"]:
-            call_range = "6-10"
-        elif bb_range in ["15-20", "20-25"]:
-            call_range = "15-25"
+        call_range = CALL_RANGES[bb_range]
             
         # Call all-in from EP
         function += "// Call all-in when EP pushes\n"
@@ -471,3 +503,144 @@ class PushFoldGenerator(BaseProfileGenerator):
         function += "WHEN Others RETURN Fold FORCE\n\n"
         
         return function
+
+    def _create_push_fold_tables(self, push_thresholds, call_push_thresholds):
+        """
+        Crée la version tabulée de la stratégie Push/Fold
+        
+        Une seule fonction f$PushFoldPreflop porte les règles; les seuils de handrank
+        sont lus dans une fonction par colonne (position ou seuil dérivé), qui choisit
+        la valeur de la plage de stack par une recherche dichotomique sur
+        f$EffectiveStack. Les positions de push s'excluent: f$PushFold_Push renvoie le
+        seuil de la nôtre. Parmi les positions du pousseur, une seule de EP/MP et une
+        seule de CO/BN/SB peuvent être vraies: une règle d'appel par groupe suffit.
+        Les décisions sont celles de _create_push_fold_function.
+        
+        Args:
+            push_thresholds (dict): Seuils de push par plage de stack et position
+            call_push_thresholds (dict): Seuils d'appel de push par plage d'appel et position
+            
+        Returns:
+            str: Code de f$PushFoldPreflop et des fonctions de seuils
+        """
+        bounds = [bound for _, bound in STACK_RANGE_BOUNDS]
+        
+        def push_column(position, factor=1):
+            return [round(push_thresholds[bb_range][position] * factor) for bb_range, _ in STACK_RANGE_BOUNDS]
+        
+        def call_column(vs_position, factor=1):
+            return [round(call_push_thresholds[CALL_RANGES[bb_range]][vs_position] * factor)
+                    for bb_range, _ in STACK_RANGE_BOUNDS]
+        
+        function = "##f$PushFoldPreflop##\n"
+        function += "// Main push/fold function, thresholds read from the f$PushFold_* stack tables\n"
+        function += "WHEN f$EffectiveStack > 25 OR BotsActionsOnThisRoundIncludingChecks > 0 RETURN Fold FORCE\n"
+        function += "// No action before us (first to act)\n"
+        function += "WHEN Raises = 0 AND Calls = 0 AND handrank169 <= f$PushFold_Push RETURN RaiseMax FORCE\n"
+        function += "WHEN Raises = 0 AND Calls = 0 AND InBigBlind RETURN Check FORCE\n"
+        function += "// BB push over limps, push over limpers (from any position)\n"
+        function += ("WHEN Raises = 0 AND Calls > 0 AND InBigBlind AND handrank169 <= f$PushFold_Push_BB "
+                     "RETURN RaiseMax FORCE\n")
+        function += "WHEN Raises = 0 AND Calls > 0 AND handrank169 <= f$PushFold_LimpPush RETURN RaiseMax FORCE\n"
+        function += "// Call all-in by pusher position (EP/MP, then CO/BN/SB)\n"
+        for group in ("Early", "Late"):
+            function += ("WHEN (RaisesSinceLastPlay = 1) AND (AmountToCall >= StackSize * 0.8) "
+                         f"AND handrank169 <= f$PushFold_Call_{group} RETURN Call FORCE\n")
+        function += "// Face standard raises (push or fold)\n"
+        function += ("WHEN (RaisesSinceLastPlay = 1) AND (AmountToCall < StackSize * 0.8) "
+                     "AND handrank169 <= f$PushFold_Reshove RETURN RaiseMax FORCE\n")
+        function += "// Face multiple all-ins\n"
+        function += "WHEN Raises >= 2 AND handrank169 <= f$PushFold_MultiCall RETURN Call FORCE\n"
+        function += "WHEN Others RETURN Fold FORCE\n\n"
+        
+        # Choix de la colonne selon la position (0: aucun handrank169 ne passe)
+        function += self._create_selector("f$PushFold_Push", "Push threshold of our position",
+                                          [(condition, f"f$PushFold_Push_{position}")
+                                           for position, condition in PUSH_POSITIONS])
+        early, late = CALL_POSITIONS[:2], CALL_POSITIONS[2:]
+        function += self._create_selector("f$PushFold_Call_Early", "Call all-in threshold vs an EP/MP pusher",
+                                          [("(LastRaiserPosition <= 3)", "f$PushFold_Call_vs_EP"),
+                                           ("(LastRaiserPosition <= 6)", "f$PushFold_Call_vs_MP")])
+        function += self._create_selector("f$PushFold_Call_Late", "Call all-in threshold vs a CO/BN/SB pusher",
+                                          [(condition, f"f$PushFold_Call_{vs_position}")
+                                           for vs_position, condition in late])
+        
+        # Tables de seuils, une fonction par colonne
+        for position, _ in PUSH_POSITIONS:
+            function += self._create_stack_table(f"f$PushFold_Push_{position}", f"{position} push threshold",
+                                                 bounds, push_column(position))
+        function += self._create_stack_table("f$PushFold_Push_BB", "BB push over limps threshold",
+                                             bounds, push_column("BB"))
+        function += self._create_stack_table("f$PushFold_LimpPush", "Push over limpers threshold",
+                                             bounds, push_column("CO", 0.8))
+        for vs_position, _ in early + late:
+            function += self._create_stack_table(f"f$PushFold_Call_{vs_position}",
+                                                 f"Call all-in {vs_position.replace('_', ' ')} threshold",
+                                                 bounds, call_column(vs_position))
+        function += self._create_stack_table("f$PushFold_Reshove", "Push over standard raises threshold",
+                                             bounds, call_column("vs_EP", 0.7))
+        function += self._create_stack_table("f$PushFold_MultiCall", "Call multiple all-ins threshold",
+                                             bounds, call_column("vs_EP", 0.4))
+        return function
+    
+    def _create_selector(self, function_name, description, choices):
+        """
+        Crée une fonction OH-script qui renvoie la valeur de la première condition vraie
+        
+        Args:
+            function_name (str): Nom de la fonction "f$Nom"
+            description (str): Description (commentaire)
+            choices (list): (condition, valeur) dans l'ordre; 0 si aucune n'est vraie
+            
+        Returns:
+            str: Code de la fonction
+        """
+        function = f"##{function_name}##\n"
+        function += f"// {description}\n"
+        for condition, value in choices:
+            function += f"{condition} ? {value} :\n"
+        return function + "0\n\n"
+    
+    def _create_stack_table(self, function_name, description, bounds, values):
+        """
+        Crée une fonction qui renvoie la valeur d'une colonne pour la plage de stack courante
+        
+        Les plages voisines de même valeur sont regroupées, puis la plage est trouvée
+        par une recherche dichotomique (tests ?: imbriqués sur f$EffectiveStack):
+        OpenHoldem évalue environ log2(n) bornes au lieu de parcourir les n plages. La
+        dernière plage n'a pas de borne (f$PushFoldPreflop écarte les stacks > 25BB).
+        
+        Args:
+            function_name (str): Nom de la fonction "f$Nom"
+            description (str): Description de la colonne (commentaire)
+            bounds (list): Borne haute de f$EffectiveStack de chaque plage, croissantes
+            values (list): Valeur de chaque plage
+            
+        Returns:
+            str: Code de la fonction (corps OH-script)
+        """
+        segments = []
+        for bound, value in zip(bounds, values):
+            if segments and segments[-1][1] == value:
+                segments[-1] = (bound, value)
+            else:
+                segments.append((bound, value))
+        
+        def search(segments, indent):
+            if len(segments) == 1:
+                return str(segments[0][1])
+            middle = (len(segments) + 1) // 2
+            condition = f"f$EffectiveStack <= {segments[middle - 1][0]}"
+            lower, upper = segments[:middle], segments[middle:]
+            if len(segments) <= 3:
+                lower_text, upper_text = search(lower, indent), search(upper, indent)
+                lower_text = lower_text if len(lower) == 1 else f"({lower_text})"
+                upper_text = upper_text if len(upper) == 1 else f"({upper_text})"
+                return f"{condition} ? {lower_text} : {upper_text}"
+            inner = indent + "    "
+            return (f"{condition}\n{inner}? ({search(lower, inner)})\n"
+                    f"{inner}: ({search(upper, inner)})")
+        
+        function = f"##{function_name}##\n"
+        function += f"// {description} by stack size\n"
+        return function + search(segments, "") + "\n\n"
@@ -0,0 +1,114 @@
+"""
+Assemblage headless d'un profil OpenHoldem complet
+Coordonne les générateurs des quatre streets sans dépendre de l'interface PyQt
+"""
+import json
+
+from generators.preflop import PreflopProfileGenerator
+from generators.flop import FlopProfileGenerator
+from generators.turn import TurnProfileGenerator
+from generators.river import RiverProfileGenerator
+from generators.profile_writer import write_chunks
+
+# Ordre canonique des streets dans un profil complet
+STREETS = ("preflop", "flop", "turn", "river")
+
+# Séparateur placé entre les profils de chaque street
+STREET_SEPARATOR = "\n\n"
+
+
+def load_settings(file_path):
+    """
+    Charge un fichier de paramètres au format écrit par export_settings
+
+    Args:
+        file_path (str): Chemin du fichier JSON
+
+    Returns:
+        dict: Paramètres par street ({"preflop": {...}, "flop": {...}, ...})
+
+    Raises:
+        ValueError: Si une street est absente du fichier
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        settings = json.load(file)
+
+    missing = [street for street in STREETS if street not in settings]
+    if missing:
+        raise ValueError(f"Missing settings section(s): {', '.join(missing)}")
+
+    return settings
+
+
+class ProfileBuilder:
+    """
+    Classe qui génère le profil complet (preflop, flop, turn, river)
+    à partir d'un dictionnaire de paramètres par street
+    """
+
+    def __init__(self, section_cache=None):
+        """
+        Initialise le constructeur de profils
+
+        Args:
+            section_cache (SectionCache): Cache partagé par les générateurs des quatre streets (optionnel)
+        """
+        self.section_cache = section_cache
+
+        # Initialiser les générateurs de chaque street
+        self.preflop_generator = PreflopProfileGenerator(section_cache)
+        self.flop_generator = FlopProfileGenerator(section_cache)
+        self.turn_generator = TurnProfileGenerator(section_cache)
+        self.river_generator = RiverProfileGenerator(section_cache)
+
+    def generate_street(self, street, settings):
+        """
+        Génère le profil d'une seule street
+
+        Args:
+            street (str): Nom de la street ("preflop", "flop", "turn" ou "river")
+            settings (dict): Paramètres de cette street
+
+        Returns:
+            str: Code de profil de la street
+        """
+        generator = getattr(self, f"{street}_generator")
+        return generator.generate_code(settings)
+
+    def iter_profile(self, settings):
+        """
+        Produit le profil complet morceau par morceau dans l'ordre canonique des streets
+
+        Args:
+            settings (dict): Paramètres par street, au format de export_settings
+
+        Yields:
+            str: Morceaux de code, séparateurs de streets compris
+        """
+        for index, street in enumerate(STREETS):
+            if index:
+                yield STREET_SEPARATOR
+            generator = getattr(self, f"{street}_generator")
+            yield from generator.iter_code(settings[street])
+
+    def write_profile(self, settings, sink):
+        """
+        Écrit le profil complet dans un puits sans construire la chaîne entière
+
+        Args:
+            settings (dict): Paramètres par street, au format de export_settings
+            sink: Puits de destination (voir generators.profile_writer)
+        """
+        write_chunks(self.iter_profile(settings), sink)
+
+    def generate_profile(self, settings):
+        """
+        Génère le profil complet dans l'ordre canonique des streets
+
+        Args:
+            settings (dict): Paramètres par street, au format de export_settings
+
+        Returns:
+            str: Code de profil complet
+        """
+        return "".join(self.iter_profile(settings))
@@ -0,0 +1,154 @@
+"""
+Écriture en flux des profils OpenHoldem
+Les générateurs produisent leur code par morceaux, écrits directement dans un
+puits (fichier, tampon mémoire ou empreinte) sans construire la chaîne complète
+"""
+import hashlib
+import io
+
+
+class FileSink:
+    """
+    Puits qui écrit les morceaux dans un fichier texte
+    """
+
+    def __init__(self, file_path):
+        """
+        Ouvre le fichier de destination
+
+        Args:
+            file_path (str): Chemin du fichier à écrire
+        """
+        self.file_path = file_path
+        self._file = open(file_path, 'w', encoding='utf-8')
+
+    def write(self, chunk):
+        """
+        Écrit un morceau de profil
+
+        Args:
+            chunk (str): Morceau de code
+        """
+        self._file.write(chunk)
+
+    def close(self):
+        """
+        Ferme le fichier
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BufferSink:
+    """
+    Puits qui conserve les morceaux en mémoire
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+
+    def write(self, chunk):
+        """
+        Ajoute un morceau de profil au tampon
+
+        Args:
+            chunk (str): Morceau de code
+        """
+        self._buffer.write(chunk)
+
+    def getvalue(self):
+        """
+        Renvoie le profil accumulé
+
+        Returns:
+            str: Code de profil complet
+        """
+        return self._buffer.getvalue()
+
+    def close(self):
+        """
+        Ne fait rien: le tampon reste lisible après l'écriture
+        """
+
+
+class HashSink:
+    """
+    Puits qui calcule l'empreinte SHA-256 et la taille en octets du profil
+    sans le conserver
+    """
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        """
+        Ajoute un morceau de profil à l'empreinte
+
+        Args:
+            chunk (str): Morceau de code
+        """
+        data = chunk.encode('utf-8')
+        self._hash.update(data)
+        self.size += len(data)
+
+    def hexdigest(self):
+        """
+        Renvoie l'empreinte des morceaux écrits jusqu'ici
+
+        Returns:
+            str: Empreinte SHA-256 en hexadécimal
+        """
+        return self._hash.hexdigest()
+
+    def close(self):
+        """
+        Ne fait rien: l'empreinte reste lisible après l'écriture
+        """
+
+
+class TeeSink:
+    """
+    Puits qui recopie chaque morceau dans plusieurs puits
+    """
+
+    def __init__(self, *sinks):
+        """
+        Args:
+            *sinks: Puits de destination
+        """
+        self.sinks = sinks
+
+    def write(self, chunk):
+        """
+        Écrit un morceau dans tous les puits
+
+        Args:
+            chunk (str): Morceau de code
+        """
+        for sink in self.sinks:
+            sink.write(chunk)
+
+    def close(self):
+        """
+        Ferme tous les puits
+        """
+        for sink in self.sinks:
+            sink.close()
+
+
+def write_chunks(chunks, sink):
+    """
+    Écrit une suite de morceaux dans un puits
+
+    Args:
+        chunks (iterable): Morceaux de code, dans l'ordre du profil
+        sink: Puits de destination (FileSink, BufferSink, HashSink ou TeeSink)
+    """
+    for chunk in chunks:
+        sink.write(chunk)
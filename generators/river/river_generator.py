@@ -8,6 +8,7 @@ from generators.river.facing_bets_generator import FacingBetsGenerator
 from generators.river.probe_generator import ProbeGenerator
 from generators.river.board_texture_generator import BoardTextureGenerator
 from generators.river.hand_categories_generator import HandCategoriesGenerator
+from generators.templates import static_section
 
 class RiverProfileGenerator(BaseRiverGenerator):
     """
@@ -15,7 +16,15 @@ class RiverProfileGenerator(BaseRiverGenerator):
     Coordonne les différents générateurs spécialisés
     """
     
-    def __init__(self):
+    def __init__(self, section_cache=None):
+        """
+        Initialise le générateur
+        
+        Args:
+            section_cache (SectionCache): Cache des sections générées (optionnel)
+        """
+        self.section_cache = section_cache
+        
         # Initialiser les générateurs spécialisés
         self.third_barrel_generator = ThirdBarrelGenerator()
         self.facing_bets_generator = FacingBetsGenerator()
@@ -33,31 +42,37 @@ class RiverProfileGenerator(BaseRiverGenerator):
         Returns:
             str: Code de profil river complet
         """
+        return "".join(self.iter_code(settings))
+    
+    def iter_code(self, settings):
+        """
+        Produit le profil river morceau par morceau, dans l'ordre du fichier
+        
+        Args:
+            settings (dict): Paramètres du générateur
+            
+        Yields:
+            str: En-tête, fonction principale, sections spécialisées puis pied de page
+        """
         # Générer l'en-tête du profil
-        profile = self._generate_header(settings)
+        yield self._generate_header(settings)
         
         # Générer la fonction principale river
-        main_river_function = self._generate_main_river_function()
-        profile += main_river_function
+        yield self._generate_main_river_function()
         
         # Générer chaque section spécialisée
-        third_barrel_code = self.third_barrel_generator.generate_code(settings)
-        facing_bets_code = self.facing_bets_generator.generate_code(settings)
-        probe_code = self.probe_generator.generate_code(settings)
-        board_texture_code = self.board_texture_generator.generate_code(settings)
-        hand_categories_code = self.hand_categories_generator.generate_code(settings)
-        
-        # Combiner le tout
-        profile += third_barrel_code + facing_bets_code + probe_code + board_texture_code + hand_categories_code
+        yield self.generate_section(self.third_barrel_generator, settings)
+        yield self.generate_section(self.facing_bets_generator, settings)
+        yield self.generate_section(self.probe_generator, settings)
+        yield self.generate_section(self.board_texture_generator, settings)
+        yield self.generate_section(self.hand_categories_generator, settings)
         
         # Ajouter le pied de page
-        profile += "//*****************************************************************************\n"
-        profile += "//\n"
-        profile += "// END OF RIVER PROFILE\n"
-        profile += "//\n"
-        profile += "//*****************************************************************************"
-        
-        return profile
+        yield ("//*****************************************************************************\n"
+               "//\n"
+               "// END OF RIVER PROFILE\n"
+               "//\n"
+               "//*****************************************************************************")
     
     def _generate_header(self, settings):
         """
@@ -91,6 +106,7 @@ class RiverProfileGenerator(BaseRiverGenerator):
         
         return header
     
+    @static_section
     def _generate_main_river_function(self):
         """
         Génère la fonction principale river qui coordonne les différentes fonctions
@@ -0,0 +1,136 @@
+"""
+Cache de sections de profil générées
+Réutilise le code d'un sous-générateur tant que les paramètres qu'il lit n'ont pas changé
+"""
+import threading
+from collections import OrderedDict
+
+from generators.settings_tracer import trace_generator
+
+# Valeur enregistrée dans l'empreinte pour un paramètre absent du dictionnaire
+_MISSING = "<missing>"
+
+
+def fingerprint(settings, keys):
+    """
+    Calcule l'empreinte d'un sous-ensemble de paramètres
+
+    Args:
+        settings (dict): Paramètres du générateur
+        keys (tuple): Clés à prendre en compte, triées
+
+    Returns:
+        tuple: Paires (clé, valeur) utilisables comme clé de dictionnaire
+    """
+    return tuple((key, settings.get(key, _MISSING)) for key in keys)
+
+
+class SectionCache:
+    """
+    Cache LRU du code généré par les sous-générateurs
+
+    Chaque entrée est indexée par la classe du générateur et l'empreinte des
+    paramètres qu'il a lus lors de sa dernière exécution. Une modification d'un
+    paramètre que le générateur ne lit pas ne provoque donc pas de régénération.
+    Le cache peut être partagé entre threads; la génération elle-même se fait
+    hors du verrou.
+    """
+
+    def __init__(self, max_entries=256):
+        """
+        Initialise le cache
+
+        Args:
+            max_entries (int): Nombre maximal de sections conservées
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._dependencies = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def dependencies(self, generator):
+        """
+        Renvoie les clés de paramètres lues par un générateur lors de sa dernière exécution
+
+        Args:
+            generator: Sous-générateur (instance de Base*Generator)
+
+        Returns:
+            tuple: Clés lues, ou None si le générateur n'a pas encore été exécuté
+        """
+        return self._dependencies.get(type(generator))
+
+    def render(self, generator, settings):
+        """
+        Renvoie le code d'un sous-générateur, depuis le cache si possible
+
+        Args:
+            generator: Sous-générateur (instance de Base*Generator)
+            settings (dict): Paramètres du générateur
+
+        Returns:
+            str: Code généré
+        """
+        generator_key = type(generator)
+
+        with self._lock:
+            keys = self._dependencies.get(generator_key)
+            if keys is not None:
+                entry_key = (generator_key, fingerprint(settings, keys))
+                code = self._entries.get(entry_key)
+                if code is not None:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return code
+            self.misses += 1
+
+        code, keys = trace_generator(generator, settings)
+        with self._lock:
+            self._dependencies[generator_key] = keys
+            self._store((generator_key, fingerprint(settings, keys)), code)
+
+        return code
+
+    def _store(self, entry_key, code):
+        """
+        Ajoute une entrée en évinçant la moins récemment utilisée si nécessaire
+
+        Args:
+            entry_key (tuple): Clé de l'entrée
+            code (str): Code généré
+        """
+        self._entries[entry_key] = code
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Vide le cache et remet les compteurs à zéro
+        """
+        with self._lock:
+            self._entries.clear()
+            self._dependencies.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Renvoie les statistiques d'utilisation du cache
+
+        Returns:
+            dict: Compteurs hits, misses, evictions, taille et taux de réussite
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,212 @@
+"""
+Traçage des dépendances entre générateurs et paramètres
+Enregistre les clés de paramètres lues par chaque generate_code et produit
+un manifeste de dépendances par générateur
+"""
+import argparse
+import json
+import sys
+
+from generators.profile_builder import ProfileBuilder, STREETS, load_settings
+from openppl.functions import split_profile
+
+
+class TracingSettings(dict):
+    """
+    Dictionnaire de paramètres qui mémorise les clés lues par un générateur
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.keys_read = set()
+
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.keys_read.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.keys_read.add(key)
+        return super().__contains__(key)
+
+
+def trace_generator(generator, settings):
+    """
+    Exécute un générateur en enregistrant les paramètres qu'il lit
+
+    Args:
+        generator: Générateur (instance de Base*Generator)
+        settings (dict): Paramètres du générateur
+
+    Returns:
+        tuple: (code généré, tuple trié des clés lues)
+    """
+    tracing_settings = TracingSettings(settings)
+    code = generator.generate_code(tracing_settings)
+    return code, tuple(sorted(tracing_settings.keys_read))
+
+
+def generator_name(generator):
+    """
+    Renvoie le nom qualifié d'un générateur, unique entre les streets
+
+    Args:
+        generator: Générateur (instance de Base*Generator)
+
+    Returns:
+        str: Nom sous la forme module.Classe
+    """
+    generator_class = type(generator)
+    return f"{generator_class.__module__}.{generator_class.__name__}"
+
+
+def iter_section_generators(street_generator):
+    """
+    Énumère les générateurs spécialisés d'un générateur de street
+
+    Args:
+        street_generator: Générateur principal d'une street
+
+    Returns:
+        list: Paires (nom d'attribut, générateur) dans l'ordre de déclaration
+    """
+    return [
+        (name, value) for name, value in vars(street_generator).items()
+        if name.endswith("_generator") and hasattr(value, "generate_code")
+    ]
+
+
+def function_origins(settings, builder=None):
+    """
+    Associe chaque fonction du profil au générateur qui l'a produite
+
+    Une fonction produite par un sous-générateur lui est attribuée; les autres
+    fonctions d'une street reviennent au générateur de street. Pour un nom défini
+    dans plusieurs streets, la première définition du profil l'emporte, comme
+    dans OpenHoldem.
+
+    Args:
+        settings (dict): Paramètres par street, au format de export_settings
+        builder (ProfileBuilder): Constructeur dont les générateurs sont utilisés (par défaut: un nouveau)
+
+    Returns:
+        dict: Nom "f$Nom" -> nom qualifié du générateur (voir generator_name)
+    """
+    builder = builder or ProfileBuilder()
+    origins = {}
+    for street in STREETS:
+        street_generator = getattr(builder, f"{street}_generator")
+        street_origins = {}
+        for _, generator in iter_section_generators(street_generator):
+            for block in split_profile(generator.generate_code(settings[street]))[1]:
+                street_origins.setdefault(block.name, generator_name(generator))
+        for block in split_profile(street_generator.generate_code(settings[street]))[1]:
+            origins.setdefault(block.name, street_origins.get(block.name, generator_name(street_generator)))
+    return origins
+
+
+def build_dependency_manifest(settings_samples, builder=None):
+    """
+    Construit le manifeste de dépendances de tous les générateurs
+
+    Les clés lues peuvent dépendre des valeurs (branches selon un paramètre);
+    le manifeste contient donc l'union des clés lues sur tous les échantillons.
+    Les clés lues par le générateur de street mais par aucun sous-générateur
+    ("street_only") n'influencent en pratique que l'en-tête du profil.
+
+    Args:
+        settings_samples (list): Paramètres par street, au format de export_settings
+        builder (ProfileBuilder): Constructeur à tracer (par défaut: un nouveau)
+
+    Returns:
+        dict: {"generators": {nom: {"street", "keys"}},
+               "unused": {street: [clés]}, "street_only": {street: [clés]}}
+    """
+    builder = builder or ProfileBuilder()
+    generators = {}
+    provided = {street: set() for street in STREETS}
+    read = {street: set() for street in STREETS}
+    read_by_sections = {street: set() for street in STREETS}
+
+    for settings in settings_samples:
+        for street in STREETS:
+            street_settings = settings[street]
+            street_generator = getattr(builder, f"{street}_generator")
+            provided[street].update(street_settings)
+
+            section_generators = [
+                generator for _, generator in iter_section_generators(street_generator)
+            ]
+            for generator in [street_generator] + section_generators:
+                _, keys = trace_generator(generator, street_settings)
+                entry = generators.setdefault(generator_name(generator), {"street": street, "keys": set()})
+                entry["keys"].update(keys)
+                read[street].update(keys)
+                if generator is not street_generator:
+                    read_by_sections[street].update(keys)
+
+    return {
+        "generators": {
+            name: {"street": entry["street"], "keys": sorted(entry["keys"])}
+            for name, entry in generators.items()
+        },
+        "unused": {street: sorted(provided[street] - read[street]) for street in STREETS},
+        "street_only": {street: sorted(read[street] - read_by_sections[street]) for street in STREETS},
+    }
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Trace which settings keys every generator reads and write a dependency manifest."
+    )
+    parser.add_argument("settings_files", nargs="+", help="Exported settings JSON files used as trace samples")
+    parser.add_argument("-o", "--output", help="Manifest file to write (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du traçage des dépendances
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    samples = [load_settings(path) for path in args.settings_files]
+    manifest = build_dependency_manifest(samples)
+
+    output = json.dumps(manifest, indent=4)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    for street in STREETS:
+        unused = manifest["unused"][street]
+        street_only = manifest["street_only"][street]
+        if unused:
+            print(f"{street}: {len(unused)} setting(s) never read: {', '.join(unused)}", file=sys.stderr)
+        if street_only:
+            print(f"{street}: {len(street_only)} setting(s) not read by any section: {', '.join(street_only)}",
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Balayage de paramètres avec déduplication des profils générés
+Parcourt une grille de valeurs de paramètres, génère les profils en parallèle et
+n'enregistre qu'une fois chaque profil identique (indexé par son empreinte SHA-256)
+
+Les en-têtes de profil recopient la valeur brute de chaque paramètre en
+commentaire: deux combinaisons qui produisent les mêmes règles (seuils arrondis
+aux 169 mains, par exemple) ne donnent donc jamais exactement le même texte. Par
+défaut l'empreinte est calculée sur le code sans commentaires ("code"); le mode
+"text" compare le texte complet.
+"""
+import hashlib
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from generators.profile_builder import ProfileBuilder, STREETS, load_settings
+from generators.profile_writer import BufferSink, HashSink, TeeSink
+from generators.section_cache import SectionCache
+from openppl.functions import strip_comments
+
+# Nom du fichier d'index écrit dans le répertoire de sortie
+INDEX_FILE = "index.json"
+
+# Sous-répertoire des profils uniques, nommés d'après leur empreinte
+PROFILES_DIR = "profiles"
+
+# Constructeur de profils propre à chaque processus de travail
+_builder = None
+
+
+def _get_builder():
+    """
+    Renvoie le constructeur de profils du processus courant, créé à la demande
+    Le cache de sections est très efficace ici: seuls les axes balayés changent
+
+    Returns:
+        ProfileBuilder: Constructeur réutilisé pour tous les points du processus
+    """
+    global _builder
+    if _builder is None:
+        _builder = ProfileBuilder(SectionCache())
+    return _builder
+
+
+def parse_axis(spec, base_settings=None):
+    """
+    Analyse la définition d'un axe de balayage
+
+    Formats acceptés: "street.clé=début:fin:pas" (entiers, fin incluse) ou "street.clé=v1,v2,v3"
+
+    Args:
+        spec (str): Définition de l'axe
+        base_settings (dict): Paramètres par street; si fourni, la clé doit y exister
+
+    Returns:
+        tuple: (nom qualifié "street.clé", liste des valeurs)
+
+    Raises:
+        ValueError: Si la définition est mal formée, la street ou la clé inconnue
+    """
+    name, separator, values = spec.partition("=")
+    street, _, key = name.partition(".")
+    if not separator or not key or street not in STREETS:
+        raise ValueError(f"Invalid axis (expected street.key=values): {spec}")
+    if base_settings is not None:
+        check_axis_name(name, base_settings)
+
+    if ":" in values:
+        try:
+            start, stop, step = (int(part) for part in values.split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid axis range (expected integers start:stop:step): {spec}") from None
+        if step <= 0:
+            raise ValueError(f"Invalid axis step: {spec}")
+        return name, list(range(start, stop + 1, step))
+
+    return name, [_parse_value(value) for value in values.split(",")]
+
+
+def check_axis_name(name, base_settings):
+    """
+    Vérifie qu'un axe désigne un paramètre existant (une clé mal orthographiée ne
+    balaierait rien)
+
+    Args:
+        name (str): Nom qualifié "street.clé"
+        base_settings (dict): Paramètres par street
+
+    Raises:
+        ValueError: Si la street ou la clé n'existe pas dans les paramètres
+    """
+    street, _, key = name.partition(".")
+    if key not in base_settings.get(street, {}):
+        raise ValueError(f"Unknown setting in axis: {name}")
+
+
+def _parse_value(text):
+    """
+    Convertit une valeur de la ligne de commande en int, float ou str
+
+    Args:
+        text (str): Valeur saisie
+
+    Returns:
+        int, float ou str: Valeur convertie
+    """
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def expand_grid(base_settings, axes):
+    """
+    Parcourt paresseusement toutes les combinaisons de la grille
+
+    Seules les streets modifiées par un axe sont copiées; les autres sont partagées
+    avec les paramètres de base et ne doivent pas être modifiées.
+
+    Args:
+        base_settings (dict): Paramètres par street
+        axes (list): Paires (nom qualifié "street.clé", valeurs)
+
+    Yields:
+        tuple: (valeurs de la combinaison, paramètres par street)
+    """
+    names = [name.split(".", 1) for name, _ in axes]
+    for values in itertools.product(*(axis_values for _, axis_values in axes)):
+        settings = dict(base_settings)
+        for (street, key), value in zip(names, values):
+            if settings[street] is base_settings[street]:
+                settings[street] = dict(base_settings[street])
+            settings[street][key] = value
+        yield values, settings
+
+
+def generate_point(position, values, settings, profiles_dir, dedupe="code"):
+    """
+    Génère le profil d'une combinaison et l'enregistre s'il est nouveau
+
+    Le fichier est écrit sous un nom temporaire puis renommé: deux processus qui
+    produisent le même profil écrivent un contenu équivalent sans se gêner. En
+    mode "code", le fichier conservé est l'une des variantes dont seuls les
+    commentaires diffèrent.
+
+    Args:
+        position (int): Rang de la combinaison dans la grille
+        values (tuple): Valeurs des axes
+        settings (dict): Paramètres par street
+        profiles_dir (str): Répertoire des profils uniques
+        dedupe (str): "code" (sans commentaires) ou "text" (texte complet)
+
+    Returns:
+        tuple: (position, valeurs, empreinte SHA-256 du profil)
+    """
+    buffer_sink = BufferSink()
+    if dedupe == "text":
+        hash_sink = HashSink()
+        _get_builder().write_profile(settings, TeeSink(buffer_sink, hash_sink))
+        profile_hash = hash_sink.hexdigest()
+    else:
+        _get_builder().write_profile(settings, buffer_sink)
+        profile_hash = hashlib.sha256(strip_comments(buffer_sink.getvalue()).encode('utf-8')).hexdigest()
+
+    profile_path = os.path.join(profiles_dir, profile_hash + ".ohf")
+    if not os.path.exists(profile_path):
+        temp_path = f"{profile_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(buffer_sink.getvalue())
+        os.replace(temp_path, profile_path)
+
+    return position, values, profile_hash
+
+
+def run_sweep(base_settings, axes, output_dir, workers=None, dedupe="code", max_pending=None):
+    """
+    Exécute le balayage complet et écrit l'index des combinaisons
+
+    Args:
+        base_settings (dict): Paramètres par street
+        axes (list): Paires (nom qualifié "street.clé", valeurs)
+        output_dir (str): Répertoire de sortie (index.json et profiles/)
+        workers (int): Nombre de processus (par défaut: nombre de CPU)
+        dedupe (str): "code" (sans commentaires) ou "text" (texte complet)
+        max_pending (int): Nombre maximal de combinaisons en cours (par défaut: 4 par processus)
+
+    Raises:
+        ValueError: Si le mode de déduplication est inconnu ou si un axe désigne un paramètre inexistant
+
+    Returns:
+        dict: Index écrit dans index.json
+    """
+    if dedupe not in ("code", "text"):
+        raise ValueError(f"Unknown dedupe mode: {dedupe}")
+    for name, _ in axes:
+        check_axis_name(name, base_settings)
+
+    profiles_dir = os.path.join(output_dir, PROFILES_DIR)
+    os.makedirs(profiles_dir, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for position, (values, settings) in enumerate(expand_grid(base_settings, axes)):
+            # Limiter le nombre de tâches en attente pour ne pas matérialiser la grille
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+            pending.add(executor.submit(generate_point, position, values, settings, profiles_dir, dedupe))
+        results.extend(future.result() for future in wait(pending).done)
+
+    results.sort()
+    index = {
+        "axes": [name for name, _ in axes],
+        "dedupe": dedupe,
+        "combinations": len(results),
+        "unique_profiles": len({profile_hash for _, _, profile_hash in results}),
+        "index": [{"values": list(values), "hash": profile_hash} for _, values, profile_hash in results],
+    }
+    with open(os.path.join(output_dir, INDEX_FILE), 'w', encoding='utf-8') as file:
+        json.dump(index, file, indent=4)
+        file.write("\n")
+    return index
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Sweep settings over a grid and store each distinct profile once, indexed by content hash."
+    )
+    parser.add_argument("settings_file", help="Base settings JSON file (export format)")
+    parser.add_argument("-a", "--axis", action="append", required=True,
+                        help="Axis as street.key=start:stop:step (stop included) or street.key=v1,v2,...")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for index.json and profiles/")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--dedupe", choices=("code", "text"), default="code",
+                        help="Hash the code without comments (default) or the full text")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du balayage
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    base_settings = load_settings(args.settings_file)
+    try:
+        axes = [parse_axis(spec, base_settings) for spec in args.axis]
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    index = run_sweep(base_settings, axes, args.output_dir, args.workers, args.dedupe)
+    elapsed = time.perf_counter() - start
+
+    combinations = index["combinations"]
+    unique = index["unique_profiles"]
+    print(f"Combinations: {combinations}, unique profiles: {unique} "
+          f"({100 * (1 - unique / combinations) if combinations else 0:.1f}% deduplicated)")
+    print(f"Wall time: {elapsed:.2f}s ({combinations / elapsed if elapsed else 0:.1f} combinations/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Blocs de code précompilés
+Les blocs qui ne dépendent d'aucun paramètre sont rendus une seule fois, à l'import
+du module; les blocs partiellement paramétrés ne substituent que leurs champs nommés
+"""
+import functools
+import string
+
+
+def static_section(method):
+    """
+    Décorateur pour une méthode de générateur qui ne dépend ni de self ni des paramètres
+
+    La méthode est exécutée une seule fois, lors de la définition de la classe,
+    et chaque appel renvoie ensuite le même texte.
+
+    Args:
+        method (function): Méthode sans argument autre que self
+
+    Returns:
+        function: Méthode renvoyant le bloc déjà rendu
+    """
+    code = method(None)
+
+    @functools.wraps(method)
+    def rendered(self):
+        return code
+
+    return rendered
+
+
+class SectionTemplate:
+    """
+    Bloc de code analysé une seule fois, dont seules les lignes paramétrées sont
+    complétées à chaque génération
+
+    Le texte utilise la syntaxe de str.format limitée aux champs nommés avec un
+    format optionnel ({nom} ou {nom:format}); les accolades littérales doivent
+    être doublées. Le texte est découpé à la construction en morceaux constants
+    et en champs, ce qui évite de réanalyser tout le bloc à chaque rendu.
+    """
+
+    def __init__(self, text):
+        """
+        Args:
+            text (str): Texte du bloc
+
+        Raises:
+            ValueError: Si un champ utilise une conversion (!r, !s) ou n'est pas nommé
+        """
+        self.text = text
+        self._parts = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(text):
+            if field is not None and (conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported template field: {field!r}")
+            self._parts.append((literal, field, format_spec))
+
+    def render(self, **values):
+        """
+        Complète les champs du bloc
+
+        Args:
+            **values: Valeur de chaque champ nommé
+
+        Returns:
+            str: Code généré
+        """
+        chunks = []
+        for literal, field, format_spec in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                chunks.append(format(values[field], format_spec))
+        return "".join(chunks)
+
+
+def section_template(method):
+    """
+    Décorateur pour une méthode qui construit le texte d'un SectionTemplate
+
+    Comme pour static_section, la méthode est exécutée une seule fois à l'import.
+
+    Args:
+        method (function): Méthode sans argument autre que self, renvoyant le texte du bloc
+
+    Returns:
+        function: Méthode renvoyant le SectionTemplate déjà construit
+    """
+    template = SectionTemplate(method(None))
+
+    @functools.wraps(method)
+    def compiled(self):
+        return template
+
+    return compiled
@@ -0,0 +1,5 @@
+"""
+Outils de traitement des profils OpenPPL générés
+"""
+from openppl.functions import (FunctionBlock, split_profile, join_profile, strip_comments,
+                               trailing_comments, function_references, call_graph)
@@ -0,0 +1,244 @@
+"""
+Analyse statique du graphe d'appel d'un profil et de la bibliothèque de scénarios
+Indexe toutes les définitions ##f$Nom## du profil (toutes streets) et de
+custom_function_library.ohf, résout chaque référence f$ et signale:
+    - les symboles appelés sans être définis nulle part (OpenHoldem les évalue à 0);
+    - les cycles d'appel (récursion directe ou mutuelle), qui bloquent l'évaluation;
+    - les points chauds: fonctions les plus appelées (fan-in) et qui appellent le
+      plus de fonctions (fan-out).
+
+Les définitions multiples d'un nom sont fusionnées, comme dans openppl.dead_code:
+chacune peut être celle que retient OpenHoldem. Seuls les symboles indéfinis appelés
+par le profil et les cycles sont des erreurs: la bibliothèque est maintenue à part
+et ses propres références sont seulement signalées.
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, load_library
+from openppl.functions import FUNCTION_REFERENCE, split_profile
+from openppl.linker import LIBRARY, PROFILE
+
+# Nombre de points chauds affichés par défaut
+DEFAULT_HOT_SPOTS = 10
+
+# Appel d'une fonction: appelant, provenance et ligne de l'appel
+CallSite = namedtuple("CallSite", ["caller", "source", "line"])
+
+# Résultat de l'analyse
+#   definitions: nombre de blocs indexés; functions: noms distincts définis
+#   undefined: nom -> liste des CallSite qui l'appellent
+#   cycles: tuples de noms, une composante fortement connexe par cycle
+#   fan_in, fan_out: (nom, nombre d'appelants / d'appelés distincts), décroissants
+CallGraphReport = namedtuple("CallGraphReport",
+                             ["definitions", "functions", "undefined", "cycles", "fan_in", "fan_out"])
+
+
+def index_calls(text, source, graph, sites):
+    """
+    Ajoute les définitions et appels d'un texte OpenPPL au graphe
+
+    Args:
+        text (str): Profil ou bibliothèque
+        source (str): Provenance (PROFILE ou LIBRARY)
+        graph (dict): Nom -> ensemble des noms appelés, complété sur place
+        sites (dict): Nom appelé -> liste des CallSite, complété sur place
+
+    Returns:
+        int: Nombre de blocs indexés
+    """
+    _, blocks = split_profile(text)
+    for block in blocks:
+        callees = graph.setdefault(block.name, set())
+        for offset, line in enumerate(block.text.split("\n")[1:], 1):
+            code = line.split("//", 1)[0]
+            if "f$" not in code:
+                continue
+            for name in FUNCTION_REFERENCE.findall(code):
+                callees.add(name)
+                sites.setdefault(name, []).append(CallSite(block.name, source, block.line + offset))
+    return len(blocks)
+
+
+def find_cycles(graph):
+    """
+    Recherche les cycles du graphe d'appel (composantes fortement connexes, Tarjan itératif)
+
+    Args:
+        graph (dict): Nom -> ensemble des noms appelés
+
+    Returns:
+        list: Tuples de noms de chaque cycle, dans l'ordre de découverte; une fonction
+              qui s'appelle elle-même forme un cycle à un élément
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    cycles = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(graph[root])))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, callees = work[-1]
+            for callee in callees:
+                if callee not in graph:
+                    continue
+                if callee not in index:
+                    index[callee] = lowlink[callee] = counter
+                    counter += 1
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(sorted(graph[callee]))))
+                    break
+                if callee in on_stack:
+                    lowlink[name] = min(lowlink[name], index[callee])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[name])
+                if lowlink[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    if len(component) > 1 or name in graph[name]:
+                        cycles.append(tuple(reversed(component)))
+    return cycles
+
+
+def analyze_call_graph(profile, library=None, external=()):
+    """
+    Analyse le graphe d'appel d'un profil et de la bibliothèque
+
+    Args:
+        profile (str): Code de profil assemblé
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        external (iterable): Noms fournis par ailleurs, à ne pas signaler comme indéfinis
+
+    Returns:
+        CallGraphReport: Résultat de l'analyse
+    """
+    graph = {}
+    sites = {}
+    definitions = 0
+    if library:
+        definitions += index_calls(library, LIBRARY, graph, sites)
+    definitions += index_calls(profile, PROFILE, graph, sites)
+
+    known = set(graph) | set(external)
+    undefined = {name: sites[name] for name in sorted(sites) if name not in known}
+
+    callers = {}
+    for caller, callees in graph.items():
+        for callee in callees:
+            callers.setdefault(callee, set()).add(caller)
+    fan_in = sorted(((name, len(names)) for name, names in callers.items()), key=lambda item: (-item[1], item[0]))
+    fan_out = sorted(((name, len(callees)) for name, callees in graph.items() if callees),
+                     key=lambda item: (-item[1], item[0]))
+    return CallGraphReport(definitions, len(graph), undefined, find_cycles(graph), fan_in, fan_out)
+
+
+def call_graph_errors(report):
+    """
+    Sélectionne les problèmes qui doivent faire échouer un lot
+
+    Args:
+        report (CallGraphReport): Résultat de analyze_call_graph
+
+    Returns:
+        list: Erreurs lisibles: symboles indéfinis appelés par le profil, cycles
+    """
+    errors = [f"undefined {name}" for name, name_sites in report.undefined.items()
+              if any(site.source == PROFILE for site in name_sites)]
+    errors.extend(f"cycle {' -> '.join(cycle + cycle[:1])}" for cycle in report.cycles)
+    return errors
+
+
+def format_report(report, hot_spots=DEFAULT_HOT_SPOTS):
+    """
+    Construit le rapport d'analyse du graphe d'appel
+
+    Args:
+        report (CallGraphReport): Résultat de analyze_call_graph
+        hot_spots (int): Nombre de fonctions listées par fan-in et par fan-out
+
+    Returns:
+        str: Rapport lisible
+    """
+    lines = []
+    for name, name_sites in report.undefined.items():
+        locations = ", ".join(f"{site.caller} ({site.source}:{site.line})" for site in name_sites[:3])
+        more = f" and {len(name_sites) - 3} more" if len(name_sites) > 3 else ""
+        label = "UNDEFINED" if any(site.source == PROFILE for site in name_sites) else "UNDEFINED (library only)"
+        lines.append(f"{label} {name}: called by {locations}{more}")
+    for cycle in report.cycles:
+        lines.append(f"CYCLE {' -> '.join(cycle + cycle[:1])}")
+    if hot_spots:
+        lines.append("Most called (fan-in): " + ", ".join(f"{name} {count}"
+                                                          for name, count in report.fan_in[:hot_spots]))
+        lines.append("Most calling (fan-out): " + ", ".join(f"{name} {count}"
+                                                             for name, count in report.fan_out[:hot_spots]))
+    lines.append(f"Indexed {report.definitions} definition(s) of {report.functions} function(s); "
+                 f"{len(report.undefined)} undefined symbol(s), {len(report.cycles)} cycle(s)")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Resolve every f$ reference of a profile and report undefined symbols, cycles and hot spots."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Only index the profile itself")
+    parser.add_argument("--external", action="append", default=[], metavar="NAME",
+                        help="Function provided elsewhere (repeatable); never reported as undefined")
+    parser.add_argument("--hot-spots", type=int, default=DEFAULT_HOT_SPOTS,
+                        help=f"Functions listed by fan-in and fan-out (default: {DEFAULT_HOT_SPOTS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'analyse du graphe d'appel
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si le profil appelle un symbole indéfini ou si un cycle est détecté)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8') as file:
+        profile = file.read()
+    library = None if args.no_library else load_library(args.library)
+
+    report = analyze_call_graph(profile, library, args.external)
+    print(format_report(report, args.hot_spots))
+    return 1 if call_graph_errors(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,611 @@
+"""
+Compilation d'un profil en fonctions Python
+Traduit chaque fonction ##f$Nom## analysée (openppl.parser) en une fonction Python
+spécialisée, écrite dans un source généré chargé une seule fois. Les symboles de la
+situation sont résolus à la compilation en positions d'une ligne (tuple des valeurs
+dans l'ordre de CompiledProfile.slots); les constantes et noms d'action deviennent
+des littéraux; chaque fonction f$ est mémorisée dans une liste indexée.
+
+La sémantique est celle d'openppl.evaluator, avec une différence en mode strict:
+tous les symboles référencés par le profil doivent être fournis, qu'ils soient
+atteints ou non pendant la décision.
+
+Un CompileCache réutilise le profil compilé tant que l'empreinte du profil et de
+la bibliothèque ne change pas; avec un répertoire, le source généré est conservé
+sur disque et un nouveau processus ne recompile pas le profil.
+"""
+import argparse
+import importlib.util
+import json
+import marshal
+import operator
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, load_library
+from openppl.evaluator import (ACTION_NAMES, CONSTANTS, Bet, EvaluationError, FiredRule, format_decision,
+                               make_decision, resolve_functions, street_entry_point)
+from openppl.parser import Binary, Conditional, Number, Symbol, Unary
+from openppl.store import content_hash
+
+# Version du source généré, incluse dans l'empreinte des caches
+COMPILER_VERSION = 1
+
+# Nombre de profils compilés conservés en mémoire par défaut
+DEFAULT_CACHE_ENTRIES = 16
+
+# Opérateurs traduits tels quels
+PYTHON_OPERATORS = {
+    "=": "==", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=",
+    "+": "+", "-": "-", "*": "*", "**": "**",
+}
+
+# Opérateurs binaires sur entiers
+INTEGER_OPERATORS = ("&", "|", "^", "<<", ">>")
+
+# Indentation du source généré et nom de fichier de son code objet
+INDENT = "    "
+SOURCE_NAME = "<openppl.compiler>"
+
+# Valeur d'une fonction pas encore évaluée dans la liste de mémorisation
+UNSET = object()
+
+# Profil compilé
+#   source: source Python généré
+#   names: nom des fonctions, dans l'ordre de leurs positions
+#   slots: symboles de la situation, dans l'ordre des valeurs d'une ligne
+#   lines: ligne de chaque règle, par fonction
+#   returns: (fonction, règle) -> fonction dont la valeur est renvoyée telle quelle
+#   functions: fonctions Python, une par nom
+Program = namedtuple("Program", ["source", "names", "slots", "lines", "returns", "functions"])
+
+
+def _div(left, right):
+    """
+    Division; OpenHoldem renvoie 0 pour une division par zéro
+    """
+    return 0 if right == 0 else left / right
+
+
+def _mod(left, right):
+    """
+    Modulo; OpenHoldem renvoie 0 pour un modulo zéro
+    """
+    return 0 if right == 0 else left % right
+
+
+def _operands(node, operator_name):
+    """
+    Aplatit une suite d'opérations associatives (a AND b AND c)
+
+    Le source reste ainsi peu imbriqué, quelle que soit la longueur de la condition.
+    """
+    operands = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Binary) and current.operator == operator_name:
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            operands.append(current)
+    return operands
+
+
+class _SourceWriter:
+    """
+    Génère le source Python d'un ensemble de fonctions
+    """
+
+    def __init__(self, functions):
+        self.functions = functions
+        self.index = {name: position for position, name in enumerate(functions)}
+        self.slots = {}
+        self.returns = {}
+
+    def slot(self, name):
+        return self.slots.setdefault(name, len(self.slots))
+
+    def call(self, name):
+        position = self.index[name]
+        return f"(m[{position}] if m[{position}] is not U else f{position}(m, k, r))"
+
+    def test(self, node):
+        """
+        Expression utilisée comme condition: sa valeur de vérité seule compte
+        """
+        if isinstance(node, Binary) and node.operator in ("AND", "OR"):
+            joiner = " and " if node.operator == "AND" else " or "
+            return "(" + joiner.join(self.test(operand) for operand in _operands(node, node.operator)) + ")"
+        if isinstance(node, Unary) and node.operator == "NOT":
+            return f"(not {self.test(node.operand)})"
+        return self.value(node)
+
+    def value(self, node):
+        """
+        Expression dont la valeur est utilisée
+        """
+        if isinstance(node, Number):
+            return repr(node.value)
+        if isinstance(node, Symbol):
+            name = node.name
+            if name in self.index:
+                return self.call(name)
+            key = name.lower()
+            if key in CONSTANTS:
+                return repr(CONSTANTS[key])
+            if key in ACTION_NAMES:
+                return repr(ACTION_NAMES[key])
+            return f"r[{self.slot(name)}]"
+        if isinstance(node, Binary):
+            operator_name = node.operator
+            if operator_name in ("AND", "OR"):
+                return f"(True if {self.test(node)} else False)"
+            if operator_name == "XOR":
+                return f"((not {self.test(node.left)}) != (not {self.test(node.right)}))"
+            left, right = self.value(node.left), self.value(node.right)
+            if operator_name == "/":
+                return f"_div({left}, {right})"
+            if operator_name == "%":
+                return f"_mod({left}, {right})"
+            if operator_name in INTEGER_OPERATORS:
+                return f"(int({left}) {operator_name} int({right}))"
+            if operator_name in PYTHON_OPERATORS:
+                return f"({left} {PYTHON_OPERATORS[operator_name]} {right})"
+            raise EvaluationError(f"unknown operator {operator_name}")
+        if isinstance(node, Unary):
+            if node.operator == "NOT":
+                return f"(not {self.test(node.operand)})"
+            if node.operator == "~":
+                return f"(~int({self.value(node.operand)}))"
+            if node.operator == "-":
+                return f"(-{self.value(node.operand)})"
+            return self.value(node.operand)
+        if isinstance(node, Conditional):
+            return f"({self.value(node.then)} if {self.test(node.condition)} else {self.value(node.otherwise)})"
+        raise EvaluationError(f"cannot compile {type(node).__name__}")
+
+    def result(self, position, index, action):
+        """
+        Valeur renvoyée par une règle
+        """
+        if action.value is None:
+            return repr(ACTION_NAMES.get(action.kind.lower(), action.kind))
+        value = self.value(action.value)
+        if action.kind != "RETURN":
+            return f"Bet({action.kind!r}, {value}, {action.percent!r})"
+        if isinstance(action.value, Symbol) and action.value.name in self.index:
+            self.returns[(position, index)] = self.index[action.value.name]
+        return value
+
+    def function(self, position, function):
+        """
+        Source d'une fonction
+
+        Returns:
+            list: Lignes du source, indentées pour build()
+        """
+        prefix = INDENT * 2
+        lines = [f"{INDENT}def f{position}(m, k, r):", f"{prefix}# {function.name}"]
+        if function.expression is not None:
+            lines.append(f"{prefix}v = m[{position}] = {self.value(function.expression)}")
+            lines.append(f"{prefix}return v")
+            return lines
+
+        block = None
+        for index, rule in enumerate(function.rules):
+            if rule.action is None:
+                if block is not None and block == len(lines):
+                    lines.append(prefix + INDENT + "pass")
+                if rule.condition is None:
+                    prefix, block = INDENT * 2, None
+                else:
+                    lines.append(f"{INDENT * 2}if {self.test(rule.condition)}:")
+                    prefix, block = INDENT * 3, len(lines)
+                continue
+            body = prefix
+            if rule.condition is not None:
+                lines.append(f"{prefix}if {self.test(rule.condition)}:")
+                body = prefix + INDENT
+            lines.append(f"{body}v = {self.result(position, index, rule.action)}")
+            lines.append(f"{body}k[{position}] = {index}")
+            lines.append(f"{body}m[{position}] = v")
+            lines.append(f"{body}return v")
+        if block is not None and block == len(lines):
+            lines.append(prefix + "pass")
+        lines.append(f"{INDENT * 2}m[{position}] = 0")
+        lines.append(f"{INDENT * 2}return 0")
+        return lines
+
+
+def generate_source(profile, library=None):
+    """
+    Génère le source Python d'un profil
+
+    Args:
+        profile: Texte du profil ou ParsedProfile
+        library: Texte ou ParsedProfile de la bibliothèque de scénarios (None: aucune)
+
+    Returns:
+        str: Source d'un module qui définit NAMES, SLOTS, LINES, RETURNS et build()
+    """
+    functions = resolve_functions(profile, library)
+    writer = _SourceWriter(functions)
+    body = []
+    for position, function in enumerate(functions.values()):
+        body.extend(writer.function(position, function))
+    names = tuple(functions)
+    slots = tuple(sorted(writer.slots, key=writer.slots.get))
+    lines = tuple(tuple(rule.line for rule in function.rules) for function in functions.values())
+
+    source = [
+        f"# Generated by openppl.compiler (version {COMPILER_VERSION}); do not edit",
+        f"NAMES = {names!r}",
+        f"SLOTS = {slots!r}",
+        f"LINES = {lines!r}",
+        f"RETURNS = {writer.returns!r}",
+        "",
+        "",
+        "def build(U, Bet, _div, _mod):",
+    ]
+    source.extend(body)
+    source.append(f"{INDENT}return ({''.join(f'f{position}, ' for position in range(len(names)))})")
+    return "\n".join(source) + "\n"
+
+
+def load_program(source, code=None):
+    """
+    Charge un source généré par generate_source
+
+    Args:
+        source (str): Source Python
+        code: Code objet déjà compilé de ce source (None: compilé ici)
+
+    Returns:
+        Program: Profil compilé
+    """
+    if code is None:
+        code = compile(source, SOURCE_NAME, "exec")
+    namespace = {}
+    exec(code, namespace)
+    functions = namespace["build"](UNSET, Bet, _div, _mod)
+    return Program(source, namespace["NAMES"], namespace["SLOTS"], namespace["LINES"], namespace["RETURNS"],
+                   functions)
+
+
+def profile_hash(profile, library=None):
+    """
+    Calcule l'empreinte d'un profil et de sa bibliothèque pour les caches
+
+    Args:
+        profile (str): Texte du profil
+        library (str): Texte de la bibliothèque (None: aucune)
+
+    Returns:
+        str: Empreinte SHA-256, qui dépend aussi de COMPILER_VERSION
+    """
+    return content_hash(f"{COMPILER_VERSION}\0{library or ''}\0{profile}")
+
+
+class CompiledProfile:
+    """
+    Profil compilé, utilisable comme openppl.evaluator.Evaluator
+    """
+
+    def __init__(self, program, strict=True):
+        """
+        Prépare l'évaluation d'un profil compilé
+
+        Args:
+            program (Program): Résultat de load_program
+            strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+        """
+        self.program = program
+        self.strict = strict
+        self.names = program.names
+        self.slots = program.slots
+        self.index = {name: position for position, name in enumerate(program.names)}
+        self._function_names = frozenset(program.names)
+        if len(program.slots) == 1:
+            self._fetch = lambda state, name=program.slots[0]: (state[name],)
+        elif program.slots:
+            self._fetch = operator.itemgetter(*program.slots)
+        else:
+            self._fetch = lambda state: ()
+
+    def row(self, state):
+        """
+        Range les symboles d'une situation dans l'ordre de slots
+
+        Args:
+            state (dict): Symboles OpenHoldem de la situation
+
+        Returns:
+            tuple: Valeurs des symboles
+
+        Raises:
+            EvaluationError: Si un symbole manque (mode strict)
+        """
+        try:
+            return self._fetch(state)
+        except KeyError:
+            if self.strict:
+                missing = [name for name in self.slots if name not in state]
+                more = f" and {len(missing) - 5} more" if len(missing) > 5 else ""
+                raise EvaluationError(f"symbol(s) {', '.join(missing[:5])}{more} not defined by the profile "
+                                      f"or the game state") from None
+            return tuple(state.get(name, 0) for name in self.slots)
+
+    def _run(self, position, row, memo, fired):
+        try:
+            return self.program.functions[position](memo, fired, row)
+        except TypeError as error:
+            raise EvaluationError(f"invalid operands: {error}") from None
+        except RecursionError:
+            raise EvaluationError(f"recursive call from {self.names[position]}") from None
+
+    def _position(self, name):
+        position = self.index.get(name)
+        if position is None:
+            raise EvaluationError(f"function {name} is not defined by the profile")
+        return position
+
+    def run(self, row, entry_point):
+        """
+        Évalue une fonction sur une ligne, sans trace (chemin rapide des gros volumes)
+
+        Args:
+            row (tuple): Valeurs des symboles dans l'ordre de slots (voir row)
+            entry_point (str): Nom de la fonction évaluée
+
+        Returns:
+            Valeur de la fonction (nombre, booléen, nom d'action ou Bet)
+        """
+        count = len(self.names)
+        return self._run(self._position(entry_point), row, [UNSET] * count, [None] * count)
+
+    def _prepare(self, state):
+        memo = [UNSET] * len(self.names)
+        if self._function_names.isdisjoint(state):
+            return memo, ()
+        overrides = self._function_names.intersection(state)
+        for name in overrides:
+            memo[self.index[name]] = state[name]
+        return memo, overrides
+
+    def evaluate(self, name, state):
+        """
+        Évalue une fonction sur une situation
+
+        Args:
+            name (str): Nom de la fonction "f$Nom"
+            state (dict): Symboles OpenHoldem de la situation
+
+        Returns:
+            Valeur de la fonction (nombre, booléen, nom d'action ou Bet)
+        """
+        memo, _ = self._prepare(state)
+        return self._run(self._position(name), self.row(state), memo, [None] * len(self.names))
+
+    def decide(self, state, entry_point=None):
+        """
+        Calcule la décision du profil pour une situation
+
+        Args:
+            state (dict): Symboles OpenHoldem de la situation
+            entry_point (str): Fonction évaluée (par défaut: selon betround, 1 à 4, sinon f$preflop)
+
+        Returns:
+            Decision: Action, montant et règles appliquées, comme Evaluator.decide
+
+        Raises:
+            EvaluationError: Si un symbole manque (mode strict) ou si l'évaluation boucle
+        """
+        position = self._position(entry_point or street_entry_point(state))
+        row = self.row(state)
+        memo, overrides = self._prepare(state)
+        fired = [None] * len(self.names)
+        value = self._run(position, row, memo, fired)
+
+        program = self.program
+        chain = []
+        while position is not None and fired[position] is not None:
+            index = fired[position]
+            chain.append(FiredRule(self.names[position], index, program.lines[position][index]))
+            position = program.returns.get((position, index))
+
+        results = {name: result for name, result in zip(self.names, memo) if result is not UNSET}
+        for name in overrides:
+            del results[name]
+        return make_decision(value, chain, {name: fired[self.index[name]] for name in results}, results)
+
+
+def compile_profile(profile, library=None, strict=True):
+    """
+    Compile un profil sans cache
+
+    Args:
+        profile: Texte du profil ou ParsedProfile
+        library: Texte ou ParsedProfile de la bibliothèque de scénarios (None: aucune)
+        strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+
+    Returns:
+        CompiledProfile: Profil compilé
+    """
+    return CompiledProfile(load_program(generate_source(profile, library)), strict)
+
+
+class CompileCache:
+    """
+    Cache LRU des profils compilés, indexé par l'empreinte du profil et de la bibliothèque
+
+    Avec un répertoire, le source généré (<empreinte>.py) et son code objet
+    (<empreinte>.<version de Python>.code) y sont écrits et relus par les processus suivants.
+    """
+
+    def __init__(self, directory=None, max_entries=DEFAULT_CACHE_ENTRIES):
+        """
+        Initialise le cache
+
+        Args:
+            directory (str): Répertoire des sources générés (None: mémoire seulement)
+            max_entries (int): Nombre maximal de profils conservés en mémoire
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _write(self, path, data):
+        # Écriture atomique: un autre processus peut lire le même fichier
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def _load(self, key, profile, library):
+        if not self.directory:
+            self.misses += 1
+            return load_program(generate_source(profile, library))
+        source_path = os.path.join(self.directory, key + ".py")
+        code_path = os.path.join(self.directory, f"{key}.{sys.implementation.cache_tag}.code")
+        if os.path.exists(source_path):
+            with open(source_path, 'r', encoding='utf-8') as file:
+                source = file.read()
+            self.disk_hits += 1
+        else:
+            source = generate_source(profile, library)
+            self._write(source_path, source.encode('utf-8'))
+            self.misses += 1
+
+        # Le code objet ne vaut que pour la version de Python qui l'a produit
+        code = None
+        if os.path.exists(code_path):
+            with open(code_path, 'rb') as file:
+                data = file.read()
+            if data.startswith(importlib.util.MAGIC_NUMBER):
+                code = marshal.loads(data[len(importlib.util.MAGIC_NUMBER):])
+        if code is None:
+            code = compile(source, SOURCE_NAME, "exec")
+            self._write(code_path, importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+        return load_program(source, code)
+
+    def get(self, profile, library=None, strict=True):
+        """
+        Renvoie le profil compilé, depuis le cache si possible
+
+        Args:
+            profile (str): Texte du profil
+            library (str): Texte de la bibliothèque de scénarios (None: aucune)
+            strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+
+        Returns:
+            CompiledProfile: Profil compilé
+        """
+        key = profile_hash(profile, library)
+        with self._lock:
+            program = self._entries.get(key)
+            if program is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if program is None:
+            program = self._load(key, profile, library)
+            with self._lock:
+                self._entries[key] = program
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return CompiledProfile(program, strict)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Compteurs du cache (hits, disk_hits, misses, entries)
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "entries": len(self._entries)}
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Compile a profile to Python functions and optionally evaluate game states with it."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("states", nargs="?", help="JSON file with one game state or a list of states to evaluate")
+    parser.add_argument("-o", "--output", help="Write the generated Python source to this file")
+    parser.add_argument("--cache", metavar="DIR", help="Directory of compiled sources reused across runs")
+    parser.add_argument("--entry-point", help="Function to evaluate (default: from betround, else f$preflop)")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Compile the profile alone")
+    parser.add_argument("--lenient", action="store_true", help="Treat symbols missing from the state as 0")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la compilation
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si une situation ne peut pas être évaluée)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8') as file:
+        profile = file.read()
+    library = None if args.no_library else load_library(args.library)
+
+    start = time.perf_counter()
+    if args.cache:
+        cache = CompileCache(args.cache)
+        compiled = cache.get(profile, library, strict=not args.lenient)
+        origin = "cache" if cache.disk_hits else "compiled"
+    else:
+        compiled = compile_profile(profile, library, strict=not args.lenient)
+        origin = "compiled"
+    elapsed = 1000 * (time.perf_counter() - start)
+    print(f"{args.profile}: {len(compiled.names)} function(s), {len(compiled.slots)} symbol(s), "
+          f"{len(compiled.program.source)} bytes of Python, {origin} in {elapsed:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(compiled.program.source)
+    if not args.states:
+        return 0
+
+    with open(args.states, 'r', encoding='utf-8') as file:
+        states = json.load(file)
+    if isinstance(states, dict):
+        states = [states]
+    status = 0
+    for number, state in enumerate(states, 1):
+        if len(states) > 1:
+            print(f"State {number}:")
+        try:
+            print(format_decision(compiled.decide(state, args.entry_point)))
+        except EvaluationError as error:
+            print(f"ERROR {error}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
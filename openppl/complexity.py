@@ -0,0 +1,346 @@
+"""
+Complexité et coût d'évaluation d'un profil assemblé
+Pour chaque street, à partir de son point d'entrée (f$preflop, f$flop, ...):
+nombre de fonctions accessibles, de règles et d'appels f$, profondeur d'appel
+maximale et nombre de règles évaluées au pire sur un chemin d'appel. Les
+fonctions sont regroupées par générateur d'origine si la provenance est fournie
+(voir generators.settings_tracer.function_origins).
+
+OpenHoldem ne retient qu'une définition par nom: comme openppl.textures, on
+retient la première du fichier. Les fonctions de custom_function_library.ohf
+(f$EffectiveStack, f$BotRaisedOnRiver, ...) sont comptées comme les autres, le
+profil masquant la bibliothèque (voir openppl.evaluator.resolve_functions).
+Chaque WHEN compte pour une règle, WHEN sans action compris: sa condition est
+évaluée comme celle d'une règle. Dans une fonction OH-script sans WHEN, chaque
+test ?: compte pour une règle, mais le pire chemin n'en retient que la plus
+longue suite de tests imbriqués (une recherche dichotomique n'en évalue qu'une
+branche). Une fonction étant mémorisée pendant une décision, le nombre de règles
+accessibles borne le coût d'une décision; le pire chemin mesure la plus longue
+suite d'évaluations imbriquées.
+
+Des budgets (fichier JSON) font échouer la commande quand ils sont dépassés:
+
+    {"default": {"worst_path": 400}, "preflop": {"rules": 900, "max_depth": 8}}
+"""
+import argparse
+import json
+import sys
+from collections import namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.functions import FUNCTION_REFERENCE, function_body, split_profile, strip_comments
+from openppl.parser import Binary, Conditional, ParseError, Unary, parse_expression
+from openppl.rules import WHEN
+
+# Indicateurs d'une street, dans l'ordre d'affichage
+METRICS = ("functions", "rules", "calls", "max_depth", "worst_path")
+
+# Groupe des fonctions dont la provenance est inconnue
+UNKNOWN_ORIGIN = "?"
+
+# Groupe des fonctions définies par la seule bibliothèque de scénarios
+LIBRARY_ORIGIN = "custom_function_library"
+
+# Clé des budgets qui s'appliquent à toutes les streets
+DEFAULT_BUDGET = "default"
+
+# Coût d'une fonction: règles (WHEN ou tests ?:), règles évaluées au pire en une
+# évaluation et appels f$ (occurrences, hors commentaires)
+FunctionCost = namedtuple("FunctionCost", ["rules", "path", "calls", "callees"])
+
+# Indicateurs d'une street; worst_chain est la suite de fonctions du pire chemin et
+# cycles le nombre d'appels qui referment un cycle (ignorés par les parcours)
+StreetComplexity = namedtuple("StreetComplexity",
+                              ["entry_point", "functions", "rules", "calls", "max_depth", "worst_path",
+                               "worst_chain", "cycles", "undefined"])
+
+# Indicateurs d'un groupe de fonctions d'une street
+GroupComplexity = namedtuple("GroupComplexity", ["functions", "rules", "calls"])
+
+# Résultat de l'analyse: street -> StreetComplexity, street -> {groupe: GroupComplexity}
+ComplexityReport = namedtuple("ComplexityReport", ["streets", "groups"])
+
+
+def function_cost(body):
+    """
+    Mesure le corps d'une fonction
+
+    Args:
+        body (str): Corps de la fonction (sans la ligne d'en-tête)
+
+    Returns:
+        FunctionCost: Règles, pire chemin, appels f$ et ensemble des fonctions appelées
+    """
+    code = strip_comments(body)
+    references = FUNCTION_REFERENCE.findall(code)
+    rules = sum(1 for line in code.split("\n") if WHEN.match(line))
+    if rules or "?" not in code:
+        return FunctionCost(rules, rules, len(references), set(references))
+    # Fonction OH-script: un test par ?:, une seule branche évaluée
+    rules = code.count("?")
+    try:
+        path = _conditional_depth(parse_expression(code))
+    except ParseError:
+        path = rules
+    return FunctionCost(rules, path, len(references), set(references))
+
+
+def _conditional_depth(node):
+    """
+    Plus longue suite de tests ?: évalués par une expression
+    """
+    if isinstance(node, Conditional):
+        return (_conditional_depth(node.condition) + 1
+                + max(_conditional_depth(node.then), _conditional_depth(node.otherwise)))
+    if isinstance(node, Binary):
+        return _conditional_depth(node.left) + _conditional_depth(node.right)
+    if isinstance(node, Unary):
+        return _conditional_depth(node.operand)
+    return 0
+
+
+def index_functions(profile):
+    """
+    Mesure chaque fonction d'un profil, première définition de chaque nom
+
+    Args:
+        profile (str): Code de profil
+
+    Returns:
+        dict: Nom -> FunctionCost
+    """
+    _, blocks = split_profile(profile)
+    costs = {}
+    for block in blocks:
+        if block.name not in costs:
+            costs[block.name] = function_cost(function_body(block))
+    return costs
+
+
+def street_complexity(costs, entry_point):
+    """
+    Calcule les indicateurs d'un point d'entrée
+
+    Args:
+        costs (dict): Nom -> FunctionCost (voir index_functions)
+        entry_point (str): Fonction appelée par OpenHoldem
+
+    Returns:
+        tuple: (StreetComplexity, ensemble des fonctions définies accessibles)
+    """
+    reachable = set()
+    undefined = set()
+    cycles = 0
+    # Pire chemin à partir de chaque fonction: (profondeur, règles, chaîne)
+    paths = {}
+    active = set()
+
+    def visit(name):
+        nonlocal cycles
+        if name in paths:
+            return paths[name]
+        reachable.add(name)
+        active.add(name)
+        cost = costs[name]
+        depth, worst, chain = 0, 0, ()
+        for callee in sorted(cost.callees):
+            if callee not in costs:
+                undefined.add(callee)
+                continue
+            if callee in active:
+                cycles += 1
+                continue
+            callee_depth, callee_worst, callee_chain = visit(callee)
+            depth = max(depth, callee_depth)
+            if callee_worst > worst:
+                worst, chain = callee_worst, callee_chain
+        active.discard(name)
+        paths[name] = (depth + 1, worst + cost.path, (name,) + chain)
+        return paths[name]
+
+    if entry_point not in costs:
+        return StreetComplexity(entry_point, 0, 0, 0, 0, 0, (), 0, ()), reachable
+    max_depth, worst_path, worst_chain = visit(entry_point)
+    return StreetComplexity(
+        entry_point,
+        functions=len(reachable),
+        rules=sum(costs[name].rules for name in reachable),
+        calls=sum(costs[name].calls for name in reachable),
+        max_depth=max_depth,
+        worst_path=worst_path,
+        worst_chain=worst_chain,
+        cycles=cycles,
+        undefined=tuple(sorted(undefined)),
+    ), reachable
+
+
+def analyze_profile(profile, library=None, origins=None, entry_points=ENTRY_POINTS):
+    """
+    Analyse la complexité de chaque street d'un profil
+
+    Args:
+        profile (str): Code de profil assemblé
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        origins (dict): Nom de fonction -> générateur d'origine (None: provenance inconnue)
+        entry_points (tuple): Points d'entrée, un par street, dans l'ordre des streets
+
+    Returns:
+        ComplexityReport: Indicateurs par street et par générateur
+    """
+    costs = index_functions(profile)
+    library_names = set()
+    if library:
+        for name, cost in index_functions(library).items():
+            if name not in costs:
+                costs[name] = cost
+                library_names.add(name)
+    origins = origins or {}
+    streets = {}
+    groups = {}
+    for entry_point in entry_points:
+        street = entry_point[2:]
+        streets[street], reachable = street_complexity(costs, entry_point)
+
+        street_groups = {}
+        for name in reachable:
+            origin = origins.get(name, LIBRARY_ORIGIN if name in library_names else UNKNOWN_ORIGIN)
+            functions, rules, calls = street_groups.get(origin, (0, 0, 0))
+            street_groups[origin] = (functions + 1, rules + costs[name].rules, calls + costs[name].calls)
+        groups[street] = {
+            origin: GroupComplexity(*totals)
+            for origin, totals in sorted(street_groups.items(), key=lambda item: -item[1][1])
+        }
+    return ComplexityReport(streets, groups)
+
+
+def load_budgets(path):
+    """
+    Charge un fichier de budgets
+
+    Args:
+        path (str): Chemin du fichier JSON {street ou "default": {indicateur: maximum}}
+
+    Returns:
+        dict: Budgets
+
+    Raises:
+        ValueError: Si un indicateur est inconnu
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        budgets = json.load(file)
+    for scope, limits in budgets.items():
+        unknown = sorted(set(limits) - set(METRICS))
+        if unknown:
+            raise ValueError(f"Unknown metric(s) in budget '{scope}': {', '.join(unknown)}")
+    return budgets
+
+
+def check_budgets(report, budgets):
+    """
+    Compare les indicateurs de chaque street à leurs budgets
+
+    Args:
+        report (ComplexityReport): Résultat de analyze_profile
+        budgets (dict): {street ou "default": {indicateur: maximum}}
+
+    Returns:
+        list: Dépassements lisibles, vide si tous les budgets sont respectés
+    """
+    violations = []
+    for street, complexity in report.streets.items():
+        limits = dict(budgets.get(DEFAULT_BUDGET, {}))
+        limits.update(budgets.get(street, {}))
+        for metric in METRICS:
+            if metric in limits and getattr(complexity, metric) > limits[metric]:
+                violations.append(f"{street}: {metric} {getattr(complexity, metric)} > budget {limits[metric]}")
+    return violations
+
+
+def format_report(report, verbose=False):
+    """
+    Met en forme les indicateurs par street et par générateur
+
+    Args:
+        report (ComplexityReport): Résultat de analyze_profile
+        verbose (bool): Afficher les groupes par générateur et le pire chemin
+
+    Returns:
+        str: Tableau lisible
+    """
+    lines = [f"{'street':<8} {'functions':>9} {'rules':>6} {'calls':>6} {'depth':>6} {'worst path':>10}"]
+    for street, complexity in report.streets.items():
+        lines.append(f"{street:<8} {complexity.functions:>9} {complexity.rules:>6} {complexity.calls:>6} "
+                     f"{complexity.max_depth:>6} {complexity.worst_path:>10}")
+        if complexity.cycles:
+            lines.append(f"    {complexity.cycles} recursive call(s) ignored")
+        if complexity.undefined:
+            lines.append(f"    {len(complexity.undefined)} undefined function(s) called")
+        if not verbose:
+            continue
+        if complexity.undefined:
+            lines.append(f"    undefined: {', '.join(complexity.undefined)}")
+        lines.append(f"    worst path: {' -> '.join(complexity.worst_chain)}")
+        for origin, group in report.groups[street].items():
+            lines.append(f"    {origin:<68} {group.functions:>5} {group.rules:>6} {group.calls:>6}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Report functions, rules, calls, call depth and worst-case rule evaluations per street."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Only index the profile itself")
+    parser.add_argument("--settings", help="Settings JSON file the profile was generated from "
+                                           "(groups functions by generator)")
+    parser.add_argument("--budgets", help="Budget JSON file; exit with status 1 when a budget is exceeded")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show per-generator groups and worst paths")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du rapport de complexité
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si un budget est dépassé)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8') as file:
+        profile = file.read()
+
+    origins = None
+    if args.settings:
+        # La provenance demande les générateurs, dont le reste d'openppl ne dépend pas
+        from generators.profile_builder import load_settings
+        from generators.settings_tracer import function_origins
+        origins = function_origins(load_settings(args.settings))
+
+    library = None if args.no_library else load_library(args.library)
+    report = analyze_profile(profile, library, origins)
+    print(format_report(report, args.verbose or bool(args.settings)))
+
+    if not args.budgets:
+        return 0
+    violations = check_budgets(report, load_budgets(args.budgets))
+    for violation in violations:
+        print(f"OVER BUDGET {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Contraintes imposées par une condition OpenPPL à l'état de la table
+Une condition est lue comme une conjonction de symboles booléens, de positions
+(un seul symbole In* est vrai à la fois), d'intervalles sur des comparaisons et de
+termes opaques. Ces contraintes permettent de prouver que deux conditions
+s'excluent, qu'une condition en implique une autre ou qu'elle ne peut pas être
+vraie. Tout ce qui n'est pas reconnu est traité prudemment: deux conditions ne
+s'excluent que sur une contradiction certaine.
+"""
+import math
+import re
+
+from openppl.rules import split_conjuncts, split_operands, strip_parentheses
+
+# Symboles de position: un seul est vrai à un instant donné
+POSITION_SYMBOLS = (
+    "InEarlyPosition1", "InEarlyPosition2", "InEarlyPosition3",
+    "InMiddlePosition1", "InMiddlePosition2", "InMiddlePosition3",
+    "InCutOff", "InButton", "InSmallBlind", "InBigBlind",
+)
+
+# Domaine des symboles numériques connus: (minimum, maximum)
+SYMBOL_DOMAINS = {
+    "handrank169": (1, 169),
+    "nplayersdealt": (2, 10),
+    "nopponentsplaying": (0, 9),
+    "Calls": (0, math.inf),
+    "Raises": (0, math.inf),
+    "Bets": (0, math.inf),
+    "CallsSinceLastRaise": (0, math.inf),
+    "RaisesSinceLastPlay": (0, math.inf),
+    "BotsActionsOnThisRound": (0, math.inf),
+    "BotsActionsOnThisRoundIncludingChecks": (0, math.inf),
+}
+
+COMPARISON = re.compile(r'^(?P<left>.+?)\s*(?P<operator>==|<=|>=|!=|<>|=|<|>)\s*(?P<right>.+)$')
+OFFSET = re.compile(r'^(?P<base>.+?)\s*(?P<sign>[+-])\s*(?P<value>\d+(?:\.\d+)?)$')
+NUMBER = re.compile(r'^-?\d+(?:\.\d+)?$')
+NEGATION = re.compile(r'^NOT\s+(?P<operand>.+)$', re.IGNORECASE)
+SYMBOL = re.compile(r'(?:f\$)?[A-Za-z_$][\w$]*')
+KEYWORDS = {"AND", "OR", "NOT", "XOR"}
+
+
+def intersect(first, second):
+    """
+    Intersection de deux intervalles (borne basse, incluse, borne haute, incluse)
+
+    Args:
+        first (tuple): Premier intervalle
+        second (tuple): Second intervalle
+
+    Returns:
+        tuple: Intervalle commun (éventuellement vide)
+    """
+    low, low_in, high, high_in = first
+    other_low, other_low_in, other_high, other_high_in = second
+    if other_low > low or (other_low == low and not other_low_in):
+        low, low_in = other_low, other_low_in
+    if other_high < high or (other_high == high and not other_high_in):
+        high, high_in = other_high, other_high_in
+    return low, low_in, high, high_in
+
+
+def is_empty(bounds):
+    """
+    Args:
+        bounds (tuple): Intervalle (borne basse, incluse, borne haute, incluse)
+
+    Returns:
+        bool: True si aucune valeur n'est dans l'intervalle
+    """
+    low, low_in, high, high_in = bounds
+    return low > high or (low == high and not (low_in and high_in))
+
+
+def contains(outer, inner):
+    """
+    Args:
+        outer (tuple): Intervalle englobant
+        inner (tuple): Intervalle englobé
+
+    Returns:
+        bool: True si toutes les valeurs de inner sont dans outer
+    """
+    return is_empty(inner) or intersect(outer, inner) == inner
+
+
+def domain_bounds(key):
+    """
+    Renvoie le domaine d'une clé de comparaison, s'il est connu
+
+    Args:
+        key (tuple): (membre gauche, base symbolique du membre droit)
+
+    Returns:
+        tuple: Intervalle du domaine, ou None
+    """
+    left, base = key
+    if base or left not in SYMBOL_DOMAINS:
+        return None
+    low, high = SYMBOL_DOMAINS[left]
+    return low, True, high, True
+
+
+def parse_comparison(atom):
+    """
+    Analyse une comparaison à une constante ou à une base symbolique décalée
+
+    "LastRaiserPosition = nplayersdealt - 2" donne la clé ("LastRaiserPosition",
+    "nplayersdealt") et l'intervalle [-2, -2].
+
+    Args:
+        atom (str): Terme sans parenthèses englobantes
+
+    Returns:
+        tuple: (clé, intervalle), ou None si le terme n'est pas une comparaison exploitable
+    """
+    match = COMPARISON.match(atom)
+    if match is None or match.group("operator") in ("!=", "<>"):
+        return None
+    left = match.group("left").strip()
+    right = match.group("right").strip()
+    if NUMBER.match(right):
+        base, value = "", float(right)
+    else:
+        offset = OFFSET.match(right)
+        if offset and NUMBER.match(offset.group("value")):
+            value = float(offset.group("value")) * (-1 if offset.group("sign") == "-" else 1)
+            base = offset.group("base").strip()
+        else:
+            base, value = right, 0.0
+
+    bounds = {
+        "=": (value, True, value, True),
+        "==": (value, True, value, True),
+        "<": (-math.inf, False, value, False),
+        "<=": (-math.inf, False, value, True),
+        ">": (value, False, math.inf, False),
+        ">=": (value, True, math.inf, False),
+    }[match.group("operator")]
+    return (left, base), bounds
+
+
+def atom_truth(atom):
+    """
+    Évalue un terme constant: comparaison entre nombres, ou comparaison d'un
+    symbole à une valeur hors de son domaine ou couvrant tout son domaine
+    ("handrank169 <= 0" est toujours faux, "handrank169 <= 169" toujours vrai)
+
+    Args:
+        atom (str): Terme d'une condition
+
+    Returns:
+        bool: Valeur du terme, ou None s'il dépend de l'état de la table
+    """
+    atom = strip_parentheses(atom)
+    comparison = parse_comparison(atom)
+    if comparison is None:
+        return None
+    (left, base), bounds = comparison
+    if NUMBER.match(left) and not base:
+        value = float(left)
+        domain = (value, True, value, True)
+    else:
+        domain = domain_bounds((left, base))
+        if domain is None:
+            return None
+    if is_empty(intersect(domain, bounds)):
+        return False
+    if contains(bounds, domain):
+        return True
+    return None
+
+
+class Constraints:
+    """
+    Ensemble de contraintes qu'une condition impose à l'état de la table
+    """
+
+    def __init__(self):
+        self.booleans = {}
+        self.positions = None
+        self.ranges = {}
+        self.opaque = set()
+        self.contradiction = False
+
+    def add_boolean(self, name, value):
+        """
+        Ajoute un symbole booléen (les symboles de position réduisent l'ensemble des positions)
+
+        Args:
+            name (str): Nom du symbole ou de la fonction f$
+            value (bool): Valeur imposée
+        """
+        if name in POSITION_SYMBOLS:
+            allowed = {name} if value else set(POSITION_SYMBOLS) - {name}
+            self.restrict_positions(allowed)
+        elif self.booleans.get(name, value) != value:
+            self.contradiction = True
+        else:
+            self.booleans[name] = value
+
+    def restrict_positions(self, allowed):
+        """
+        Args:
+            allowed (iterable): Positions compatibles avec la condition
+        """
+        self.positions = frozenset(allowed) if self.positions is None else self.positions & frozenset(allowed)
+        if not self.positions:
+            self.contradiction = True
+
+    def add_range(self, key, bounds):
+        """
+        Ajoute une comparaison; une comparaison vraie sur tout le domaine du symbole est ignorée
+
+        Args:
+            key (tuple): (membre gauche, base symbolique du membre droit)
+            bounds (tuple): (borne basse, incluse, borne haute, incluse)
+        """
+        domain = domain_bounds(key)
+        if domain is not None:
+            if contains(bounds, domain):
+                return
+            bounds = intersect(bounds, domain)
+        self.ranges[key] = intersect(self.ranges[key], bounds) if key in self.ranges else bounds
+        if is_empty(self.ranges[key]):
+            self.contradiction = True
+
+    def add_opaque(self, atom):
+        """
+        Args:
+            atom (str): Terme non analysable, comparé textuellement
+        """
+        self.opaque.add(" ".join(atom.split()))
+
+    def excludes(self, other):
+        """
+        Indique si deux ensembles de contraintes ne peuvent pas être satisfaits ensemble
+
+        Args:
+            other (Constraints): Contraintes d'une autre condition
+
+        Returns:
+            bool: True si aucun état ne satisfait les deux conditions
+        """
+        if self.contradiction or other.contradiction:
+            return True
+        for name, value in self.booleans.items():
+            if other.booleans.get(name, value) != value:
+                return True
+        if self.positions is not None and other.positions is not None and not self.positions & other.positions:
+            return True
+        for key, bounds in self.ranges.items():
+            if key in other.ranges and is_empty(intersect(bounds, other.ranges[key])):
+                return True
+        return False
+
+    def implies(self, other):
+        """
+        Indique si tout état qui satisfait ces contraintes satisfait aussi other
+
+        Args:
+            other (Constraints): Contraintes d'une autre condition
+
+        Returns:
+            bool: True si l'implication est certaine
+        """
+        if self.contradiction:
+            return True
+        if other.contradiction:
+            return False
+        if any(self.booleans.get(name) != value for name, value in other.booleans.items()):
+            return False
+        if other.positions is not None and (self.positions is None or not self.positions <= other.positions):
+            return False
+        for key, bounds in other.ranges.items():
+            if key not in self.ranges or not contains(bounds, self.ranges[key]):
+                return False
+        return other.opaque <= self.opaque
+
+
+def condition_constraints(condition, constraints=None):
+    """
+    Extrait les contraintes d'une condition (conjonctions imbriquées comprises)
+
+    Args:
+        condition (str): Condition ou terme
+        constraints (Constraints): Contraintes à compléter (optionnel)
+
+    Returns:
+        Constraints: Contraintes de la condition
+    """
+    constraints = constraints or Constraints()
+    atom = strip_parentheses(condition)
+    conjuncts = split_conjuncts(atom)
+    if conjuncts and len(conjuncts) > 1:
+        for conjunct in conjuncts:
+            condition_constraints(conjunct, constraints)
+        return constraints
+
+    disjuncts = split_operands(atom, "OR")
+    if disjuncts and len(disjuncts) > 1:
+        # Seule une disjonction de positions est exploitable
+        disjuncts = [strip_parentheses(disjunct) for disjunct in disjuncts]
+        if all(disjunct in POSITION_SYMBOLS for disjunct in disjuncts):
+            constraints.restrict_positions(disjuncts)
+        else:
+            constraints.add_opaque(atom)
+        return constraints
+
+    negation = NEGATION.match(atom)
+    truth = atom_truth(atom)
+    if truth is False:
+        constraints.contradiction = True
+    elif truth is True:
+        pass
+    elif negation and SYMBOL.fullmatch(negation.group("operand").strip()):
+        constraints.add_boolean(negation.group("operand").strip(), False)
+    elif SYMBOL.fullmatch(atom) and atom.upper() not in KEYWORDS:
+        constraints.add_boolean(atom, True)
+    else:
+        comparison = parse_comparison(atom)
+        if comparison:
+            constraints.add_range(*comparison)
+        else:
+            constraints.add_opaque(atom)
+    return constraints
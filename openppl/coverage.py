@@ -0,0 +1,503 @@
+"""
+Couverture des règles d'un profil sur un corpus de situations
+Évalue le profil (openppl.evaluator, ou openppl.compiler pour aller plus vite) sur
+chaque situation du corpus et compte, par fonction, le nombre d'évaluations et,
+par règle, le nombre de fois où elle a fixé la valeur de la fonction. Les fonctions
+jamais évaluées et les règles jamais appliquées désignent les branches des
+générateurs inutiles dans les conditions de jeu du corpus (f$CbetLowCardBoard, ...).
+
+La couverture s'enregistre en JSON; les fichiers de plusieurs processus (ou de
+plusieurs machines) se fusionnent tant qu'ils portent sur le même profil et la
+même bibliothèque. Le rapport liste les fonctions jamais évaluées et les règles
+jamais appliquées; la copie annotée du .ohf porte les compteurs en commentaire
+"// coverage:" sur la ligne qui suit l'en-tête de chaque fonction et au bout de
+chaque règle.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from openppl.compiler import compile_profile
+from openppl.dead_code import DEFAULT_LIBRARY, load_library
+from openppl.evaluator import EvaluationError, Evaluator, resolve_functions
+from openppl.parser import format_expression, parse_profile
+from openppl.store import content_hash
+
+# Version du format des fichiers de couverture
+COVERAGE_VERSION = 1
+
+# Situations évaluées par tâche en mode parallèle
+DEFAULT_CHUNK_SIZE = 2000
+
+# Début des commentaires ajoutés à la copie annotée
+ANNOTATION = "// coverage:"
+
+# Moteur d'évaluation propre à chaque processus de travail
+_worker_engine = None
+
+
+class CoverageError(ValueError):
+    """
+    Fichier de couverture invalide ou calculé sur un autre profil
+    """
+
+
+def coverage_key(profile, library=None):
+    """
+    Identifie le profil et la bibliothèque d'une couverture
+
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+
+    Returns:
+        str: Empreinte SHA-256
+    """
+    return content_hash(f"{library or ''}\0{profile}")
+
+
+class Coverage:
+    """
+    Compteurs de couverture d'un profil
+
+    Attributes:
+        key (str): Empreinte du profil et de la bibliothèque (voir coverage_key)
+        states (int): Situations évaluées
+        errors (int): Situations dont l'évaluation a échoué
+        calls (Counter): Fonction -> nombre d'évaluations
+        hits (Counter): (fonction, rang de la règle) -> nombre d'applications
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.states = 0
+        self.errors = 0
+        self.calls = Counter()
+        self.hits = Counter()
+
+    def record(self, decision):
+        """
+        Ajoute les fonctions évaluées et les règles appliquées d'une décision
+
+        Args:
+            decision (Decision): Résultat de Evaluator.decide ou CompiledProfile.decide
+        """
+        self.states += 1
+        calls = self.calls
+        hits = self.hits
+        for name, index in decision.fired.items():
+            calls[name] += 1
+            if index is not None:
+                hits[name, index] += 1
+
+    def merge(self, other):
+        """
+        Ajoute les compteurs d'une autre couverture du même profil
+
+        Args:
+            other (Coverage): Couverture à ajouter
+
+        Raises:
+            CoverageError: Si les deux couvertures portent sur des profils différents
+        """
+        if self.key is None:
+            self.key = other.key
+        elif other.key is not None and other.key != self.key:
+            raise CoverageError(f"coverage of another profile ({other.key[:12]}, expected {self.key[:12]})")
+        self.states += other.states
+        self.errors += other.errors
+        self.calls.update(other.calls)
+        self.hits.update(other.hits)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Couverture sérialisable en JSON
+        """
+        functions = {name: {"calls": calls, "rules": {}} for name, calls in sorted(self.calls.items())}
+        for (name, index), count in sorted(self.hits.items()):
+            functions[name]["rules"][str(index)] = count
+        return {
+            "version": COVERAGE_VERSION,
+            "key": self.key,
+            "states": self.states,
+            "errors": self.errors,
+            "functions": functions,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Args:
+            data (dict): Couverture produite par to_dict
+
+        Returns:
+            Coverage: Couverture
+
+        Raises:
+            CoverageError: Si le format n'est pas reconnu
+        """
+        if data.get("version") != COVERAGE_VERSION:
+            raise CoverageError(f"unsupported coverage version {data.get('version')!r}")
+        coverage = cls(data.get("key"))
+        coverage.states = data["states"]
+        coverage.errors = data["errors"]
+        for name, function in data["functions"].items():
+            coverage.calls[name] = function["calls"]
+            for index, count in function["rules"].items():
+                coverage.hits[name, int(index)] = count
+        return coverage
+
+    def save(self, path):
+        """
+        Écrit la couverture en JSON (remplacement atomique du fichier)
+
+        Args:
+            path (str): Fichier de sortie
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=4)
+            file.write("\n")
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Args:
+            path (str): Fichier écrit par save
+
+        Returns:
+            Coverage: Couverture
+
+        Raises:
+            CoverageError: Si le format n'est pas reconnu
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls.from_dict(json.load(file))
+
+
+def make_engine(profile, library=None, strict=True, compiled=False):
+    """
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+        compiled (bool): Profil compilé (openppl.compiler) plutôt que l'évaluateur
+
+    Returns:
+        Evaluator ou CompiledProfile: Moteur dont decide renvoie les règles appliquées
+    """
+    if compiled:
+        return compile_profile(profile, library, strict)
+    return Evaluator(profile, library, strict)
+
+
+def measure(engine, states, entry_point=None, coverage=None):
+    """
+    Évalue un corpus et compte les fonctions évaluées et les règles appliquées
+
+    Une situation dont l'évaluation échoue est comptée dans Coverage.errors; ses
+    fonctions ne sont pas comptées.
+
+    Args:
+        engine: Evaluator ou CompiledProfile
+        states (iterable): Situations {symbole: valeur}
+        entry_point (str): Fonction évaluée (par défaut: selon betround)
+        coverage (Coverage): Couverture complétée (par défaut: une nouvelle)
+
+    Returns:
+        Coverage: Couverture
+    """
+    if coverage is None:
+        coverage = Coverage()
+    for state in states:
+        try:
+            decision = engine.decide(state, entry_point)
+        except EvaluationError:
+            coverage.errors += 1
+            continue
+        coverage.record(decision)
+    return coverage
+
+
+def _init_worker(profile, library, strict, compiled):
+    """
+    Prépare le moteur d'un processus de travail, une seule fois pour toutes ses tâches
+    """
+    global _worker_engine
+    _worker_engine = make_engine(profile, library, strict, compiled)
+
+
+def _measure_chunk(states, entry_point):
+    """
+    Tâche d'un processus de travail: couverture d'une tranche du corpus, sérialisée
+    """
+    return measure(_worker_engine, states, entry_point).to_dict()
+
+
+def collect_coverage(profile, library, states, strict=True, entry_point=None, compiled=False, workers=1,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcule la couverture d'un profil sur un corpus, éventuellement en parallèle
+
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        states (list): Situations {symbole: valeur}
+        strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+        entry_point (str): Fonction évaluée (par défaut: selon betround)
+        compiled (bool): Évaluer avec le profil compilé
+        workers (int): Nombre de processus (1: dans le processus courant)
+        chunk_size (int): Situations par tâche en mode parallèle
+
+    Returns:
+        Coverage: Couverture, fusion de celles des processus
+    """
+    coverage = Coverage(coverage_key(profile, library))
+    if workers <= 1 or len(states) <= chunk_size:
+        return measure(make_engine(profile, library, strict, compiled), states, entry_point, coverage)
+
+    chunks = [states[start:start + chunk_size] for start in range(0, len(states), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(profile, library, strict, compiled)) as executor:
+        for data in executor.map(_measure_chunk, chunks, [entry_point] * len(chunks)):
+            coverage.merge(Coverage.from_dict(data))
+    return coverage
+
+
+def _rule_indices(function):
+    """
+    Rangs des règles d'une fonction qui fixent une valeur (hors WHEN sans action)
+    """
+    return [index for index, rule in enumerate(function.rules) if rule.action is not None]
+
+
+def format_report(coverage, functions, library_names=()):
+    """
+    Construit le rapport de couverture
+
+    Args:
+        coverage (Coverage): Couverture
+        functions (dict): Nom -> Function évaluée (voir openppl.evaluator.resolve_functions)
+        library_names (set): Fonctions définies par la bibliothèque (numéros de ligne de la bibliothèque)
+
+    Returns:
+        str: Résumé, fonctions jamais évaluées et règles jamais appliquées
+    """
+    total_rules = fired_rules = 0
+    never_called = []
+    partial = []
+    for name, function in functions.items():
+        indices = _rule_indices(function)
+        fired = [index for index in indices if coverage.hits[name, index]]
+        total_rules += len(indices)
+        fired_rules += len(fired)
+        calls = coverage.calls[name]
+        source = "library line" if name in library_names else "line"
+        if not calls:
+            never_called.append(f"    {name} ({len(indices)} rule(s), {source} {function.line})")
+        elif len(fired) < len(indices):
+            lines = ", ".join(str(function.rules[index].line) for index in indices
+                              if not coverage.hits[name, index])
+            partial.append(f"    {name}: {calls} call(s), {len(fired)}/{len(indices)} rule(s) fired, "
+                           f"never fired on {source}(s) {lines}")
+
+    called = sum(1 for name in functions if coverage.calls[name])
+    lines = [
+        f"States: {coverage.states + coverage.errors} ({coverage.errors} failed)",
+        f"Functions evaluated: {called}/{len(functions)} ({100 * called / len(functions) if functions else 0:.1f}%)",
+        f"Rules fired: {fired_rules}/{total_rules} ({100 * fired_rules / total_rules if total_rules else 0:.1f}%)",
+    ]
+    if never_called:
+        lines += ["", f"Never evaluated ({len(never_called)}):"] + never_called
+    if partial:
+        lines += ["", f"Rules never fired ({len(partial)} function(s)):"] + partial
+    return "\n".join(lines)
+
+
+def _append_comment(line, comment):
+    """
+    Ajoute un commentaire au bout d'une ligne, avant un éventuel retour chariot
+    """
+    if line.endswith("\r"):
+        return f"{line[:-1]}  {comment}\r"
+    return f"{line}  {comment}"
+
+
+def _expression_text(node):
+    return None if node is None else format_expression(node)
+
+
+def _signature(parsed):
+    """
+    Noms et règles des fonctions d'un profil analysé, sans les positions
+    """
+    return [
+        (function.name, _expression_text(function.expression),
+         tuple((_expression_text(rule.condition), rule.force) + (
+             () if rule.action is None else
+             (rule.action.kind, _expression_text(rule.action.value), rule.action.percent))
+             for rule in function.rules))
+        for function in parsed.functions
+    ]
+
+
+def annotate_profile(profile, coverage):
+    """
+    Copie un profil avec les compteurs de couverture en commentaire
+
+    La ligne ##f$...## est laissée telle quelle (OpenHoldem n'accepte rien après
+    l'en-tête): le nombre d'évaluations de la fonction est écrit sur une ligne
+    "// coverage:" juste après. Chaque règle qui fixe une valeur reçoit en bout de
+    ligne le nombre de fois où elle a été appliquée. Une définition masquée par une
+    définition antérieure du même nom n'est jamais évaluée et est signalée comme telle.
+
+    Args:
+        profile (str): Code de profil
+        coverage (Coverage): Couverture de ce profil
+
+    Returns:
+        str: Profil annoté, qui s'analyse en les mêmes fonctions et règles que profile
+
+    Raises:
+        CoverageError: Si le profil annoté ne s'analyse pas comme l'original
+    """
+    parsed = parse_profile(profile)
+    headers = {}
+    counts = {}
+    first_lines = {}
+    for function in parsed.functions:
+        name = function.name
+        if name in first_lines:
+            # Une ligne est insérée après chaque en-tête qui précède la première définition
+            first_line = first_lines[name]
+            shift = sum(1 for other in parsed.functions if other.line < first_line)
+            headers[function.line] = f"{ANNOTATION} shadowed by the definition on line {first_line + shift}"
+            continue
+        first_lines[name] = function.line
+        indices = _rule_indices(function)
+        fired = sum(1 for index in indices if coverage.hits[name, index])
+        header = f"{ANNOTATION} {coverage.calls[name]} call(s)"
+        if indices:
+            header += f", {fired}/{len(indices)} rule(s) fired"
+        headers[function.line] = header
+        for index in indices:
+            counts.setdefault(function.rules[index].line, []).append(str(coverage.hits[name, index]))
+
+    lines = []
+    for line_number, line in enumerate(profile.split("\n"), 1):
+        if line_number in counts:
+            line = _append_comment(line, f"{ANNOTATION} {', '.join(counts[line_number])}")
+        lines.append(line)
+        if line_number in headers:
+            lines.append(headers[line_number] + ("\r" if line.endswith("\r") else ""))
+    annotated = "\n".join(lines)
+
+    if _signature(parse_profile(annotated)) != _signature(parsed):
+        raise CoverageError("annotated profile does not parse back to the same functions and rules")
+    return annotated
+
+
+def load_states(paths):
+    """
+    Lit un corpus de situations
+
+    Args:
+        paths (list): Fichiers JSON (une situation ou une liste de situations)
+
+    Returns:
+        list: Situations {symbole: valeur}
+    """
+    states = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        states.extend([data] if isinstance(data, dict) else data)
+    return states
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Count which functions and rules of a profile fire over a corpus of game states."
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("profile", help="Input .ohf file")
+    common.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    common.add_argument("--no-library", action="store_true", help="Evaluate the profile alone")
+    common.add_argument("-o", "--output", help="Write the coverage counts to this JSON file")
+    common.add_argument("--report", help="Write the report to this file (default: stdout)")
+    common.add_argument("--annotate", help="Write a copy of the profile with the counts inline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", parents=[common], help="Evaluate a corpus of game states")
+    run_parser.add_argument("states", nargs="+", help="JSON files with one game state or a list of states")
+    run_parser.add_argument("--entry-point", help="Function to evaluate (default: from betround, else f$preflop)")
+    run_parser.add_argument("--lenient", action="store_true", help="Treat symbols missing from a state as 0")
+    run_parser.add_argument("--compiled", action="store_true", help="Evaluate with the compiled profile (faster)")
+    run_parser.add_argument("-j", "--workers", type=int, default=1, help="Number of worker processes (default: 1)")
+
+    merge_parser = commands.add_parser("merge", parents=[common], help="Merge coverage files of parallel workers")
+    merge_parser.add_argument("coverage", nargs="+", help="Coverage JSON files written with -o")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la mesure de couverture
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si une situation ne peut pas être évaluée ou si la fusion échoue)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+    library = None if args.no_library else load_library(args.library)
+
+    if args.command == "run":
+        coverage = collect_coverage(profile, library, load_states(args.states), not args.lenient,
+                                    args.entry_point, args.compiled, args.workers)
+    else:
+        coverage = Coverage(coverage_key(profile, library))
+        try:
+            for path in args.coverage:
+                coverage.merge(Coverage.load(path))
+        except CoverageError as error:
+            print(f"ERROR {path}: {error}", file=sys.stderr)
+            return 1
+
+    if args.output:
+        coverage.save(args.output)
+    parsed = parse_profile(profile)
+    functions = resolve_functions(parsed, library)
+    library_names = set(functions) - {function.name for function in parsed.functions}
+    report = format_report(coverage, functions, library_names)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+    if args.annotate:
+        with open(args.annotate, 'w', encoding='utf-8', newline='') as file:
+            file.write(annotate_profile(profile, coverage))
+    return 1 if coverage.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
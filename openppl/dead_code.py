@@ -0,0 +1,169 @@
+"""
+Élimination des fonctions inaccessibles d'un profil assemblé
+Construit le graphe d'appel f$ du texte final et ne conserve que les fonctions
+accessibles depuis les points d'entrée de chaque street (f$preflop, f$flop,
+f$turn, f$river) et depuis les fonctions de scénario de la bibliothèque
+custom_function_library.ohf, chargée par OpenHoldem avant le profil.
+
+Les bandeaux de commentaires qui suivent la dernière règle d'une fonction
+supprimée annoncent la section suivante: ils sont conservés.
+"""
+import argparse
+import os
+import sys
+from collections import namedtuple
+
+from openppl.functions import call_graph, join_profile, split_profile, trailing_comments
+
+# Fonctions appelées directement par OpenHoldem
+ENTRY_POINTS = ("f$preflop", "f$flop", "f$turn", "f$river")
+
+# Bibliothèque de fonctions de scénario livrée avec le générateur
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "custom_function_library.ohf")
+
+# Résultat de l'élimination: noms des blocs supprimés, octets supprimés, nombre de blocs conservés
+DeadCodeReport = namedtuple("DeadCodeReport", ["removed", "removed_bytes", "kept"])
+
+
+def load_library(path=DEFAULT_LIBRARY):
+    """
+    Charge la bibliothèque de fonctions de scénario
+
+    Args:
+        path (str): Chemin du fichier .ohf de la bibliothèque
+
+    Returns:
+        str: Texte de la bibliothèque
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def reachable_functions(graph, roots):
+    """
+    Calcule les fonctions accessibles depuis un ensemble de racines
+
+    Args:
+        graph (dict): Nom de fonction -> noms référencés (voir call_graph)
+        roots (iterable): Noms des fonctions appelées de l'extérieur
+
+    Returns:
+        set: Noms accessibles, racines comprises
+    """
+    reachable = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name not in reachable:
+            reachable.add(name)
+            pending.extend(graph.get(name, ()))
+    return reachable
+
+
+def eliminate_dead_functions(profile, library=None, entry_points=ENTRY_POINTS):
+    """
+    Supprime d'un profil les fonctions qu'aucun point d'entrée ne peut atteindre
+
+    Args:
+        profile (str): Code de profil assemblé
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        entry_points (tuple): Fonctions appelées par OpenHoldem
+
+    Returns:
+        tuple: (profil réduit, DeadCodeReport)
+    """
+    preamble, blocks = split_profile(profile)
+    graph = call_graph(blocks)
+    roots = list(entry_points)
+    if library:
+        _, library_blocks = split_profile(library)
+        # Les fonctions de la bibliothèque sont des racines et peuvent appeler le profil
+        for name, references in call_graph(library_blocks).items():
+            graph.setdefault(name, set()).update(references)
+            roots.append(name)
+    reachable = reachable_functions(graph, roots)
+
+    kept = []
+    removed = []
+    removed_bytes = 0
+    for block in blocks:
+        if block.name in reachable:
+            kept.append(block.text)
+            continue
+        trailer = trailing_comments(block)
+        kept.append(trailer)
+        removed.append(block.name)
+        removed_bytes += len(block.text.encode('utf-8')) - len(trailer.encode('utf-8'))
+
+    report = DeadCodeReport(removed, removed_bytes, len(blocks) - len(removed))
+    return join_profile(preamble, kept), report
+
+
+def format_report(report, original_size):
+    """
+    Résume une élimination
+
+    Args:
+        report (DeadCodeReport): Résultat de eliminate_dead_functions
+        original_size (int): Taille du profil d'origine en octets
+
+    Returns:
+        str: Résumé lisible
+    """
+    share = 100 * report.removed_bytes / original_size if original_size else 0
+    return (f"Removed {len(report.removed)} function(s), {report.removed_bytes} bytes ({share:.1f}%); "
+            f"{report.kept} function(s) kept")
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Remove functions unreachable from f$preflop/f$flop/f$turn/f$river and the scenario library."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Only use the street entry points as roots")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the removed functions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'élimination des fonctions inaccessibles
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+    library = None if args.no_library else load_library(args.library)
+
+    reduced, report = eliminate_dead_functions(profile, library)
+    if args.verbose:
+        for name in report.removed:
+            print(f"- {name}")
+    print(format_report(report, len(profile.encode('utf-8'))))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(reduced)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
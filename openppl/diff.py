@@ -0,0 +1,167 @@
+"""
+Comparaison de profils fonction par fonction
+Découpe deux profils en blocs ##Nom##, compare les blocs et ne calcule un diff
+ligne à ligne (règle par règle) que pour les fonctions modifiées
+
+Par défaut les commentaires sont ignorés: les en-têtes de street recopient les
+valeurs des paramètres en commentaire, et ces lignes sont rattachées au bloc qui
+les précède dans le fichier.
+"""
+import argparse
+import difflib
+import sys
+from collections import namedtuple
+
+from openppl.functions import function_body, split_profile, strip_comments
+
+# Clé du texte situé avant la première fonction
+PREAMBLE_KEY = "<preamble>"
+
+# Résultat d'une comparaison: clés ajoutées, supprimées, modifiées (clé -> lignes de diff), nombre inchangé
+ProfileDiff = namedtuple("ProfileDiff", ["added", "removed", "modified", "unchanged"])
+
+
+def keyed_blocks(profile, ignore_comments=True):
+    """
+    Indexe les blocs d'un profil par nom
+
+    Une fonction redéfinie plus loin dans le profil (par une autre street) reçoit
+    la clé "Nom#2", "Nom#3"... selon son rang d'apparition.
+
+    Args:
+        profile (str): Code de profil
+        ignore_comments (bool): Retirer les commentaires du corps des blocs
+
+    Returns:
+        dict: Clé -> corps du bloc, dans l'ordre du fichier (préambule en premier)
+    """
+    preamble, blocks = split_profile(profile)
+    keyed = {PREAMBLE_KEY: strip_comments(preamble) if ignore_comments else preamble}
+    occurrences = {}
+    for block in blocks:
+        occurrences[block.name] = occurrences.get(block.name, 0) + 1
+        count = occurrences[block.name]
+        body = function_body(block)
+        keyed[block.name if count == 1 else f"{block.name}#{count}"] = (
+            strip_comments(body) if ignore_comments else body
+        )
+    return keyed
+
+
+def diff_profiles(old_profile, new_profile, context=1, ignore_comments=True):
+    """
+    Compare deux profils fonction par fonction
+
+    Args:
+        old_profile (str): Profil de référence
+        new_profile (str): Profil modifié
+        context (int): Lignes de contexte autour de chaque règle modifiée
+        ignore_comments (bool): Ne pas tenir compte des commentaires
+
+    Returns:
+        ProfileDiff: Fonctions ajoutées, supprimées et modifiées (avec leur diff)
+    """
+    old_blocks = keyed_blocks(old_profile, ignore_comments)
+    new_blocks = keyed_blocks(new_profile, ignore_comments)
+
+    added = [key for key in new_blocks if key not in old_blocks]
+    removed = [key for key in old_blocks if key not in new_blocks]
+    modified = {}
+    unchanged = 0
+    for key, new_text in new_blocks.items():
+        old_text = old_blocks.get(key)
+        if old_text is None:
+            continue
+        if old_text == new_text:
+            unchanged += 1
+            continue
+        modified[key] = list(difflib.unified_diff(
+            old_text.splitlines(), new_text.splitlines(), lineterm="", n=context
+        ))[2:]
+
+    return ProfileDiff(added, removed, modified, unchanged)
+
+
+def summarize(result):
+    """
+    Résume une comparaison en une ligne
+
+    Args:
+        result (ProfileDiff): Résultat de diff_profiles
+
+    Returns:
+        str: Résumé lisible
+    """
+    if not (result.added or result.removed or result.modified):
+        return "No function changed"
+    return (f"{len(result.modified)} function(s) modified, {len(result.added)} added, "
+            f"{len(result.removed)} removed ({result.unchanged} unchanged)")
+
+
+def format_diff(result, stat_only=False):
+    """
+    Construit le rapport complet d'une comparaison
+
+    Args:
+        result (ProfileDiff): Résultat de diff_profiles
+        stat_only (bool): Ne lister que les noms des fonctions, sans le diff des règles
+
+    Returns:
+        str: Rapport lisible
+    """
+    lines = []
+    for key in result.added:
+        lines.append(f"+ {key}")
+    for key in result.removed:
+        lines.append(f"- {key}")
+    for key, diff_lines in result.modified.items():
+        changed = sum(1 for line in diff_lines if line[:1] in "+-")
+        lines.append(f"~ {key} ({changed} line(s))")
+        if not stat_only:
+            lines.extend(f"    {line}" for line in diff_lines)
+    lines.append(summarize(result))
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(description="Compare two profiles function by function.")
+    parser.add_argument("old_profile", help="Reference .ohf file")
+    parser.add_argument("new_profile", help="Modified .ohf file")
+    parser.add_argument("--stat", action="store_true", help="Only list changed functions")
+    parser.add_argument("-U", "--context", type=int, default=1, help="Context lines per changed rule (default: 1)")
+    parser.add_argument("--comments", action="store_true", help="Also report comment-only changes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la comparaison
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (0 si aucune fonction ne diffère, 1 sinon)
+    """
+    args = parse_args(argv)
+    with open(args.old_profile, 'r', encoding='utf-8') as file:
+        old_profile = file.read()
+    with open(args.new_profile, 'r', encoding='utf-8') as file:
+        new_profile = file.read()
+
+    result = diff_profiles(old_profile, new_profile, args.context, not args.comments)
+    print(format_diff(result, args.stat))
+    return 1 if result.added or result.removed or result.modified else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+Évaluation locale d'un profil sur une situation de jeu
+Exécute le profil analysé (openppl.parser) sur un dictionnaire qui fournit les
+symboles OpenHoldem référencés (handrank169, nopponentsplaying, BotRaisedBeforeFlop,
+TopFlopCard, ...), sans lancer OpenHoldem. Renvoie l'action retenue et la chaîne des
+règles qui y mènent: la règle du point d'entrée, puis celle de chaque fonction dont
+la valeur est renvoyée telle quelle (RETURN f$PushFoldPreflop FORCE, ...).
+
+Sémantique:
+    - première règle vraie; AND, OR et ?: n'évaluent que ce qui est nécessaire;
+    - un WHEN sans action garde les règles suivantes jusqu'au WHEN sans action
+      suivant ("WHEN Others" seul ferme le bloc);
+    - une fonction sans règle vraie vaut 0;
+    - chaque fonction f$ est évaluée au plus une fois par situation, comme le cache
+      d'OpenHoldem pendant une décision;
+    - un nom d'action (Call, RaiseMax, ...) absent de la situation vaut son nom, ce
+      qui permet les comparaisons "BotsLastPreflopAction = Call";
+    - la situation peut aussi fournir une fonction f$, qui remplace alors sa définition
+      (f$TheBiggestActiveOpponentsStack, appelée sans être définie par la bibliothèque).
+"""
+import argparse
+import json
+import sys
+from collections import namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.parser import Binary, Conditional, Number, ParsedProfile, Symbol, Unary, parse_profile
+from openppl.textures import RANK_CONSTANTS
+
+# Constantes nommées reconnues sans être fournies par la situation
+CONSTANTS = dict(RANK_CONSTANTS, true=True, false=False)
+
+# Actions OpenPPL; un nom d'action vaut son orthographe canonique
+ACTIONS = (
+    "Fold", "Check", "Call", "Raise", "RaiseMin", "RaiseFourthPot", "RaiseThirdPot", "RaiseHalfPot",
+    "RaiseTwoThirdPot", "RaiseThreeFourthPot", "RaisePot", "RaiseMax", "Bet", "BetMin", "BetFourthPot",
+    "BetThirdPot", "BetHalfPot", "BetTwoThirdPot", "BetThreeFourthPot", "BetPot", "BetMax", "Allin",
+    "SitOut", "Leave", "Close", "Beep",
+)
+ACTION_NAMES = {action.lower(): action for action in ACTIONS}
+
+# Règle appliquée: fonction, rang de la règle dans la fonction et ligne dans le fichier
+FiredRule = namedtuple("FiredRule", ["function", "index", "line"])
+
+# Action avec montant (RaiseBy 50% FORCE, RaiseTo 3 FORCE)
+Bet = namedtuple("Bet", ["action", "amount", "percent"])
+
+# Résultat d'une décision
+#   action: nom de l'action ("RaiseMax", "Call", "RaiseBy", ...) ou None si le point
+#           d'entrée renvoie une valeur qui n'est pas une action
+#   amount: montant de RaiseBy / RaiseTo, ou valeur renvoyée quand action est None
+#   chain: FiredRule du point d'entrée jusqu'à la règle qui fixe l'action
+#   fired: fonction évaluée -> rang de la règle appliquée (None: aucune, valeur 0)
+#   results: fonction évaluée -> valeur
+Decision = namedtuple("Decision", ["action", "amount", "chain", "fired", "results"])
+
+
+class EvaluationError(ValueError):
+    """
+    Erreur d'évaluation: symbole absent de la situation, récursion, opération invalide
+    """
+
+
+def _binary(operator, left, right):
+    """
+    Applique un opérateur binaire non logique
+    """
+    if operator == "=":
+        return left == right
+    if operator == "!=":
+        return left != right
+    try:
+        if operator == "<":
+            return left < right
+        if operator == "<=":
+            return left <= right
+        if operator == ">":
+            return left > right
+        if operator == ">=":
+            return left >= right
+        if operator == "+":
+            return left + right
+        if operator == "-":
+            return left - right
+        if operator == "*":
+            return left * right
+        if operator in ("/", "%"):
+            # OpenHoldem renvoie 0 plutôt que d'interrompre l'évaluation
+            if right == 0:
+                return 0
+            return left / right if operator == "/" else left % right
+        if operator == "**":
+            return left ** right
+        if operator == "&":
+            return int(left) & int(right)
+        if operator == "|":
+            return int(left) | int(right)
+        if operator == "^":
+            return int(left) ^ int(right)
+        if operator == "<<":
+            return int(left) << int(right)
+        if operator == ">>":
+            return int(left) >> int(right)
+    except TypeError:
+        raise EvaluationError(f"invalid operands for {operator}: {left!r}, {right!r}") from None
+    raise EvaluationError(f"unknown operator {operator}")
+
+
+def resolve_functions(profile, library=None):
+    """
+    Retient la définition de chaque fonction évaluée
+
+    Le profil masque la bibliothèque (voir openppl.linker); dans chacun, la première
+    définition d'un nom est retenue.
+
+    Args:
+        profile: Texte du profil ou ParsedProfile
+        library: Texte ou ParsedProfile de la bibliothèque de scénarios (None: aucune)
+
+    Returns:
+        dict: Nom -> Function, fonctions du profil en premier
+    """
+    functions = {}
+    for source in (profile, library):
+        if source is None:
+            continue
+        parsed = source if isinstance(source, ParsedProfile) else parse_profile(source)
+        for function in parsed.functions:
+            functions.setdefault(function.name, function)
+    return functions
+
+
+def street_entry_point(state):
+    """
+    Choisit le point d'entrée d'une situation
+
+    Args:
+        state (dict): Symboles OpenHoldem de la situation
+
+    Returns:
+        str: f$preflop, f$flop, f$turn ou f$river selon betround (1 à 4, f$preflop par défaut)
+    """
+    betround = int(state.get("betround", 1))
+    return ENTRY_POINTS[min(max(betround, 1), len(ENTRY_POINTS)) - 1]
+
+
+def make_decision(value, chain, fired, results):
+    """
+    Construit la décision à partir de la valeur du point d'entrée
+
+    Args:
+        value: Valeur du point d'entrée (nom d'action, Bet ou autre valeur)
+        chain (list): FiredRule du point d'entrée jusqu'à la règle qui fixe l'action
+        fired (dict): Fonction évaluée -> rang de la règle appliquée
+        results (dict): Fonction évaluée -> valeur
+
+    Returns:
+        Decision: Décision
+    """
+    if isinstance(value, Bet):
+        action, amount = value.action, value.amount
+    elif isinstance(value, str):
+        action, amount = value, None
+    else:
+        action, amount = None, value
+    return Decision(action, amount, tuple(chain), fired, results)
+
+
+class _Run:
+    """
+    Évaluation d'une situation: cache des fonctions et règles appliquées
+    """
+
+    def __init__(self, evaluator, state):
+        self.functions = evaluator.functions
+        self.strict = evaluator.strict
+        self.state = state
+        self.results = {}
+        self.fired = {}
+        self.returned = {}
+        self.active = set()
+
+    def call(self, name):
+        if name in self.results:
+            return self.results[name]
+        function = self.functions.get(name)
+        if function is None:
+            return self.missing(name)
+        if name in self.active:
+            raise EvaluationError(f"recursive call to {name}")
+        self.active.add(name)
+        try:
+            if function.expression is not None:
+                value, index, returned = self.value(function.expression), None, None
+            else:
+                value, index, returned = self.rules(function)
+        finally:
+            self.active.discard(name)
+        self.results[name] = value
+        self.fired[name] = index
+        self.returned[name] = returned
+        return value
+
+    def rules(self, function):
+        """
+        Applique la première règle vraie d'une fonction
+
+        Returns:
+            tuple: (valeur, rang de la règle ou None, fonction dont la valeur est renvoyée ou None)
+        """
+        guarded = True
+        for index, rule in enumerate(function.rules):
+            if rule.action is None:
+                guarded = rule.condition is None or bool(self.value(rule.condition))
+                continue
+            if not guarded:
+                continue
+            if rule.condition is not None and not self.value(rule.condition):
+                continue
+            action = rule.action
+            if action.value is None:
+                return ACTION_NAMES.get(action.kind.lower(), action.kind), index, None
+            value = self.value(action.value)
+            if action.kind != "RETURN":
+                return Bet(action.kind, value, action.percent), index, None
+            returned = action.value.name if isinstance(action.value, Symbol) and action.value.name in self.functions \
+                else None
+            return value, index, returned
+        return 0, None, None
+
+    def missing(self, name):
+        if name in self.state:
+            return self.state[name]
+        key = name.lower()
+        if key in CONSTANTS:
+            return CONSTANTS[key]
+        if key in ACTION_NAMES:
+            return ACTION_NAMES[key]
+        if self.strict:
+            raise EvaluationError(f"symbol {name} is not defined by the profile or the game state")
+        return 0
+
+    def value(self, node):
+        if isinstance(node, Symbol):
+            name = node.name
+            if name in self.state:
+                return self.state[name]
+            return self.call(name) if name.startswith("f$") else self.missing(name)
+        if isinstance(node, Number):
+            return node.value
+        if isinstance(node, Binary):
+            operator = node.operator
+            if operator == "AND":
+                return bool(self.value(node.left)) and bool(self.value(node.right))
+            if operator == "OR":
+                return bool(self.value(node.left)) or bool(self.value(node.right))
+            if operator == "XOR":
+                return bool(self.value(node.left)) != bool(self.value(node.right))
+            return _binary(operator, self.value(node.left), self.value(node.right))
+        if isinstance(node, Unary):
+            operand = self.value(node.operand)
+            if node.operator == "NOT":
+                return not operand
+            if node.operator == "~":
+                return ~int(operand)
+            return -operand if node.operator == "-" else operand
+        if isinstance(node, Conditional):
+            return self.value(node.then) if self.value(node.condition) else self.value(node.otherwise)
+        raise EvaluationError(f"cannot evaluate {type(node).__name__}")
+
+
+class Evaluator:
+    """
+    Évaluateur d'un profil analysé (définitions retenues: voir resolve_functions)
+    """
+
+    def __init__(self, profile, library=None, strict=True):
+        """
+        Prépare l'évaluation d'un profil
+
+        Args:
+            profile: Texte du profil ou ParsedProfile
+            library: Texte ou ParsedProfile de la bibliothèque de scénarios (None: aucune)
+            strict (bool): Un symbole absent de la situation est une erreur (sinon il vaut 0)
+        """
+        self.functions = resolve_functions(profile, library)
+        self.strict = strict
+
+    def evaluate(self, name, state):
+        """
+        Évalue une fonction sur une situation
+
+        Args:
+            name (str): Nom de la fonction "f$Nom"
+            state (dict): Symboles OpenHoldem de la situation
+
+        Returns:
+            Valeur de la fonction (nombre, booléen, nom d'action ou Bet)
+
+        Raises:
+            EvaluationError: Si un symbole manque (mode strict) ou si l'évaluation boucle
+        """
+        return _Run(self, state).call(name)
+
+    def decide(self, state, entry_point=None):
+        """
+        Calcule la décision du profil pour une situation
+
+        Args:
+            state (dict): Symboles OpenHoldem de la situation
+            entry_point (str): Fonction évaluée (par défaut: selon betround, 1 à 4, sinon f$preflop)
+
+        Returns:
+            Decision: Action, montant et règles appliquées
+
+        Raises:
+            EvaluationError: Si un symbole manque (mode strict) ou si l'évaluation boucle
+        """
+        if entry_point is None:
+            entry_point = street_entry_point(state)
+        run = _Run(self, state)
+        value = run.call(entry_point)
+
+        chain = []
+        name = entry_point
+        while name is not None and run.fired.get(name) is not None:
+            index = run.fired[name]
+            chain.append(FiredRule(name, index, self.functions[name].rules[index].line))
+            name = run.returned[name]
+
+        return make_decision(value, chain, run.fired, run.results)
+
+
+def format_decision(decision):
+    """
+    Met en forme une décision et sa chaîne de règles
+
+    Args:
+        decision (Decision): Résultat de Evaluator.decide
+
+    Returns:
+        str: Texte lisible
+    """
+    if decision.action is None:
+        lines = [f"Value: {decision.amount}"]
+    elif decision.amount is None:
+        lines = [f"Action: {decision.action}"]
+    else:
+        lines = [f"Action: {decision.action} {decision.amount:g}"]
+    for fired in decision.chain:
+        lines.append(f"    {fired.function} rule {fired.index + 1} (line {fired.line})")
+    lines.append(f"{len(decision.results)} function(s) evaluated")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Evaluate a profile on game states given as JSON and show the action and the rules that fired."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("states", help="JSON file with one game state (symbol -> value) or a list of states")
+    parser.add_argument("--entry-point", help="Function to evaluate (default: from betround, else f$preflop)")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Evaluate the profile alone")
+    parser.add_argument("--lenient", action="store_true", help="Treat symbols missing from the state as 0")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'évaluation locale
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si une situation ne peut pas être évaluée)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8') as file:
+        profile = file.read()
+    with open(args.states, 'r', encoding='utf-8') as file:
+        states = json.load(file)
+    if isinstance(states, dict):
+        states = [states]
+    library = None if args.no_library else load_library(args.library)
+
+    evaluator = Evaluator(profile, library, strict=not args.lenient)
+    status = 0
+    for number, state in enumerate(states, 1):
+        if len(states) > 1:
+            print(f"State {number}:")
+        try:
+            print(format_decision(evaluator.decide(state, args.entry_point)))
+        except EvaluationError as error:
+            print(f"ERROR {error}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Découpage d'un profil OpenPPL en blocs de fonctions
+Chaque bloc commence à une ligne d'en-tête ##Nom## et s'étend jusqu'à l'en-tête
+suivant; le découpage est exact: join_profile(*split_profile(texte)) == texte
+"""
+import re
+from collections import namedtuple
+
+# Ligne d'en-tête d'une fonction (##f$Nom##) ou d'une section (##notes##, ...)
+FUNCTION_HEADER = re.compile(r'^##([^#\r\n]+)##[ \t]*\r?$', re.MULTILINE)
+
+# Référence à une fonction utilisateur dans une règle (f$Nom)
+FUNCTION_REFERENCE = re.compile(r'\bf\$\w+')
+
+# Commentaires et lignes vides en fin de bloc (bandeau de la section suivante)
+TRAILING_COMMENTS = re.compile(r'(?:^[ \t]*(?://[^\n]*)?\r?\n)*\Z', re.MULTILINE)
+
+# Bloc de fonction: nom sans les ##, texte complet (en-tête compris) et numéro de ligne de l'en-tête
+FunctionBlock = namedtuple("FunctionBlock", ["name", "text", "line"])
+
+
+def split_profile(profile):
+    """
+    Découpe un profil en préambule et blocs de fonctions
+
+    Les commentaires situés entre deux fonctions (bandeaux de section) font partie
+    du bloc précédent. Un même nom peut apparaître plusieurs fois: les générateurs
+    de street redéfinissent certaines fonctions utilitaires.
+
+    Args:
+        profile (str): Code de profil
+
+    Returns:
+        tuple: (préambule avant la première fonction, liste de FunctionBlock dans l'ordre du fichier)
+    """
+    matches = list(FUNCTION_HEADER.finditer(profile))
+    if not matches:
+        return profile, []
+
+    preamble = profile[:matches[0].start()]
+    line = preamble.count("\n") + 1
+    blocks = []
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(profile)
+        text = profile[match.start():end]
+        blocks.append(FunctionBlock(match.group(1), text, line))
+        line += text.count("\n")
+    return preamble, blocks
+
+
+def join_profile(preamble, blocks):
+    """
+    Reconstitue un profil à partir de son préambule et de ses blocs
+
+    Args:
+        preamble (str): Texte avant la première fonction
+        blocks (list): FunctionBlock ou textes de blocs, dans l'ordre du fichier
+
+    Returns:
+        str: Code de profil
+    """
+    return preamble + "".join(block if isinstance(block, str) else block.text for block in blocks)
+
+
+def function_body(block):
+    """
+    Renvoie le corps d'un bloc, sans sa ligne d'en-tête
+
+    Args:
+        block (FunctionBlock): Bloc de fonction
+
+    Returns:
+        str: Texte qui suit la ligne ##Nom##
+    """
+    _, _, body = block.text.partition("\n")
+    return body
+
+
+def trailing_comments(block):
+    """
+    Renvoie les commentaires qui suivent la dernière règle d'un bloc
+
+    Ils annoncent en général la section suivante et doivent survivre à la
+    suppression du bloc.
+
+    Args:
+        block (FunctionBlock): Bloc de fonction
+
+    Returns:
+        str: Fin du bloc après la dernière règle, ou "" si elle ne contient aucun commentaire
+    """
+    trailer = TRAILING_COMMENTS.search(block.text).group()
+    return trailer if "//" in trailer else ""
+
+
+def strip_comments(text):
+    """
+    Retire les commentaires et les lignes vides d'un texte OpenPPL
+
+    Args:
+        text (str): Code de profil ou de fonction
+
+    Returns:
+        str: Code sans commentaires "//", une règle par ligne
+    """
+    lines = []
+    for line in text.split("\n"):
+        line = line.split("//", 1)[0].rstrip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def function_references(text):
+    """
+    Liste les fonctions f$ appelées par un texte OpenPPL, hors commentaires
+
+    Args:
+        text (str): Corps de fonction ou code de profil
+
+    Returns:
+        set: Noms "f$Nom" référencés
+    """
+    return set(FUNCTION_REFERENCE.findall(strip_comments(text)))
+
+
+def call_graph(blocks):
+    """
+    Construit le graphe d'appel des fonctions f$
+
+    Les définitions multiples d'un même nom sont fusionnées: chacune peut être
+    celle que retient OpenHoldem.
+
+    Args:
+        blocks (list): FunctionBlock, dans l'ordre du fichier
+
+    Returns:
+        dict: Nom de fonction -> ensemble des noms f$ qu'elle référence
+    """
+    graph = {}
+    for block in blocks:
+        graph.setdefault(block.name, set()).update(function_references(function_body(block)))
+    return graph
@@ -0,0 +1,270 @@
+"""
+Factorisation des débuts de condition communs dans des blocs WHEN sans action
+Des règles consécutives répètent souvent les mêmes tests ("BotRaisedBeforeFlop AND
+BotsActionsOnThisRoundIncludingChecks = 0 AND f$InPosition" dans f$flop, "Raises = 0
+AND Calls = 0" dans f$PushFold_*): OpenHoldem les réévalue pour chaque règle. Un
+WHEN sans action (open-ended) évalue une fois la partie commune:
+
+    WHEN BotRaisedBeforeFlop AND BotsActionsOnThisRoundIncludingChecks = 0 AND f$InPosition
+        WHEN f$MonotoneBoard RETURN f$CbetMonotoneBoard FORCE
+        WHEN Others RETURN f$FlopCbetIP FORCE
+    WHEN Others
+
+Un bloc s'étend jusqu'au WHEN sans action suivant; "WHEN Others" seul ferme le
+bloc avant les règles qui ne partagent pas sa condition. Les blocs ne s'imbriquent
+pas: les fonctions qui en contiennent déjà ne sont pas modifiées. Les termes d'une
+conjonction sont sans effet de bord et peuvent donc être mis en commun quel que
+soit leur rang dans chaque règle; les règles qui utilisent la mémoire OpenPPL
+(me_st_, me_inc_) ne sont pas regroupées.
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+from openppl.functions import join_profile, split_profile
+from openppl.reorder import SIDE_EFFECT
+from openppl.rules import is_open_ended, rewrite_rule_line, split_chains, split_conjuncts
+
+# Nombre minimal de règles consécutives d'un bloc
+MIN_GROUP_SIZE = 3
+
+# Coût d'un bloc en évaluations (WHEN Others de fermeture): à gain égal, moins de blocs
+BLOCK_OVERHEAD = 1
+
+# Indentation des règles d'un bloc
+NESTED_INDENT = "    "
+
+# Résultat de la factorisation: fonctions modifiées, blocs créés, règles placées dans un
+# bloc, évaluations de termes évitées au pire (chaque terme commun une fois par bloc)
+HoistReport = namedtuple("HoistReport", ["functions", "blocks", "hoisted_rules", "saved_terms", "size_change"])
+
+
+def _normalize(term):
+    return " ".join(term.split())
+
+
+def _has_code(text):
+    return any(line.split("//", 1)[0].strip() for line in text.splitlines())
+
+
+def _groups_from(entries, start, min_group):
+    """
+    Énumère les blocs possibles qui commencent à une règle
+
+    Toutes les règles du bloc sauf la dernière doivent garder au moins un terme propre;
+    la dernière peut se réduire à la partie commune (WHEN Others dans le bloc).
+
+    Args:
+        entries (list): (RuleLine, termes, termes normalisés) de la chaîne
+        start (int): Indice de la première règle
+        min_group (int): Nombre minimal de règles
+
+    Yields:
+        tuple: (indice de fin exclu, termes communs normalisés)
+    """
+    common = set(entries[start][2])
+    for end in range(start + 1, len(entries)):
+        common &= set(entries[end][2])
+        if not common:
+            return
+        if end - start + 1 >= min_group and not any(set(keys) <= common for _, _, keys in entries[start:end]):
+            yield end + 1, set(common)
+
+
+def plan_chain(chain, min_group=MIN_GROUP_SIZE):
+    """
+    Découpe une chaîne de règles en blocs à factoriser et règles isolées
+
+    Le découpage maximise le nombre d'évaluations de termes évitées: un bloc de n
+    règles qui partagent k termes en évite (n - 1) * k, moins BLOCK_OVERHEAD.
+
+    Args:
+        chain (list): RuleLine de la chaîne
+        min_group (int): Nombre minimal de règles d'un bloc
+
+    Returns:
+        list: ("group", termes communs dans l'ordre de la première règle, [(RuleLine, termes restants)])
+              ou ("rule", RuleLine)
+    """
+    entries = []
+    for rule_line in chain:
+        terms = split_conjuncts(rule_line.rule.condition) or [rule_line.rule.condition]
+        entries.append((rule_line, terms, [_normalize(term) for term in terms]))
+
+    # best[i]: (termes évités, découpage) pour les règles i et suivantes
+    best = [(0, None)] * (len(entries) + 1)
+    for start in range(len(entries) - 1, -1, -1):
+        saved, choice = best[start + 1][0], None
+        for end, common in _groups_from(entries, start, min_group):
+            score = (end - start - 1) * len(common) - BLOCK_OVERHEAD + best[end][0]
+            if score > saved:
+                saved, choice = score, (end, common)
+        best[start] = (saved, choice)
+
+    plan = []
+    index = 0
+    while index < len(entries):
+        choice = best[index][1]
+        if choice is None:
+            plan.append(("rule", entries[index][0]))
+            index += 1
+            continue
+        end, common = choice
+        prefix = [term for term in entries[index][1] if _normalize(term) in common]
+        members = [(rule_line, [term for term in terms if _normalize(term) not in common])
+                   for rule_line, terms, _ in entries[index:end]]
+        plan.append(("group", prefix, members))
+        index = end
+    return plan
+
+
+def _line_ending(line):
+    return line[len(line.rstrip("\r\n")):] or "\n"
+
+
+def hoist_body(body, min_group=MIN_GROUP_SIZE):
+    """
+    Factorise les débuts de condition communs d'un corps de fonction
+
+    Args:
+        body (str): Corps de la fonction (sans la ligne d'en-tête)
+        min_group (int): Nombre minimal de règles d'un bloc
+
+    Returns:
+        tuple: (nouveau corps, blocs créés, règles placées dans un bloc, termes évités)
+    """
+    if any(is_open_ended(line.split("//", 1)[0].strip()) for line in body.splitlines()):
+        return body, 0, 0, 0
+
+    items = []
+    for segment in split_chains(body, SIDE_EFFECT.search):
+        if isinstance(segment, str):
+            items.append(("text", segment))
+        else:
+            items.extend(plan_chain(segment, min_group))
+
+    output = []
+    blocks = hoisted = saved = 0
+    for index, item in enumerate(items):
+        if item[0] == "text":
+            output.append(item[1])
+            continue
+        if item[0] == "rule":
+            output.extend(item[1].leading)
+            output.append(item[1].line)
+            continue
+
+        _, prefix, members = item
+        first = members[0][0]
+        indent = first.rule.prefix[:len(first.rule.prefix) - len(first.rule.prefix.lstrip())]
+        newline = _line_ending(first.line)
+        output.extend(first.leading)
+        output.append(f"{indent}WHEN {' AND '.join(prefix)}{newline}")
+        for position, (rule_line, rest) in enumerate(members):
+            if position:
+                output.extend(NESTED_INDENT + line if line.strip() else line for line in rule_line.leading)
+            nested = rule_line._replace(rule=rule_line.rule._replace(prefix=NESTED_INDENT + rule_line.rule.prefix))
+            output.append(rewrite_rule_line(nested, rest or ["Others"]))
+        blocks += 1
+        hoisted += len(members)
+        saved += (len(members) - 1) * len(prefix)
+
+        # Le bloc reste ouvert jusqu'au WHEN sans action suivant: le fermer avant tout autre code
+        following = next((other for other in items[index + 1:]
+                          if other[0] != "text" or _has_code(other[1])), None)
+        if following is not None and following[0] != "group":
+            output.append(f"{indent}WHEN Others{newline}")
+    return "".join(output), blocks, hoisted, saved
+
+
+def hoist_profile(profile, min_group=MIN_GROUP_SIZE):
+    """
+    Factorise les débuts de condition communs de toutes les fonctions d'un profil
+
+    Args:
+        profile (str): Code de profil
+        min_group (int): Nombre minimal de règles d'un bloc
+
+    Returns:
+        tuple: (profil transformé, HoistReport)
+    """
+    preamble, blocks = split_profile(profile)
+    texts = []
+    functions = []
+    totals = [0, 0, 0]
+    for block in blocks:
+        header, newline, body = block.text.partition("\n")
+        new_body, *counts = hoist_body(body, min_group)
+        if new_body != body:
+            functions.append(block.name)
+        totals = [total + count for total, count in zip(totals, counts)]
+        texts.append(header + newline + new_body)
+    hoisted = join_profile(preamble, texts)
+    size_change = len(hoisted.encode('utf-8')) - len(profile.encode('utf-8'))
+    return hoisted, HoistReport(functions, *totals, size_change)
+
+
+def format_report(report):
+    """
+    Résume une factorisation
+
+    Args:
+        report (HoistReport): Résultat de hoist_profile
+
+    Returns:
+        str: Résumé lisible
+    """
+    return (f"Hoisted {report.hoisted_rules} rule(s) into {report.blocks} open-ended WHEN block(s) "
+            f"in {len(report.functions)} function(s); up to {report.saved_terms} term evaluation(s) saved, "
+            f"{report.size_change:+d} bytes")
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Factor condition prefixes shared by consecutive rules into open-ended WHEN blocks."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("--min-group", type=int, default=MIN_GROUP_SIZE,
+                        help=f"Minimum number of rules in a block (default: {MIN_GROUP_SIZE})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the modified functions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la factorisation
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+
+    hoisted, report = hoist_profile(profile, max(2, args.min_group))
+    if args.verbose:
+        for name in report.functions:
+            print(f"~ {name}")
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(hoisted)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
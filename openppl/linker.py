@@ -0,0 +1,222 @@
+"""
+Édition de liens d'un profil assemblé
+Indexe chaque bloc ##f$Nom## de toutes les streets et de la bibliothèque
+custom_function_library.ohf, supprime les redéfinitions identiques et signale
+les conflits: un même nom défini avec des corps différents. OpenHoldem ne retient
+qu'une définition par nom; un conflit signifie donc qu'au moins un appelant
+n'exécute pas le code prévu.
+
+Deux corps sont identiques s'ils ne diffèrent que par leurs commentaires: les
+générateurs commentent différemment des fonctions utilitaires au code identique.
+"""
+import argparse
+import re
+import sys
+from collections import namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, load_library
+from openppl.functions import function_body, join_profile, split_profile, strip_comments, trailing_comments
+
+# Provenance d'une définition
+PROFILE = "profile"
+LIBRARY = "library"
+
+# Suffixe ajouté aux fonctions du profil renommées pour ne plus masquer la bibliothèque
+RENAME_SUFFIX = "_Profile"
+
+# Définition d'une fonction: provenance, ligne de l'en-tête et code sans commentaires
+Definition = namedtuple("Definition", ["source", "line", "code"])
+
+# Résultat de l'édition de liens
+#   merged: (nom, ligne) des blocs supprimés car identiques à une définition conservée
+#   merged_bytes: octets supprimés
+#   conflicts: nom -> liste des Definition en conflit
+#   renamed: ancien nom -> nouveau nom (résolution des conflits avec la bibliothèque)
+LinkReport = namedtuple("LinkReport", ["merged", "merged_bytes", "conflicts", "renamed"])
+
+
+def index_definitions(blocks, library_blocks=()):
+    """
+    Indexe toutes les définitions par nom
+
+    Args:
+        blocks (list): FunctionBlock du profil
+        library_blocks (list): FunctionBlock de la bibliothèque
+
+    Returns:
+        dict: Nom -> liste des Definition, bibliothèque en premier (chargée avant le profil)
+    """
+    definitions = {}
+    for source, source_blocks in ((LIBRARY, library_blocks), (PROFILE, blocks)):
+        for block in source_blocks:
+            definitions.setdefault(block.name, []).append(
+                Definition(source, block.line, strip_comments(function_body(block)))
+            )
+    return definitions
+
+
+def find_conflicts(definitions):
+    """
+    Sélectionne les noms définis avec des corps différents
+
+    Args:
+        definitions (dict): Résultat de index_definitions
+
+    Returns:
+        dict: Nom -> une Definition par corps distinct, dans l'ordre de chargement
+    """
+    conflicts = {}
+    for name, name_definitions in definitions.items():
+        variants = {}
+        for definition in name_definitions:
+            variants.setdefault(definition.code, definition)
+        if len(variants) > 1:
+            conflicts[name] = list(variants.values())
+    return conflicts
+
+
+def _rename(profile, old_name, new_name):
+    """
+    Renomme une fonction dans tout un profil (en-têtes et références)
+
+    Args:
+        profile (str): Code de profil
+        old_name (str): Nom actuel "f$Nom"
+        new_name (str): Nouveau nom
+
+    Returns:
+        str: Code de profil modifié
+    """
+    return re.sub(re.escape(old_name) + r'\b', new_name, profile)
+
+
+def link_profile(profile, library=None, rename_conflicts=False):
+    """
+    Fusionne les définitions identiques et détecte les conflits de noms
+
+    Une définition du profil est supprimée si une définition chargée avant elle
+    (bibliothèque ou bloc précédent du profil) a le même code. Avec
+    rename_conflicts, une fonction que le profil définit de façon cohérente mais
+    différemment de la bibliothèque est renommée, avec tous ses appels dans le
+    profil; les conflits entre streets du profil restent signalés.
+
+    Args:
+        profile (str): Code de profil assemblé
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+        rename_conflicts (bool): Résoudre les conflits avec la bibliothèque par renommage
+
+    Returns:
+        tuple: (profil lié, LinkReport)
+    """
+    preamble, blocks = split_profile(profile)
+    library_blocks = split_profile(library)[1] if library else []
+    definitions = index_definitions(blocks, library_blocks)
+
+    loaded = {}
+    for block in library_blocks:
+        loaded.setdefault(block.name, set()).add(strip_comments(function_body(block)))
+
+    kept = []
+    merged = []
+    merged_bytes = 0
+    for block in blocks:
+        code = strip_comments(function_body(block))
+        if code in loaded.setdefault(block.name, set()):
+            trailer = trailing_comments(block)
+            kept.append(trailer)
+            merged.append((block.name, block.line))
+            merged_bytes += len(block.text.encode('utf-8')) - len(trailer.encode('utf-8'))
+            continue
+        loaded[block.name].add(code)
+        kept.append(block.text)
+    linked = join_profile(preamble, kept)
+
+    conflicts = find_conflicts(definitions)
+    renamed = {}
+    if rename_conflicts:
+        taken = set(definitions)
+        for name, variants in list(conflicts.items()):
+            profile_variants = [definition for definition in variants if definition.source == PROFILE]
+            if len(profile_variants) != 1 or len(variants) != 2:
+                continue
+            new_name = name + RENAME_SUFFIX
+            while new_name in taken:
+                new_name += "_"
+            taken.add(new_name)
+            linked = _rename(linked, name, new_name)
+            renamed[name] = new_name
+            del conflicts[name]
+
+    return linked, LinkReport(merged, merged_bytes, conflicts, renamed)
+
+
+def format_report(report):
+    """
+    Construit le rapport d'une édition de liens
+
+    Args:
+        report (LinkReport): Résultat de link_profile
+
+    Returns:
+        str: Rapport lisible
+    """
+    lines = []
+    for name, variants in report.conflicts.items():
+        locations = ", ".join(f"{definition.source}:{definition.line}" for definition in variants)
+        lines.append(f"CONFLICT {name}: {len(variants)} different bodies ({locations})")
+    for old_name, new_name in report.renamed.items():
+        lines.append(f"RENAMED {old_name} -> {new_name}")
+    lines.append(f"Merged {len(report.merged)} duplicate definition(s), {report.merged_bytes} bytes; "
+                 f"{len(report.conflicts)} conflict(s), {len(report.renamed)} renamed")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Merge identical function redefinitions and report conflicting ones."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Only check the profile itself")
+    parser.add_argument("--rename-conflicts", action="store_true",
+                        help=f"Rename profile functions that clash with the library (suffix {RENAME_SUFFIX})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'édition de liens
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si des conflits subsistent)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+    library = None if args.no_library else load_library(args.library)
+
+    linked, report = link_profile(profile, library, args.rename_conflicts)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(linked)
+    return 1 if report.conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Sortie de production minifiée
+Retire commentaires, bandeaux et lignes vides (dont l'en-tête de paramètres répété
+pour chaque street), normalise les espaces et peut raccourcir le nom des fonctions
+internes du profil. Les noms courts sont relevés dans un fichier annexe JSON
+{nom court: nom d'origine} qui permet de relire le profil ou des traces.
+
+Ne sont jamais renommés: les points d'entrée et fonctions réservées d'OpenHoldem,
+les fonctions définies ou appelées par la bibliothèque de scénarios, chargée à
+part, et les fonctions appelées sans être définies dans le profil.
+"""
+import argparse
+import json
+import sys
+from collections import Counter, namedtuple
+
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.functions import FUNCTION_REFERENCE, split_profile, strip_comments
+
+# Fonctions lues par OpenHoldem en plus des points d'entrée des streets
+RESERVED_FUNCTIONS = (
+    "f$alli", "f$betsize", "f$rais", "f$call", "f$check", "f$fold", "f$prefold", "f$sitin",
+    "f$sitout", "f$leave", "f$close", "f$rebuy", "f$delay", "f$chat", "f$test", "f$debug",
+)
+RESERVED_PREFIXES = ("f$betpot_", "f$ini_function_")
+
+# Alphabet des noms courts: f$a, f$b, ..., f$z, f$a0, ...
+SHORT_NAME_FIRST = "abcdefghijklmnopqrstuvwxyz"
+SHORT_NAME_NEXT = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+# Suffixe du fichier de correspondance des noms
+NAME_MAP_SUFFIX = ".names.json"
+
+# Résultat de la minification: taille avant et après (octets), fonctions renommées
+MinifyReport = namedtuple("MinifyReport", ["original_size", "minified_size", "renamed"])
+
+
+def minify_code(text):
+    """
+    Retire les commentaires et lignes vides d'un texte OpenPPL et normalise les espaces
+
+    Args:
+        text (str): Code de profil ou de fonction
+
+    Returns:
+        list: Lignes de code, sans fin de ligne
+    """
+    lines = []
+    for line in strip_comments(text).splitlines():
+        code = " ".join(line.split())
+        if code:
+            lines.append(code)
+    return lines
+
+
+def _short_names(count, taken):
+    """
+    Génère des noms courts qui ne sont pas déjà utilisés
+
+    Args:
+        count (int): Nombre de noms voulus
+        taken (set): Noms à éviter
+
+    Returns:
+        list: Noms "f$..." du plus court au plus long
+    """
+    names = []
+    length = 1
+    while len(names) < count:
+        candidates = [first for first in SHORT_NAME_FIRST]
+        for _ in range(length - 1):
+            candidates = [prefix + char for prefix in candidates for char in SHORT_NAME_NEXT]
+        names.extend(name for name in ("f$" + candidate for candidate in candidates) if name not in taken)
+        length += 1
+    return names[:count]
+
+
+def is_reserved(name):
+    """
+    Args:
+        name (str): Nom de fonction "f$Nom"
+
+    Returns:
+        bool: True si OpenHoldem appelle la fonction par son nom
+    """
+    return name in ENTRY_POINTS or name in RESERVED_FUNCTIONS or name.startswith(RESERVED_PREFIXES)
+
+
+def short_name_map(profile, library=None):
+    """
+    Attribue un nom court à chaque fonction interne du profil
+
+    Les fonctions les plus référencées reçoivent les noms les plus courts.
+
+    Args:
+        profile (str): Code de profil
+        library (str): Texte de la bibliothèque de scénarios (None: aucune)
+
+    Returns:
+        dict: Nom d'origine -> nom court
+    """
+    _, blocks = split_profile(profile)
+    defined = {block.name for block in blocks}
+    references = Counter(FUNCTION_REFERENCE.findall(strip_comments(profile)))
+    library_names = set(FUNCTION_REFERENCE.findall(strip_comments(library))) if library else set()
+
+    internal = [name for name in defined
+                if name.startswith("f$") and not is_reserved(name) and name not in library_names]
+    internal.sort(key=lambda name: (-references[name], name))
+    taken = set(references) | defined | library_names
+    return dict(zip(internal, _short_names(len(internal), taken)))
+
+
+def rename_functions(text, name_map):
+    """
+    Applique une correspondance de noms aux en-têtes et références f$ d'un texte
+
+    Args:
+        text (str): Code de profil (ou trace contenant des noms f$)
+        name_map (dict): Ancien nom -> nouveau nom
+
+    Returns:
+        str: Texte renommé
+    """
+    return FUNCTION_REFERENCE.sub(lambda match: name_map.get(match.group(0), match.group(0)), text)
+
+
+def minify_profile(profile, short_names=False, library=None):
+    """
+    Produit la version de production d'un profil
+
+    Args:
+        profile (str): Code de profil
+        short_names (bool): Raccourcir le nom des fonctions internes
+        library (str): Texte de la bibliothèque de scénarios, dont les noms sont conservés
+
+    Returns:
+        tuple: (profil minifié, MinifyReport); renamed associe nom court -> nom d'origine
+    """
+    newline = "\r\n" if "\r\n" in profile else "\n"
+    minified = newline.join(minify_code(profile)) + newline
+    renamed = {}
+    if short_names:
+        name_map = short_name_map(profile, library)
+        minified = rename_functions(minified, name_map)
+        renamed = {short: original for original, short in name_map.items()}
+    report = MinifyReport(len(profile.encode('utf-8')), len(minified.encode('utf-8')), renamed)
+    return minified, report
+
+
+def write_name_map(path, renamed):
+    """
+    Écrit le fichier de correspondance des noms courts
+
+    Args:
+        path (str): Chemin du fichier JSON
+        renamed (dict): Nom court -> nom d'origine
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(renamed, file, indent=2, sort_keys=True)
+
+
+def read_name_map(path):
+    """
+    Lit un fichier de correspondance des noms courts
+
+    Args:
+        path (str): Chemin du fichier JSON
+
+    Returns:
+        dict: Nom court -> nom d'origine
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def format_report(report):
+    """
+    Résume une minification
+
+    Args:
+        report (MinifyReport): Résultat de minify_profile
+
+    Returns:
+        str: Résumé lisible
+    """
+    saved = report.original_size - report.minified_size
+    percent = 100.0 * saved / report.original_size if report.original_size else 0.0
+    return (f"Minified {report.original_size} -> {report.minified_size} bytes ({percent:.1f}% smaller), "
+            f"{len(report.renamed)} function(s) renamed")
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Strip comments and whitespace from a profile and optionally shorten internal function names."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("--short-names", action="store_true",
+                        help=f"Shorten internal function names and write the map next to the output "
+                             f"(<output>{NAME_MAP_SUFFIX})")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library whose names are kept (default: custom_function_library.ohf)")
+    parser.add_argument("--restore", metavar="NAME_MAP",
+                        help="Rename short names in the input back to the original names and write it to --output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la minification
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+
+    if args.restore:
+        restored = rename_functions(profile, read_name_map(args.restore))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as file:
+                file.write(restored)
+        else:
+            sys.stdout.write(restored)
+        return 0
+
+    library = load_library(args.library) if args.short_names else None
+    minified, report = minify_profile(profile, args.short_names, library)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(minified)
+        if args.short_names:
+            write_name_map(args.output + NAME_MAP_SUFFIX, report.renamed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,493 @@
+"""
+Analyse syntaxique des profils OpenPPL / OH-script
+Lit le dialecte écrit par les générateurs et celui de custom_function_library.ohf:
+sections ##f$Nom##, règles WHEN ... RETURN ... FORCE, WHEN sans action (blocs),
+WHEN Others, actions nues (RaiseMax, Call, ...), RaiseBy N% et RaiseTo N, corps de
+fonction OH-script sans WHEN, symboles $$cr0 / $AKs / f$Nom et expressions imbriquées
+(opérateurs OpenPPL AND, OR, XOR, NOT et OH-script &&, ||, !, ?:, bits, **).
+
+L'arbre produit est fait de namedtuples; chaque nœud porte la ligne et la colonne
+(à partir de 1) de son premier caractère dans le texte analysé. Les opérateurs sont
+normalisés: && -> AND, || -> OR, ^^ -> XOR, ! -> NOT, == -> =, <> -> !=.
+
+    profile = parse_profile(texte)
+    for function in profile.functions:
+        for rule in function.rules:
+            rule.condition, rule.action.kind, rule.line
+"""
+import argparse
+import re
+import sys
+import time
+from collections import namedtuple
+
+from openppl.functions import function_body, split_profile
+
+TOKEN = re.compile(
+    r'(?P<newline>\n)|(?P<space>[ \t\r\f\v]+)|(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<number>\d+(?:\.\d*)?|\.\d+)'
+    r'|(?P<name>f\$\w+|\$\$?\w+|[A-Za-z_]\w*)'
+    r'|(?P<operator>\*\*|&&|\|\||\^\^|==|!=|<>|<=|>=|<<|>>|[-+*/%<>=!&|^~?:()])',
+    re.DOTALL
+)
+
+# Mots-clés de structure (insensibles à la casse)
+KEYWORDS = ("WHEN", "OTHERS", "RETURN", "FORCE")
+
+# Opérateurs écrits en toutes lettres et formes équivalentes, normalisés
+OPERATOR_ALIASES = {
+    "AND": "AND", "OR": "OR", "XOR": "XOR", "NOT": "NOT",
+    "&&": "AND", "||": "OR", "^^": "XOR", "!": "NOT", "==": "=", "<>": "!=",
+}
+
+# Priorité des opérateurs binaires (plus grand: lie plus fort) et associativité à droite
+BINARY_PRECEDENCE = {
+    "OR": 1, "XOR": 2, "AND": 3, "|": 4, "^": 5, "&": 6,
+    "=": 7, "!=": 7, "<": 8, "<=": 8, ">": 8, ">=": 8,
+    "<<": 9, ">>": 9, "+": 10, "-": 10, "*": 11, "/": 11, "%": 11, "**": 12,
+}
+RIGHT_ASSOCIATIVE = ("**",)
+UNARY_OPERATORS = ("NOT", "-", "~", "+")
+
+# Actions suivies d'une valeur (RaiseBy 50% FORCE, RaiseTo 3 FORCE)
+VALUE_ACTIONS = {"RETURN": "RETURN", "RAISEBY": "RaiseBy", "RAISETO": "RaiseTo", "BETBY": "BetBy", "BETTO": "BetTo"}
+
+# Actions nues
+BARE_ACTION = re.compile(r'(?:Raise|Bet)\w*|Call|Check|Fold|Allin|SitOut|Leave|Close|Beep', re.IGNORECASE)
+
+# Nœuds d'expression
+Number = namedtuple("Number", ["value", "line", "column"])
+Symbol = namedtuple("Symbol", ["name", "line", "column"])
+Unary = namedtuple("Unary", ["operator", "operand", "line", "column"])
+Binary = namedtuple("Binary", ["operator", "left", "right", "line", "column"])
+Conditional = namedtuple("Conditional", ["condition", "then", "otherwise", "line", "column"])
+
+# Action d'une règle: kind vaut "RETURN", "RaiseBy", "RaiseTo", ... ou le nom d'une action
+# nue tel qu'écrit ("RaiseMax"); value est l'expression qui suit (None pour une action nue)
+# et percent indique un "%" après la valeur
+Action = namedtuple("Action", ["kind", "value", "percent", "line", "column"])
+
+# Règle WHEN: condition None pour WHEN Others, action None pour un WHEN sans action
+# (ouverture de bloc), force si la règle se termine par FORCE
+Rule = namedtuple("Rule", ["condition", "action", "force", "line", "column"])
+
+# Fonction ##f$Nom##: règles, ou expression pour un corps OH-script sans WHEN
+Function = namedtuple("Function", ["name", "rules", "expression", "line"])
+
+# Section qui n'est pas une fonction (##notes##, ##dll##, ...), texte brut
+Section = namedtuple("Section", ["name", "text", "line"])
+
+# Profil analysé: fonctions et autres sections dans l'ordre du fichier
+ParsedProfile = namedtuple("ParsedProfile", ["functions", "sections"])
+
+
+class ParseError(ValueError):
+    """
+    Erreur de syntaxe, avec sa position dans le texte analysé
+    """
+
+    def __init__(self, message, line, column):
+        super().__init__(f"line {line}, column {column}: {message}")
+        self.line = line
+        self.column = column
+
+
+def tokenize(text, line=1):
+    """
+    Découpe un texte OpenPPL en lexèmes, sans espaces ni commentaires
+
+    Args:
+        text (str): Texte à découper
+        line (int): Numéro de la première ligne du texte
+
+    Returns:
+        list: (type, valeur, ligne, colonne); type vaut "number", "name", "keyword" ou
+              "operator", valeur est normalisée pour les mots-clés et opérateurs
+
+    Raises:
+        ParseError: Sur un caractère non reconnu
+    """
+    tokens = []
+    line_start = 0
+    position = 0
+    length = len(text)
+    match_token = TOKEN.match
+    while position < length:
+        match = match_token(text, position)
+        if match is None:
+            raise ParseError(f"unexpected character {text[position]!r}", line, position - line_start + 1)
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "newline":
+            line += 1
+            line_start = match.end()
+        elif kind == "comment":
+            if "\n" in value:
+                line += value.count("\n")
+                line_start = match.start() + value.rindex("\n") + 1
+        elif kind != "space":
+            column = position - line_start + 1
+            if kind == "name":
+                upper = value.upper()
+                if upper in OPERATOR_ALIASES:
+                    kind, value = "operator", OPERATOR_ALIASES[upper]
+                elif upper in KEYWORDS:
+                    kind, value = "keyword", upper
+            elif kind == "operator":
+                value = OPERATOR_ALIASES.get(value, value)
+            tokens.append((kind, value, line, column))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Analyseur descendant d'une suite de lexèmes (priorité des opérateurs par remontée)
+    """
+
+    def __init__(self, tokens, end_line=1):
+        self.tokens = tokens
+        self.index = 0
+        self.end = (None, None, tokens[-1][2] if tokens else end_line, tokens[-1][3] + 1 if tokens else 1)
+
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else self.end
+
+    def take(self):
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def error(self, message, token=None):
+        token = token or self.peek()
+        return ParseError(message, token[2], token[3])
+
+    def expect(self, kind, value):
+        token = self.take()
+        if token[0] != kind or token[1] != value:
+            found = "end of function" if token[0] is None else repr(token[1])
+            raise self.error(f"expected {value!r}, found {found}", token)
+        return token
+
+    def expression(self):
+        condition = self.binary(1)
+        token = self.peek()
+        if token[0] == "operator" and token[1] == "?":
+            self.take()
+            then = self.expression()
+            self.expect("operator", ":")
+            otherwise = self.expression()
+            return Conditional(condition, then, otherwise, condition[-2], condition[-1])
+        return condition
+
+    def binary(self, minimum):
+        left = self.unary()
+        while True:
+            kind, operator, _, _ = self.peek()
+            precedence = BINARY_PRECEDENCE.get(operator) if kind == "operator" else None
+            if precedence is None or precedence < minimum:
+                return left
+            if operator == "%" and self.peek(1)[0] in (None, "keyword"):
+                # "RaiseBy 50% FORCE": pourcentage de l'action, pas un modulo
+                return left
+            self.take()
+            right = self.binary(precedence if operator in RIGHT_ASSOCIATIVE else precedence + 1)
+            left = Binary(operator, left, right, left[-2], left[-1])
+
+    def unary(self):
+        token = self.take()
+        kind, value, line, column = token
+        if kind == "operator":
+            if value in UNARY_OPERATORS:
+                return Unary(value, self.binary(BINARY_PRECEDENCE["**"]), line, column)
+            if value == "(":
+                inner = self.expression()
+                self.expect("operator", ")")
+                return inner
+        elif kind == "number":
+            return Number(float(value), line, column)
+        elif kind == "name":
+            return Symbol(value, line, column)
+        found = "end of function" if kind is None else repr(value)
+        raise self.error(f"expected an expression, found {found}", token)
+
+    def action(self):
+        token = self.take()
+        kind, value, line, column = token
+        if kind in ("keyword", "name") and value.upper() in VALUE_ACTIONS:
+            action_value = self.expression()
+            percent = self.peek()[0] == "operator" and self.peek()[1] == "%"
+            if percent:
+                self.take()
+            return Action(VALUE_ACTIONS[value.upper()], action_value, percent, line, column)
+        if kind == "name" and BARE_ACTION.fullmatch(value):
+            return Action(value, None, False, line, column)
+        found = "end of function" if kind is None else repr(value)
+        raise self.error(f"expected an action, found {found}", token)
+
+    def rule(self):
+        _, _, line, column = self.expect("keyword", "WHEN")
+        if self.peek()[:2] == ("keyword", "OTHERS"):
+            self.take()
+            condition = None
+        else:
+            condition = self.expression()
+        if self.peek()[0] is None or self.peek()[:2] == ("keyword", "WHEN"):
+            return Rule(condition, None, False, line, column)
+        action = self.action()
+        force = self.peek()[:2] == ("keyword", "FORCE")
+        if force:
+            self.take()
+        return Rule(condition, action, force, line, column)
+
+    def body(self):
+        if self.peek()[:2] != ("keyword", "WHEN"):
+            if self.peek()[0] is None:
+                return [], None
+            expression = self.expression()
+            if self.peek()[0] is not None:
+                raise self.error(f"unexpected {self.peek()[1]!r} after expression")
+            return [], expression
+        rules = []
+        while self.peek()[0] is not None:
+            rules.append(self.rule())
+        return rules, None
+
+
+def parse_expression(text, line=1):
+    """
+    Analyse une expression isolée (condition ou valeur)
+
+    Args:
+        text (str): Expression
+        line (int): Numéro de ligne du texte
+
+    Returns:
+        tuple: Nœud d'expression (Number, Symbol, Unary, Binary ou Conditional)
+
+    Raises:
+        ParseError: Si le texte n'est pas une expression complète
+    """
+    parser = _Parser(tokenize(text, line), line)
+    expression = parser.expression()
+    if parser.peek()[0] is not None:
+        raise parser.error(f"unexpected {parser.peek()[1]!r} after expression")
+    return expression
+
+
+def parse_function(name, body, line=1):
+    """
+    Analyse le corps d'une fonction
+
+    Args:
+        name (str): Nom de la fonction "f$Nom"
+        body (str): Corps, sans la ligne d'en-tête
+        line (int): Numéro de la ligne d'en-tête
+
+    Returns:
+        Function: Fonction analysée
+
+    Raises:
+        ParseError: Sur une erreur de syntaxe
+    """
+    rules, expression = _Parser(tokenize(body, line + 1), line + 1).body()
+    return Function(name, rules, expression, line)
+
+
+def parse_profile(text):
+    """
+    Analyse un profil ou une bibliothèque
+
+    Args:
+        text (str): Code de profil
+
+    Returns:
+        ParsedProfile: Fonctions (doublons compris) et autres sections, dans l'ordre du fichier
+
+    Raises:
+        ParseError: Sur la première erreur de syntaxe, préfixée du nom de la fonction
+    """
+    _, blocks = split_profile(text)
+    functions = []
+    sections = []
+    for block in blocks:
+        if not block.name.startswith("f$"):
+            sections.append(Section(block.name, function_body(block), block.line))
+            continue
+        try:
+            functions.append(parse_function(block.name, function_body(block), block.line))
+        except ParseError as error:
+            raise ParseError(f"{block.name}: {error.args[0].split(': ', 1)[1]}", error.line, error.column) from None
+    return ParsedProfile(functions, sections)
+
+
+def definitions(profile):
+    """
+    Indexe les fonctions d'un profil analysé, première définition de chaque nom
+
+    Args:
+        profile (ParsedProfile): Résultat de parse_profile
+
+    Returns:
+        dict: Nom -> Function
+    """
+    index = {}
+    for function in profile.functions:
+        index.setdefault(function.name, function)
+    return index
+
+
+def walk(node):
+    """
+    Parcourt un nœud et tous ses descendants (préfixe)
+
+    Args:
+        node (tuple): Nœud d'expression, Action, Rule ou Function
+
+    Yields:
+        tuple: Nœuds, en commençant par node
+    """
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if current is None:
+            continue
+        yield current
+        if isinstance(current, Binary):
+            pending.extend((current.right, current.left))
+        elif isinstance(current, Unary):
+            pending.append(current.operand)
+        elif isinstance(current, Conditional):
+            pending.extend((current.otherwise, current.then, current.condition))
+        elif isinstance(current, Action):
+            pending.append(current.value)
+        elif isinstance(current, Rule):
+            pending.extend((current.action, current.condition))
+        elif isinstance(current, Function):
+            pending.append(current.expression)
+            pending.extend(reversed(current.rules))
+
+
+def symbols(node):
+    """
+    Liste les noms des symboles d'un nœud (f$ compris)
+
+    Args:
+        node (tuple): Nœud à parcourir
+
+    Returns:
+        set: Noms des symboles
+    """
+    return {child.name for child in walk(node) if isinstance(child, Symbol)}
+
+
+def operands(node, operator):
+    """
+    Opérandes d'une suite d'opérations associatives (a AND b AND c), dans l'ordre
+
+    Args:
+        node (tuple): Nœud d'expression
+        operator (str): Opérateur normalisé ("AND", "OR", ...)
+
+    Returns:
+        list: Opérandes; [node] si node n'est pas une opération operator
+    """
+    result = []
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, Binary) and current.operator == operator:
+            pending.extend((current.right, current.left))
+        else:
+            result.append(current)
+    return result
+
+
+def format_expression(node, parent_precedence=0):
+    """
+    Réécrit une expression sous forme de texte OpenPPL (parenthèses minimales)
+
+    Args:
+        node (tuple): Nœud d'expression
+        parent_precedence (int): Priorité de l'opérateur englobant
+
+    Returns:
+        str: Texte de l'expression
+    """
+    if isinstance(node, Number):
+        return str(int(node.value)) if node.value.is_integer() else repr(node.value)
+    if isinstance(node, Symbol):
+        return node.name
+    if isinstance(node, Unary):
+        operand = format_expression(node.operand, BINARY_PRECEDENCE["**"] + 1)
+        return f"NOT {operand}" if node.operator == "NOT" else node.operator + operand
+    if isinstance(node, Conditional):
+        text = (f"{format_expression(node.condition, 1)} ? {format_expression(node.then)} "
+                f": {format_expression(node.otherwise)}")
+        return f"({text})" if parent_precedence else text
+    precedence = BINARY_PRECEDENCE[node.operator]
+    right_precedence = precedence if node.operator in RIGHT_ASSOCIATIVE else precedence + 1
+    left_precedence = precedence + 1 if node.operator in RIGHT_ASSOCIATIVE else precedence
+    text = (f"{format_expression(node.left, left_precedence)} {node.operator} "
+            f"{format_expression(node.right, right_precedence)}")
+    return f"({text})" if precedence < parent_precedence else text
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Parse OpenPPL profiles and report syntax errors and parse statistics."
+    )
+    parser.add_argument("profiles", nargs="+", help="Input .ohf files")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'analyse syntaxique
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si une erreur de syntaxe est trouvée)
+    """
+    args = parse_args(argv)
+    status = 0
+    for path in args.profiles:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+        start = time.perf_counter()
+        _, blocks = split_profile(text)
+        functions = rules = nodes = errors = 0
+        for block in blocks:
+            if not block.name.startswith("f$"):
+                continue
+            try:
+                function = parse_function(block.name, function_body(block), block.line)
+            except ParseError as error:
+                print(f"{path}: {block.name}: {error}", file=sys.stderr)
+                errors += 1
+                continue
+            functions += 1
+            rules += len(function.rules)
+            nodes += sum(1 for _ in walk(function))
+        elapsed = 1000 * (time.perf_counter() - start)
+        print(f"{path}: {functions} function(s), {rules} rule(s), {nodes} node(s), "
+              f"{errors} error(s) in {elapsed:.1f} ms")
+        if errors:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""
+Réordonnancement des chaînes de règles WHEN
+OpenHoldem évalue les règles d'une fonction dans l'ordre et s'arrête à la première
+qui s'applique; dans une règle, les conjonctions sont évaluées de gauche à droite
+et l'évaluation s'arrête au premier terme faux. Placer en tête les tests bon
+marché et sélectifs réduit donc le coût moyen d'une décision.
+
+Les conjonctions d'une règle sont triées par coût / probabilité d'être fausses.
+Deux règles ne sont échangées que si elles ne peuvent pas s'appliquer au même
+état (conditions contradictoires sur un symbole, une position ou un intervalle)
+ou si elles ont la même action: l'action retenue pour chaque état est inchangée.
+Les règles WHEN Others, les expressions nues et les WHEN sans action délimitent
+les chaînes et ne sont jamais déplacés.
+
+Le coût et la probabilité de chaque terme viennent d'un modèle statique, ou d'une
+trace d'évaluation enregistrée au format JSON:
+    {"atoms": {"<texte du terme>": {"cost": 3.0, "probability": 0.1}, ...}}
+Le coût des appels f$ est estimé sur le profil d'entrée: une seconde passe peut
+encore affiner l'ordre, une fois les fonctions appelées elles-mêmes réordonnées.
+"""
+import argparse
+import json
+import math
+import re
+import sys
+from collections import namedtuple
+
+from openppl.constraints import (NEGATION, POSITION_SYMBOLS, SYMBOL, KEYWORDS, condition_constraints, intersect,
+                                 is_empty, parse_comparison)
+from openppl.functions import function_body, join_profile, split_profile
+from openppl.rules import parse_rule, rewrite_rule_line, split_chains, split_conjuncts, split_operands, strip_parentheses
+
+# Symbole de rang de main (1 = meilleure des 169 mains de départ)
+HANDRANK_SYMBOL = "handrank169"
+HANDRANK_COUNT = 169
+
+# Probabilités par défaut du modèle statique
+DEFAULT_PROBABILITY = 0.5
+EQUALITY_PROBABILITY = 0.25
+
+# Symboles de mémoire OpenPPL à effet de bord: les règles qui les utilisent ne bougent pas
+SIDE_EFFECT = re.compile(r'\bme_(?:st|inc)_', re.IGNORECASE)
+
+# Résultat du réordonnancement: fonctions modifiées, règles déplacées, règles dont les
+# conjonctions ont changé d'ordre, coût estimé total avant et après
+ReorderReport = namedtuple("ReorderReport", ["functions", "moved_rules", "reordered_rules", "cost_before", "cost_after"])
+
+
+class CostModel:
+    """
+    Estimation du coût d'évaluation et de la probabilité d'être vrai de chaque terme
+
+    Un symbole OpenHoldem coûte 1; un appel f$ coûte 1 plus le coût moyen de la
+    fonction appelée, estimé sur ses propres règles.
+    """
+
+    def __init__(self, blocks, trace=None):
+        """
+        Args:
+            blocks (list): FunctionBlock du profil (pour le coût des appels f$)
+            trace (dict): Mesures par terme {"atoms": {texte: {"cost", "probability"}}} (optionnel)
+        """
+        self._bodies = {}
+        for block in blocks:
+            self._bodies.setdefault(block.name, []).append(function_body(block))
+        self._atoms = (trace or {}).get("atoms", {})
+        self._function_costs = {}
+
+    def function_cost(self, name):
+        """
+        Estime le coût moyen d'un appel de fonction
+
+        Args:
+            name (str): Nom "f$Nom"
+
+        Returns:
+            float: Coût estimé (1 pour une fonction inconnue ou récursive)
+        """
+        if name not in self._function_costs:
+            self._function_costs[name] = 1.0
+            costs = []
+            for body in self._bodies.get(name, []):
+                rules = []
+                for line in body.splitlines():
+                    rule = parse_rule(line.split("//", 1)[0].rstrip())
+                    if rule:
+                        rules.append(self.rule_estimate(split_conjuncts(rule.condition) or [rule.condition]))
+                costs.append(chain_cost(rules))
+            self._function_costs[name] = 1.0 + max(costs, default=0.0)
+        return self._function_costs[name]
+
+    def atom_cost(self, atom):
+        """
+        Args:
+            atom (str): Terme d'une condition
+
+        Returns:
+            float: Coût estimé de l'évaluation du terme
+        """
+        measured = self._atoms.get(atom.strip())
+        if measured and "cost" in measured:
+            return float(measured["cost"])
+        cost = 0.0
+        for symbol in SYMBOL.findall(atom):
+            if symbol.upper() in KEYWORDS:
+                continue
+            cost += self.function_cost(symbol) if symbol.startswith("f$") else 1.0
+        return max(cost, 1.0)
+
+    def atom_probability(self, atom):
+        """
+        Args:
+            atom (str): Terme d'une condition
+
+        Returns:
+            float: Probabilité estimée que le terme soit vrai
+        """
+        measured = self._atoms.get(atom.strip())
+        if measured and "probability" in measured:
+            return float(measured["probability"])
+
+        atom = strip_parentheses(atom)
+        conjuncts = split_conjuncts(atom)
+        if conjuncts and len(conjuncts) > 1:
+            return math.prod(self.atom_probability(conjunct) for conjunct in conjuncts)
+        disjuncts = split_operands(atom, "OR")
+        if disjuncts and len(disjuncts) > 1:
+            return 1 - math.prod(1 - self.atom_probability(disjunct) for disjunct in disjuncts)
+
+        negation = NEGATION.match(atom)
+        if negation:
+            return 1 - self.atom_probability(negation.group("operand"))
+        if atom in POSITION_SYMBOLS:
+            return 1 / len(POSITION_SYMBOLS)
+
+        comparison = parse_comparison(atom)
+        if comparison is None:
+            return DEFAULT_PROBABILITY
+        (left, base), bounds = comparison
+        if left == HANDRANK_SYMBOL and not base:
+            matching = sum(1 for rank in range(1, HANDRANK_COUNT + 1)
+                           if not is_empty(intersect(bounds, (rank, True, rank, True))))
+            return matching / HANDRANK_COUNT
+        return EQUALITY_PROBABILITY if bounds[0] == bounds[2] else DEFAULT_PROBABILITY
+
+    def rule_estimate(self, conjuncts):
+        """
+        Estime le coût et la probabilité d'une conjonction évaluée de gauche à droite
+
+        Args:
+            conjuncts (list): Termes de la condition
+
+        Returns:
+            tuple: (coût moyen, probabilité que la règle s'applique)
+        """
+        cost = 0.0
+        reach = 1.0
+        for conjunct in conjuncts:
+            cost += reach * self.atom_cost(conjunct)
+            reach *= self.atom_probability(conjunct)
+        return cost, reach
+
+
+def chain_cost(estimates):
+    """
+    Coût moyen d'une chaîne de règles évaluée jusqu'à la première qui s'applique
+
+    Args:
+        estimates (list): (coût, probabilité) de chaque règle, dans l'ordre
+
+    Returns:
+        float: Coût moyen estimé
+    """
+    cost = 0.0
+    reach = 1.0
+    for rule_cost, probability in estimates:
+        cost += reach * rule_cost
+        reach *= 1 - probability
+    return cost
+
+
+def _rank(cost, probability):
+    """
+    Rang de tri: coût par unité de probabilité de conclure
+    """
+    return cost / probability if probability > 0 else math.inf
+
+
+def order_conjuncts(conjuncts, model):
+    """
+    Trie les termes d'une conjonction: les moins chers et les plus souvent faux d'abord
+
+    Args:
+        conjuncts (list): Termes dans l'ordre du texte
+        model (CostModel): Modèle de coût
+
+    Returns:
+        list: Termes réordonnés (ordre du texte conservé à rang égal)
+    """
+    return sorted(conjuncts, key=lambda conjunct: _rank(model.atom_cost(conjunct),
+                                                         1 - model.atom_probability(conjunct)))
+
+
+def order_rules(entries):
+    """
+    Ordonne une chaîne de règles en respectant les dépendances
+
+    Une règle doit rester après chaque règle antérieure qui peut s'appliquer au
+    même état avec une autre action. Parmi les règles disponibles, celle de plus
+    petit rapport coût / probabilité est placée en premier.
+
+    Args:
+        entries (list): Dictionnaires avec "constraints", "action", "cost" et "probability"
+
+    Returns:
+        list: Indices des règles dans le nouvel ordre
+    """
+    predecessors = [
+        {
+            earlier for earlier in range(index)
+            if entries[earlier]["action"] != entries[index]["action"]
+            and not entries[earlier]["constraints"].excludes(entries[index]["constraints"])
+        }
+        for index in range(len(entries))
+    ]
+    placed = []
+    remaining = list(range(len(entries)))
+    while remaining:
+        available = [index for index in remaining if predecessors[index].issubset(placed)]
+        best = min(available, key=lambda index: (_rank(entries[index]["cost"], entries[index]["probability"]), index))
+        placed.append(best)
+        remaining.remove(best)
+    return placed
+
+
+def improve_order(entries):
+    """
+    Applique order_rules jusqu'à ce que le coût estimé de la chaîne ne baisse plus
+
+    Chaque passe respecte les dépendances de l'ordre précédent; une passe peut en
+    libérer de nouvelles, d'où la répétition. Le résultat est stable: réordonner
+    une seconde fois ne change plus rien.
+
+    Args:
+        entries (list): Règles de la chaîne (voir order_rules)
+
+    Returns:
+        list: Indices des règles dans le nouvel ordre (ordre d'origine si rien ne baisse le coût)
+    """
+    order = list(range(len(entries)))
+    best_cost = chain_cost([(entry["cost"], entry["probability"]) for entry in entries])
+    while True:
+        candidate = [order[index] for index in order_rules([entries[index] for index in order])]
+        cost = chain_cost([(entries[index]["cost"], entries[index]["probability"]) for index in candidate])
+        if cost >= best_cost:
+            return order
+        order, best_cost = candidate, cost
+
+
+def reorder_body(body, model, conjuncts=True):
+    """
+    Réordonne les chaînes de règles d'un corps de fonction
+
+    Args:
+        body (str): Corps de la fonction (sans la ligne d'en-tête)
+        model (CostModel): Modèle de coût
+        conjuncts (bool): Réordonner aussi les termes de chaque règle
+
+    Returns:
+        tuple: (nouveau corps, règles déplacées, règles réécrites, coût avant, coût après)
+    """
+    output = []
+    moved = rewritten = 0
+    cost_before = cost_after = 0.0
+    for segment in split_chains(body, SIDE_EFFECT.search):
+        if isinstance(segment, str):
+            output.append(segment)
+            continue
+
+        chain = []
+        for rule_line in segment:
+            line = rule_line.line
+            terms = split_conjuncts(rule_line.rule.condition) or [rule_line.rule.condition]
+            original_cost, probability = model.rule_estimate(terms)
+            if conjuncts and len(terms) > 1:
+                ordered = order_conjuncts(terms, model)
+                if ordered != terms:
+                    line = rewrite_rule_line(rule_line, ordered)
+                    rewritten += 1
+                    terms = ordered
+            cost, _ = model.rule_estimate(terms)
+            chain.append({
+                "leading": list(rule_line.leading),
+                "line": line,
+                "constraints": condition_constraints(rule_line.rule.condition),
+                "action": " ".join(rule_line.rule.action.split()),
+                "original_cost": original_cost,
+                "cost": cost,
+                "probability": probability,
+            })
+
+        order = improve_order(chain)
+        cost_before += chain_cost([(entry["original_cost"], entry["probability"]) for entry in chain])
+        cost_after += chain_cost([(chain[index]["cost"], chain[index]["probability"]) for index in order])
+        chain_moved = sum(1 for position, index in enumerate(order) if position != index)
+        moved += chain_moved
+        if not chain_moved:
+            for entry in chain:
+                output.extend(entry["leading"])
+                output.append(entry["line"])
+            continue
+        # Les commentaires ne suivent pas les règles déplacées, qu'ils décriraient à
+        # tort: ceux de la chaîne sont écrits avant les règles réordonnées, dans leur
+        # ordre d'origine (les lignes vides qui séparaient les règles sont retirées)
+        output.extend(chain[0]["leading"])
+        output.extend(text for entry in chain[1:] for text in entry["leading"] if text.strip())
+        output.extend(chain[index]["line"] for index in order)
+    return "".join(output), moved, rewritten, cost_before, cost_after
+
+
+def reorder_profile(profile, trace=None, conjuncts=True):
+    """
+    Réordonne les règles de toutes les fonctions d'un profil
+
+    Args:
+        profile (str): Code de profil
+        trace (dict): Mesures par terme (voir CostModel), optionnel
+        conjuncts (bool): Réordonner aussi les termes de chaque règle
+
+    Returns:
+        tuple: (profil réordonné, ReorderReport)
+    """
+    preamble, blocks = split_profile(profile)
+    model = CostModel(blocks, trace)
+    texts = []
+    functions = []
+    moved = rewritten = 0
+    cost_before = cost_after = 0.0
+    for block in blocks:
+        header, newline, body = block.text.partition("\n")
+        new_body, block_moved, block_rewritten, before, after = reorder_body(body, model, conjuncts)
+        if new_body != body:
+            functions.append(block.name)
+        texts.append(header + newline + new_body)
+        moved += block_moved
+        rewritten += block_rewritten
+        cost_before += before
+        cost_after += after
+    report = ReorderReport(functions, moved, rewritten, cost_before, cost_after)
+    return join_profile(preamble, texts), report
+
+
+def format_report(report):
+    """
+    Résume un réordonnancement
+
+    Args:
+        report (ReorderReport): Résultat de reorder_profile
+
+    Returns:
+        str: Résumé lisible
+    """
+    gain = 100 * (1 - report.cost_after / report.cost_before) if report.cost_before else 0
+    return (f"Reordered {len(report.functions)} function(s): {report.moved_rules} rule(s) moved, "
+            f"{report.reordered_rules} rule(s) with reordered conditions; "
+            f"estimated cost {report.cost_before:.0f} -> {report.cost_after:.0f} ({gain:.1f}% lower)")
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Reorder WHEN rules and their conditions by estimated cost and selectivity."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("--trace", help="Recorded per-term statistics (JSON) replacing the static estimates")
+    parser.add_argument("--rules-only", action="store_true", help="Keep the order of terms within each rule")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the reordered functions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du réordonnancement
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+    trace = None
+    if args.trace:
+        with open(args.trace, 'r', encoding='utf-8') as file:
+            trace = json.load(file)
+
+    reordered, report = reorder_profile(profile, trace, not args.rules_only)
+    if args.verbose:
+        for name in report.functions:
+            print(f"~ {name}")
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(reordered)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Découpage des règles OpenPPL
+Une règle "WHEN condition action FORCE" tient sur une ligne; sa condition est
+découpée en conjonctions de premier niveau pour les passes d'optimisation.
+
+Les passes réécrivent le texte des règles en gardant l'orthographe et les
+commentaires du profil: le découpage reste textuel, mais les opérateurs sont
+repérés avec les lexèmes de openppl.parser, et un découpage n'est retenu que si
+ses opérandes recomposent l'arbre de l'expression entière.
+"""
+import re
+from collections import namedtuple
+
+from openppl.parser import TOKEN, Binary, ParseError, format_expression, parse_expression, tokenize
+
+# Règle complète sur une ligne; la condition ne contient jamais RETURN, et une action
+# sans RETURN est le dernier mot-clé avant FORCE (la condition peut contenir "= Call")
+RULE = re.compile(
+    r'^(?P<prefix>[ \t]*WHEN\s+)(?P<condition>.+?)\s+'
+    r'(?P<action>RETURN\s+.+|RaiseBy\s+\S+|(?:Raise|Bet)\w*|Call|Check|Fold|Allin)(?P<suffix>\s+FORCE\s*)$',
+    re.IGNORECASE
+)
+
+# Règle par défaut d'une fonction
+OTHERS = re.compile(r'^\s*WHEN\s+Others\b', re.IGNORECASE)
+
+# Début de ligne WHEN (règle complète, WHEN Others ou WHEN sans action ouvrant un bloc)
+WHEN = re.compile(r'^\s*WHEN\s+\S', re.IGNORECASE)
+
+# Opérateurs (normalisés par openppl.parser) qui empêchent de découper sur un autre
+# opérateur logique quand ils sont au premier niveau
+LOGICAL_OPERATORS = ("AND", "OR", "XOR", "?", ":")
+
+# Règle analysée: début de ligne jusqu'à WHEN compris, condition, action et fin de ligne (FORCE)
+Rule = namedtuple("Rule", ["prefix", "condition", "action", "suffix"])
+
+# Règle d'une chaîne: lignes de commentaires qui la précèdent, ligne complète, règle analysée, code sans commentaire
+RuleLine = namedtuple("RuleLine", ["leading", "line", "rule", "code"])
+
+
+def parse_rule(line):
+    """
+    Analyse une ligne de règle
+
+    Args:
+        line (str): Ligne de code sans commentaire ni fin de ligne
+
+    Returns:
+        Rule: Règle analysée, ou None pour WHEN Others, un WHEN sans action ou une autre ligne
+    """
+    if OTHERS.match(line):
+        return None
+    match = RULE.match(line)
+    if match is None:
+        return None
+    return Rule(*match.group("prefix", "condition", "action", "suffix"))
+
+
+def format_rule(rule, conjuncts=None):
+    """
+    Réécrit une règle en conservant l'indentation et l'écriture de WHEN et FORCE
+
+    Args:
+        rule (Rule): Règle
+        conjuncts (list): Conjonctions remplaçant la condition (optionnel)
+
+    Returns:
+        str: Ligne de règle sans fin de ligne
+    """
+    condition = " AND ".join(conjuncts) if conjuncts is not None else rule.condition
+    return f"{rule.prefix}{condition} {rule.action}{rule.suffix}"
+
+
+def is_open_ended(code):
+    """
+    Indique si une ligne ouvre un bloc WHEN sans action
+
+    Le bloc s'étend jusqu'au WHEN sans action suivant; "WHEN Others" seul ouvre un
+    bloc toujours vrai et termine donc le bloc précédent.
+
+    Args:
+        code (str): Ligne de code sans commentaire
+
+    Returns:
+        bool: True pour "WHEN condition" seul
+    """
+    return bool(WHEN.match(code)) and RULE.match(code) is None
+
+
+def rewrite_rule_line(rule_line, conjuncts):
+    """
+    Remplace la condition d'une ligne de règle en conservant son commentaire et sa fin de ligne
+
+    Args:
+        rule_line (RuleLine): Règle d'une chaîne
+        conjuncts (list): Nouvelles conjonctions
+
+    Returns:
+        str: Ligne réécrite
+    """
+    return format_rule(rule_line.rule, conjuncts) + rule_line.line[len(rule_line.code):]
+
+
+def split_chains(body, barrier=None):
+    """
+    Découpe un corps de fonction en chaînes de règles complètes et en texte fixe
+
+    Une chaîne est une suite de règles "WHEN condition action FORCE", avec les
+    commentaires et lignes vides qui précèdent chacune. WHEN Others, les WHEN sans
+    action, les expressions nues et les lignes refusées par barrier interrompent
+    la chaîne et sont renvoyés tels quels, comme les commentaires qui les précèdent.
+
+    Args:
+        body (str): Corps de la fonction (sans la ligne d'en-tête)
+        barrier (function): Prédicat sur le code d'une règle qui ne doit pas faire partie d'une chaîne
+
+    Returns:
+        list: Segments dans l'ordre du texte: liste de RuleLine pour une chaîne, str pour le texte fixe
+    """
+    segments = []
+    chain = []
+    leading = []
+
+    def close():
+        if chain:
+            segments.append(list(chain))
+            chain.clear()
+        if leading:
+            segments.append("".join(leading))
+            leading.clear()
+
+    for line in body.splitlines(keepends=True):
+        code = line.rstrip("\r\n").split("//", 1)[0].rstrip()
+        if not code:
+            leading.append(line)
+            continue
+        rule = parse_rule(code)
+        if rule is None or (barrier is not None and barrier(code)):
+            close()
+            segments.append(line)
+            continue
+        chain.append(RuleLine(tuple(leading), line, rule, code))
+        leading.clear()
+    close()
+    return segments
+
+
+def _top_level_operators(expression):
+    """
+    Repère les opérateurs logiques et ?: hors parenthèses
+
+    Args:
+        expression (str): Expression OpenPPL
+
+    Returns:
+        list: (opérateur normalisé, début, fin) de chaque opérateur de premier niveau
+
+    Raises:
+        ParseError: Sur un caractère non reconnu
+    """
+    line_starts = [0] + [index + 1 for index, char in enumerate(expression) if char == "\n"]
+    operators = []
+    depth = 0
+    for kind, value, line, column in tokenize(expression):
+        if kind != "operator":
+            continue
+        if value == "(":
+            depth += 1
+        elif value == ")":
+            depth -= 1
+        elif depth == 0 and value in LOGICAL_OPERATORS:
+            start = line_starts[line - 1] + column - 1
+            operators.append((value, start, TOKEN.match(expression, start).end()))
+    return operators
+
+
+def strip_parentheses(expression):
+    """
+    Retire les parenthèses qui entourent toute une expression
+
+    Args:
+        expression (str): Expression OpenPPL
+
+    Returns:
+        str: Expression sans parenthèses englobantes
+    """
+    expression = expression.strip()
+    while expression.startswith("(") and expression.endswith(")"):
+        depth = 0
+        for index, char in enumerate(expression):
+            depth += {"(": 1, ")": -1}.get(char, 0)
+            if depth == 0 and index < len(expression) - 1:
+                return expression
+        expression = expression[1:-1].strip()
+    return expression
+
+
+def split_operands(expression, operator):
+    """
+    Découpe une expression sur un opérateur logique de premier niveau
+
+    Args:
+        expression (str): Expression OpenPPL
+        operator (str): "AND" ou "OR" (&& et || sont reconnus)
+
+    Returns:
+        list: Opérandes, ou None si l'expression mélange des opérateurs logiques ou ?:
+              au premier niveau, ou si openppl.parser ne la lit pas comme ce découpage
+    """
+    try:
+        operators = _top_level_operators(expression)
+    except ParseError:
+        return None
+    if any(value != operator for value, _, _ in operators):
+        return None
+    operands = []
+    start = 0
+    for _, begin, end in operators:
+        operands.append(expression[start:begin].strip())
+        start = end
+    operands.append(expression[start:].strip())
+    if len(operands) > 1 and not _same_tree(expression, operands, operator):
+        return None
+    return operands
+
+
+def _same_tree(expression, operands, operator):
+    """
+    Vérifie que les opérandes, joints par l'opérateur, donnent l'arbre de l'expression
+    """
+    try:
+        whole = parse_expression(expression)
+        nodes = [parse_expression(operand) for operand in operands]
+    except ParseError:
+        return False
+    joined = nodes[0]
+    for node in nodes[1:]:
+        joined = Binary(operator, joined, node, node.line, node.column)
+    return format_expression(joined) == format_expression(whole)
+
+
+def split_conjuncts(condition):
+    """
+    Découpe une condition en conjonctions de premier niveau
+
+    Args:
+        condition (str): Condition d'une règle
+
+    Returns:
+        list: Conjonctions dans l'ordre du texte, ou None si la condition contient un OR de premier niveau
+    """
+    return split_operands(condition, "AND")
@@ -0,0 +1,309 @@
+"""
+Simplification des règles d'un profil généré
+Les seuils sont calculés à partir des paramètres (round(tight_threshold * 0.5 *
+limp_factor), ...) et peuvent produire des règles qui ne s'appliquent jamais
+("handrank169 <= 0") ou qu'une règle précédente masque entièrement. Cette passe:
+    - évalue les comparaisons constantes sur le domaine connu des symboles
+      (handrank169 vaut de 1 à 169, les compteurs sont positifs ou nuls);
+    - supprime les règles dont la condition est toujours fausse ou contradictoire;
+    - supprime les règles dont la condition implique celle d'une règle précédente
+      de la même chaîne, et celles qui suivent un WHEN Others;
+    - fusionne les règles adjacentes de même action qui partagent un début de
+      condition: "A AND B" puis "A AND C" deviennent "A AND (B OR C)".
+Toutes les règles restantes peuvent donc s'appliquer, et l'action retenue pour
+chaque état est inchangée. Comme pour le réordonnancement, une règle qui lit ou
+écrit un symbole mémoire (me_st_, me_inc_) n'est ni supprimée ni fusionnée.
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+from openppl.constraints import Constraints, atom_truth, condition_constraints
+from openppl.functions import join_profile, split_profile
+from openppl.reorder import SIDE_EFFECT
+from openppl.rules import OTHERS, is_open_ended, rewrite_rule_line, split_chains, split_conjuncts
+
+# Résultat de la simplification: fonctions modifiées, termes constants retirés, règles
+# jamais vraies, règles masquées, fusions de règles adjacentes et octets gagnés
+SimplifyReport = namedtuple("SimplifyReport",
+                            ["functions", "folded_terms", "never_firing", "shadowed", "merged", "removed_bytes"])
+
+
+def _normalize(term):
+    return " ".join(term.split())
+
+
+def _group(terms):
+    """
+    Écrit une alternative d'une disjonction
+    """
+    return terms[0] if len(terms) == 1 else "(" + " AND ".join(terms) + ")"
+
+
+def _prune_alternatives(alternatives):
+    """
+    Retire les alternatives d'une disjonction contenues dans une autre
+
+    Args:
+        alternatives (list): Listes de termes, une par alternative
+
+    Returns:
+        list: Alternatives restantes, dans l'ordre
+    """
+    constraints = [condition_constraints(" AND ".join(terms)) for terms in alternatives]
+    kept = []
+    for index, terms in enumerate(alternatives):
+        covered = any(
+            other != index and constraints[index].implies(constraints[other])
+            and (other < index or not constraints[other].implies(constraints[index]))
+            for other in range(len(alternatives))
+        )
+        if not covered:
+            kept.append(terms)
+    return kept
+
+
+def _merge(previous, entry):
+    """
+    Fusionne une règle dans la règle précédente de même action si elles partagent un début de condition
+
+    Args:
+        previous (dict): Règle conservée précédente
+        entry (dict): Règle suivante
+
+    Returns:
+        bool: True si la fusion a eu lieu
+    """
+    if previous["terms"] is None or entry["terms"] is None or previous["action"] != entry["action"]:
+        return False
+    common = 0
+    for left, right in zip(previous["prefix"], entry["terms"]):
+        if _normalize(left) != _normalize(right):
+            break
+        common += 1
+    if common == 0:
+        return False
+
+    prefix = previous["prefix"][:common]
+    alternatives = [previous["prefix"][common:] + terms for terms in previous["alternatives"]]
+    alternatives.append(entry["terms"][common:])
+
+    # Les termes présents dans toutes les alternatives rejoignent le début commun
+    shared = set.intersection(*({_normalize(term) for term in terms} for terms in alternatives))
+    prefix += [term for term in alternatives[0] if _normalize(term) in shared]
+    alternatives = [[term for term in terms if _normalize(term) not in shared] for terms in alternatives]
+
+    # Une alternative vide rend la disjonction toujours vraie: seul le début commun compte
+    previous["alternatives"] = [[]] if any(not terms for terms in alternatives) else _prune_alternatives(alternatives)
+    previous["prefix"] = prefix
+    previous["changed"] = True
+    previous["absorbed"].extend(line for line in entry["rule_line"].leading if line.strip())
+    return True
+
+
+def _condition_terms(entry):
+    """
+    Construit les termes de la condition d'une règle simplifiée
+    """
+    alternatives = [terms for terms in entry["alternatives"] if terms]
+    if not alternatives:
+        return entry["prefix"]
+    if len(alternatives) == 1:
+        return entry["prefix"] + alternatives[0]
+    return entry["prefix"] + ["(" + " OR ".join(_group(terms) for terms in alternatives) + ")"]
+
+
+def simplify_chain(chain, unreachable, stats):
+    """
+    Simplifie une chaîne de règles
+
+    Args:
+        chain (list): RuleLine de la chaîne
+        unreachable (bool): La chaîne suit un WHEN Others: aucune règle ne peut s'appliquer
+        stats (dict): Compteurs à compléter
+
+    Returns:
+        str: Texte de la chaîne simplifiée
+    """
+    entries = []
+    kept = []
+    for rule_line in chain:
+        entry = {"rule_line": rule_line, "dropped": unreachable, "changed": False, "absorbed": []}
+        entries.append(entry)
+        if unreachable:
+            stats["shadowed"] += 1
+            continue
+
+        terms = split_conjuncts(rule_line.rule.condition)
+        if terms is not None:
+            truths = [atom_truth(term) for term in terms]
+            if False in truths:
+                entry["dropped"] = True
+                stats["never_firing"] += 1
+                continue
+            live = [term for term, truth in zip(terms, truths) if truth is not True]
+            if live and len(live) < len(terms):
+                stats["folded_terms"] += len(terms) - len(live)
+                entry["changed"] = True
+                terms = live
+            constraints = condition_constraints(" AND ".join(live)) if live else Constraints()
+        else:
+            constraints = condition_constraints(rule_line.rule.condition)
+
+        if constraints.contradiction:
+            entry["dropped"] = True
+            stats["never_firing"] += 1
+            continue
+        if any(constraints.implies(previous["constraints"]) for previous in kept):
+            entry["dropped"] = True
+            stats["shadowed"] += 1
+            continue
+
+        entry.update({
+            "terms": terms,
+            "prefix": terms,
+            "alternatives": [[]],
+            "constraints": constraints,
+            "action": _normalize(rule_line.rule.action),
+        })
+        kept.append(entry)
+
+    survivors = []
+    for entry in kept:
+        if survivors and _merge(survivors[-1], entry):
+            entry["dropped"] = True
+            entry["merged"] = True
+            stats["merged"] += 1
+        else:
+            survivors.append(entry)
+
+    output = []
+    for entry in entries:
+        rule_line = entry["rule_line"]
+        if entry.get("merged"):
+            continue
+        output.extend(rule_line.leading)
+        if entry["dropped"]:
+            continue
+        output.extend(entry["absorbed"])
+        if entry["changed"]:
+            output.append(rewrite_rule_line(rule_line, _condition_terms(entry)))
+        else:
+            output.append(rule_line.line)
+    return "".join(output)
+
+
+def simplify_body(body, stats):
+    """
+    Simplifie les chaînes de règles d'un corps de fonction
+
+    Args:
+        body (str): Corps de la fonction (sans la ligne d'en-tête)
+        stats (dict): Compteurs à compléter
+
+    Returns:
+        str: Nouveau corps
+    """
+    output = []
+    after_others = False
+    for segment in split_chains(body, SIDE_EFFECT.search):
+        if isinstance(segment, str):
+            code = segment.split("//", 1)[0].strip()
+            if is_open_ended(code):
+                # Un nouveau bloc WHEN rend ses règles de nouveau accessibles
+                after_others = False
+            elif OTHERS.match(code):
+                after_others = True
+            output.append(segment)
+        else:
+            output.append(simplify_chain(segment, after_others, stats))
+    return "".join(output)
+
+
+def simplify_profile(profile):
+    """
+    Simplifie toutes les fonctions d'un profil
+
+    Args:
+        profile (str): Code de profil
+
+    Returns:
+        tuple: (profil simplifié, SimplifyReport)
+    """
+    preamble, blocks = split_profile(profile)
+    stats = {"folded_terms": 0, "never_firing": 0, "shadowed": 0, "merged": 0}
+    texts = []
+    functions = []
+    for block in blocks:
+        header, newline, body = block.text.partition("\n")
+        new_body = simplify_body(body, stats)
+        if new_body != body:
+            functions.append(block.name)
+        texts.append(header + newline + new_body)
+    simplified = join_profile(preamble, texts)
+    removed_bytes = len(profile.encode('utf-8')) - len(simplified.encode('utf-8'))
+    return simplified, SimplifyReport(functions, removed_bytes=removed_bytes, **stats)
+
+
+def format_report(report):
+    """
+    Résume une simplification
+
+    Args:
+        report (SimplifyReport): Résultat de simplify_profile
+
+    Returns:
+        str: Résumé lisible
+    """
+    return (f"Simplified {len(report.functions)} function(s): {report.folded_terms} constant term(s) folded, "
+            f"{report.never_firing} never-firing and {report.shadowed} shadowed rule(s) removed, "
+            f"{report.merged} rule(s) merged; {report.removed_bytes} bytes saved")
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Fold constant comparisons, drop rules that can never fire and merge adjacent rules."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("-o", "--output", help="Output .ohf file (default: report only)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the simplified functions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la simplification
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+
+    simplified, report = simplify_profile(profile)
+    if args.verbose:
+        for name in report.functions:
+            print(f"~ {name}")
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(simplified)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+Stockage adressé par contenu des profils générés
+Chaque profil est découpé en blocs de fonctions; chaque bloc, le préambule, la
+liste des blocs et les paramètres sont enregistrés une seule fois sous le nom de
+leur empreinte SHA-256. Un profil qui partage la plupart de ses fonctions avec un
+profil déjà stocké n'ajoute donc que les blocs modifiés.
+
+Organisation du répertoire:
+    objects/ab/cdef...   blobs nommés d'après leur empreinte
+    index.jsonl          une ligne JSON par enregistrement, la dernière d'un profil l'emporte
+
+Plusieurs jeux de paramètres produisent souvent le même profil (un balayage de 123
+combinaisons en donne 41): chaque entrée liste donc les empreintes de tous les
+paramètres distincts enregistrés avec le profil, dans l'ordre d'enregistrement.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from openppl.functions import split_profile
+
+# Fichier d'index, une entrée JSON par ligne (ajout seulement)
+INDEX_FILE = "index.jsonl"
+
+# Sous-répertoire des blobs
+OBJECTS_DIR = "objects"
+
+
+def content_hash(data):
+    """
+    Calcule l'empreinte d'un texte
+
+    Args:
+        data (str): Texte
+
+    Returns:
+        str: Empreinte SHA-256 en hexadécimal du texte encodé en UTF-8
+    """
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ProfileStore:
+    """
+    Classe qui gère un dépôt local de profils dédupliqué au niveau des fonctions
+    """
+
+    def __init__(self, root):
+        """
+        Ouvre (ou crée) un dépôt
+
+        Args:
+            root (str): Répertoire du dépôt
+        """
+        self.root = root
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+        self._index = {}
+        self._load_index()
+
+    def _load_index(self):
+        """
+        Charge l'index; la dernière entrée d'un profil l'emporte
+        """
+        index_path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    # Anciennes entrées: une seule empreinte de paramètres, ou None
+                    settings = entry["settings"]
+                    if not isinstance(settings, list):
+                        entry["settings"] = [] if settings is None else [settings]
+                    self._index[entry["hash"]] = entry
+
+    def _object_path(self, blob_hash):
+        """
+        Renvoie le chemin du blob d'une empreinte
+
+        Args:
+            blob_hash (str): Empreinte SHA-256
+
+        Returns:
+            str: Chemin du fichier
+        """
+        return os.path.join(self.root, OBJECTS_DIR, blob_hash[:2], blob_hash[2:])
+
+    def _write_blob(self, data):
+        """
+        Enregistre un blob s'il n'existe pas encore
+
+        Args:
+            data (str): Contenu du blob
+
+        Returns:
+            tuple: (empreinte, nombre d'octets écrits, 0 si le blob existait déjà)
+        """
+        blob_hash = content_hash(data)
+        path = self._object_path(blob_hash)
+        if os.path.exists(path):
+            return blob_hash, 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        encoded = data.encode('utf-8')
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(encoded)
+        os.replace(temp_path, path)
+        return blob_hash, len(encoded)
+
+    def _read_blob(self, blob_hash):
+        """
+        Lit un blob
+
+        Args:
+            blob_hash (str): Empreinte SHA-256
+
+        Returns:
+            str: Contenu du blob
+
+        Raises:
+            KeyError: Si le blob est absent
+        """
+        path = self._object_path(blob_hash)
+        if not os.path.exists(path):
+            raise KeyError(f"Missing object {blob_hash}")
+        with open(path, 'rb') as file:
+            return file.read().decode('utf-8')
+
+    def put(self, profile, settings=None, label=None):
+        """
+        Enregistre un profil et, si fournis, les paramètres qui l'ont produit
+
+        Un profil déjà enregistré n'est pas réécrit; des paramètres qui ne lui sont
+        pas encore associés s'ajoutent à sa liste.
+
+        Args:
+            profile (str): Code de profil
+            settings (dict): Paramètres par street (optionnel)
+            label (str): Nom libre associé au profil (optionnel)
+
+        Returns:
+            dict: Entrée d'index du profil, avec "new_bytes" (octets ajoutés au dépôt)
+        """
+        profile_hash = content_hash(profile)
+        settings_hash, new_bytes = None, 0
+        if settings is not None:
+            settings_hash, new_bytes = self._write_blob(json.dumps(settings, indent=4, sort_keys=True))
+
+        if profile_hash in self._index:
+            entry = self._index[profile_hash]
+            if settings_hash is None or settings_hash in entry["settings"]:
+                return dict(entry, new_bytes=new_bytes)
+            entry = dict(entry, settings=entry["settings"] + [settings_hash],
+                         stored_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            self._append_entry(entry)
+            return dict(entry, new_bytes=new_bytes)
+
+        preamble, blocks = split_profile(profile)
+        blob_hashes = []
+        for data in [preamble] + [block.text for block in blocks]:
+            blob_hash, written = self._write_blob(data)
+            blob_hashes.append(blob_hash)
+            new_bytes += written
+
+        manifest_hash, written = self._write_blob(json.dumps({"blobs": blob_hashes}))
+        new_bytes += written
+
+        entry = {
+            "hash": profile_hash,
+            "manifest": manifest_hash,
+            "settings": [] if settings_hash is None else [settings_hash],
+            "size": len(profile.encode('utf-8')),
+            "functions": len(blocks),
+            "label": label,
+            "stored_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._append_entry(entry)
+        return dict(entry, new_bytes=new_bytes)
+
+    def _append_entry(self, entry):
+        """
+        Ajoute une entrée à l'index; elle remplace l'entrée précédente du même profil
+
+        Args:
+            entry (dict): Entrée d'index
+        """
+        with open(os.path.join(self.root, INDEX_FILE), 'a', encoding='utf-8') as file:
+            file.write(json.dumps(entry) + "\n")
+        self._index[entry["hash"]] = entry
+
+    def __contains__(self, profile_hash):
+        return profile_hash in self._index
+
+    def resolve(self, prefix):
+        """
+        Retrouve l'empreinte complète d'un profil à partir d'un préfixe
+
+        Args:
+            prefix (str): Début de l'empreinte (au moins 4 caractères)
+
+        Returns:
+            str: Empreinte complète
+
+        Raises:
+            KeyError: Si aucun profil ou plusieurs profils correspondent
+        """
+        matches = [profile_hash for profile_hash in self._index if profile_hash.startswith(prefix)]
+        if len(prefix) < 4 or len(matches) != 1:
+            raise KeyError(f"{'Ambiguous' if len(matches) > 1 else 'Unknown'} profile: {prefix}")
+        return matches[0]
+
+    def get(self, profile_hash):
+        """
+        Reconstitue un profil enregistré
+
+        Args:
+            profile_hash (str): Empreinte du profil
+
+        Returns:
+            str: Code de profil
+
+        Raises:
+            KeyError: Si le profil est inconnu
+            ValueError: Si le contenu reconstitué ne correspond pas à l'empreinte
+        """
+        entry = self._index[profile_hash]
+        manifest = json.loads(self._read_blob(entry["manifest"]))
+        profile = "".join(self._read_blob(blob_hash) for blob_hash in manifest["blobs"])
+        if content_hash(profile) != profile_hash:
+            raise ValueError(f"Corrupted profile {profile_hash}")
+        return profile
+
+    def get_settings(self, profile_hash, position=0):
+        """
+        Renvoie l'un des jeux de paramètres enregistrés avec un profil
+
+        Args:
+            profile_hash (str): Empreinte du profil
+            position (int): Rang du jeu de paramètres, dans l'ordre d'enregistrement
+
+        Returns:
+            dict: Paramètres par street, ou None s'il n'y en a pas à ce rang
+        """
+        settings_hashes = self._index[profile_hash]["settings"]
+        if not -len(settings_hashes) <= position < len(settings_hashes):
+            return None
+        return json.loads(self._read_blob(settings_hashes[position]))
+
+    def get_all_settings(self, profile_hash):
+        """
+        Renvoie tous les jeux de paramètres enregistrés avec un profil
+
+        Args:
+            profile_hash (str): Empreinte du profil
+
+        Returns:
+            list: Paramètres par street, dans l'ordre d'enregistrement
+        """
+        return [json.loads(self._read_blob(settings_hash))
+                for settings_hash in self._index[profile_hash]["settings"]]
+
+    def entries(self):
+        """
+        Liste les profils enregistrés, du plus ancien au plus récent
+
+        Returns:
+            list: Entrées d'index
+        """
+        return list(self._index.values())
+
+    def stats(self):
+        """
+        Calcule le gain de la déduplication
+
+        Returns:
+            dict: Nombre de profils et de blobs, taille logique et taille stockée en octets
+        """
+        stored_bytes = 0
+        blobs = 0
+        objects_dir = os.path.join(self.root, OBJECTS_DIR)
+        for directory, _, files in os.walk(objects_dir):
+            for name in files:
+                blobs += 1
+                stored_bytes += os.path.getsize(os.path.join(directory, name))
+
+        logical_bytes = sum(entry["size"] for entry in self._index.values())
+        return {
+            "profiles": len(self._index),
+            "blobs": blobs,
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "ratio": logical_bytes / stored_bytes if stored_bytes else 0.0,
+        }
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(description="Content-addressed store for generated profiles.")
+    parser.add_argument("--root", default="profile_store", help="Store directory (default: profile_store)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    put_parser = commands.add_parser("put", help="Store one or more .ohf files")
+    put_parser.add_argument("profiles", nargs="+", help="Profile files")
+    put_parser.add_argument("--settings", help="Settings JSON that produced the profile(s)")
+    put_parser.add_argument("--label", help="Label recorded with the profile(s)")
+
+    get_parser = commands.add_parser("get", help="Write a stored profile")
+    get_parser.add_argument("hash", help="Profile hash or unique prefix")
+    get_parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    get_parser.add_argument("--settings-output", help="Also write the stored settings JSON to this file")
+    get_parser.add_argument("--settings-index", type=int, default=0,
+                            help="Which of the settings recorded with the profile to write (default: 0, the first)")
+
+    commands.add_parser("list", help="List stored profiles")
+    commands.add_parser("stats", help="Show deduplication statistics")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée du dépôt de profils
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    store = ProfileStore(args.root)
+
+    if args.command == "put":
+        settings = None
+        if args.settings:
+            with open(args.settings, 'r', encoding='utf-8') as file:
+                settings = json.load(file)
+        for path in args.profiles:
+            with open(path, 'r', encoding='utf-8', newline='') as file:
+                entry = store.put(file.read(), settings, args.label or os.path.basename(path))
+            print(f"{entry['hash']}  {path} (+{entry['new_bytes']} bytes)")
+
+    elif args.command == "get":
+        try:
+            profile_hash = store.resolve(args.hash)
+        except KeyError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        profile = store.get(profile_hash)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as file:
+                file.write(profile)
+        else:
+            sys.stdout.write(profile)
+        if args.settings_output:
+            settings = store.get_settings(profile_hash, args.settings_index)
+            if settings is None:
+                print(f"No settings #{args.settings_index} stored for {profile_hash}", file=sys.stderr)
+                return 1
+            with open(args.settings_output, 'w', encoding='utf-8') as file:
+                json.dump(settings, file, indent=4)
+
+    elif args.command == "list":
+        for entry in store.entries():
+            print(f"{entry['hash'][:12]}  {entry['stored_at']}  {entry['size']:>8} bytes  "
+                  f"{entry['functions']:>4} functions  {len(entry['settings']):>3} settings  {entry['label'] or ''}")
+
+    else:
+        stats = store.stats()
+        print(f"Profiles: {stats['profiles']}, blobs: {stats['blobs']}")
+        print(f"Logical size: {stats['logical_bytes'] / 1024:.1f} KB, stored: {stats['stored_bytes'] / 1024:.1f} KB "
+              f"({stats['ratio']:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,557 @@
+"""
+Analyse des échelles de textures du flop par énumération exhaustive
+Les blocs de c-bet de f$flop testent les prédicats de texture (f$MonotoneBoard,
+f$PairedBoard, ...) dans un ordre fixe; plusieurs prédicats peuvent être vrais sur
+le même flop et une règle peut donc être masquée en partie ou en totalité par
+celles qui la précèdent. Cette passe évalue les prédicats du profil lui-même sur
+les 132 600 flops distribués (trois cartes dans l'ordre de distribution) et
+compte, pour chaque règle, les flops où elle est la première à s'appliquer.
+
+Le profil est lu par openppl.parser, comme pour l'évaluateur et le compilateur: une
+condition a donc la même priorité d'opérateurs partout. Les symboles qui dépendent
+des cartes du joueur (nstraightfill, HaveFlushDraw, ...) ou de la situation sont
+inconnus: l'évaluation est à trois valeurs et une règle n'est déclarée inaccessible
+que si, sur chaque flop, sa texture est fausse ou une règle précédente de contexte
+plus large s'applique certainement.
+"""
+import argparse
+import sys
+from collections import Counter, namedtuple
+from itertools import product
+
+from openppl.parser import (Binary, Number, ParseError, Symbol, Unary, definitions, format_expression,
+                            operands, parse_expression, parse_profile, symbols)
+
+# Fonction analysée par défaut
+DEFAULT_FUNCTION = "f$flop"
+
+# Rangs des cartes (OpenHoldem: 2 à 14, l'as vaut 14)
+RANKS = range(2, 15)
+SUITS = range(4)
+
+# Constantes nommées des rangs
+RANK_CONSTANTS = {
+    "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "jack": 11, "queen": 12, "king": 13, "ace": 14,
+}
+
+# Symboles OpenHoldem/OpenPPL qui ne dépendent que du flop
+BOARD_SYMBOLS = (
+    "$$cr0", "$$cr1", "$$cr2", "rankhicommon", "ranklocommon", "TopFlopCard", "SecondTopFlopCard",
+    "LowestFlopCard", "nsuitedcommon", "nstraightcommon", "nstraightfillcommon", "PairOnBoard",
+    "TwoPairOnBoard", "TripsOnBoard", "FlushPossible", "FlushDrawPossible", "StraightPossible",
+    "OpenEndedStraightDrawPossibleOnFlop",
+)
+
+# Règle d'une échelle: numéro de ligne, condition, action, termes de contexte (sans texture),
+# nombre de flops où la texture est certainement vraie, où la règle s'applique certainement
+# en premier, et où elle peut s'appliquer en premier
+TextureRule = namedtuple("TextureRule",
+                         ["line", "condition", "action", "context", "matches", "first", "possible"])
+
+# Résultat de l'analyse: fonction, nombre de flops énumérés, TextureRule des chaînes qui testent une texture
+TextureReport = namedtuple("TextureReport", ["function", "flops", "rules"])
+
+
+def _kleene_and(left, right):
+    if left is not None and not left or right is not None and not right:
+        return False
+    if left is None or right is None:
+        return None
+    return True
+
+
+def _kleene_or(left, right):
+    if left is not None and left or right is not None and right:
+        return True
+    if left is None or right is None:
+        return None
+    return False
+
+
+def _binary(operator, left, right):
+    """
+    Applique un opérateur binaire non logique à deux valeurs connues
+    """
+    if operator == "XOR":
+        return bool(left) != bool(right)
+    if operator == "=":
+        return left == right
+    if operator == "!=":
+        return left != right
+    if operator == "<":
+        return left < right
+    if operator == "<=":
+        return left <= right
+    if operator == ">":
+        return left > right
+    if operator == ">=":
+        return left >= right
+    if operator == "+":
+        return left + right
+    if operator == "-":
+        return left - right
+    if operator == "*":
+        return left * right
+    if operator == "**":
+        return left ** right
+    if operator in ("/", "%"):
+        if right == 0:
+            return 0
+        return left / right if operator == "/" else left % right
+    if operator == "&":
+        return int(left) & int(right)
+    if operator == "|":
+        return int(left) | int(right)
+    if operator == "^":
+        return int(left) ^ int(right)
+    if operator == "<<":
+        return int(left) << int(right)
+    return int(left) >> int(right)
+
+
+def evaluate_expression(node, env):
+    """
+    Évalue une expression analysée (openppl.parser) en logique à trois valeurs
+
+    Args:
+        node (tuple): Nœud d'expression
+        env: Environnement d'évaluation (méthode lookup(nom), None si inconnu)
+
+    Returns:
+        Valeur de l'expression, ou None si elle dépend d'un symbole inconnu
+    """
+    if isinstance(node, Number):
+        return node.value
+    if isinstance(node, Symbol):
+        return env.lookup(node.name)
+    if isinstance(node, Binary):
+        operator = node.operator
+        left = evaluate_expression(node.left, env)
+        if operator == "AND":
+            if left is not None and not left:
+                return False
+            return _kleene_and(left, evaluate_expression(node.right, env))
+        if operator == "OR":
+            if left is not None and left:
+                return True
+            return _kleene_or(left, evaluate_expression(node.right, env))
+        right = evaluate_expression(node.right, env)
+        if left is None or right is None:
+            return None
+        return _binary(operator, left, right)
+    if isinstance(node, Unary):
+        operand = evaluate_expression(node.operand, env)
+        if operand is None:
+            return None
+        if node.operator == "NOT":
+            return not operand
+        if node.operator == "~":
+            return ~int(operand)
+        return -operand if node.operator == "-" else operand
+    condition = evaluate_expression(node.condition, env)
+    if condition is None:
+        # Condition inconnue: la valeur n'est connue que si les deux branches concordent
+        then, otherwise = evaluate_expression(node.then, env), evaluate_expression(node.otherwise, env)
+        return then if then == otherwise else None
+    return evaluate_expression(node.then if condition else node.otherwise, env)
+
+
+def compile_expression(expression):
+    """
+    Analyse une expression OpenPPL pour l'évaluer en logique à trois valeurs
+
+    Args:
+        expression (str): Condition ou valeur de retour
+
+    Returns:
+        function: Évaluation dans un environnement (méthode lookup(nom)), valeur ou None si inconnue
+
+    Raises:
+        ParseError: Si l'expression n'est pas reconnue
+    """
+    node = parse_expression(expression)
+    return lambda env: evaluate_expression(node, env)
+
+
+def _straight_ranks(ranks):
+    """
+    Rangs distincts du flop, l'as comptant aussi pour 1
+    """
+    distinct = set(ranks)
+    if 14 in distinct:
+        distinct.add(1)
+    return distinct
+
+
+def board_symbols(ranks, suited):
+    """
+    Calcule les symboles de board d'un flop
+
+    Args:
+        ranks (tuple): Rangs des trois cartes dans l'ordre de distribution
+        suited (int): Nombre maximal de cartes de même couleur (nsuitedcommon)
+
+    Returns:
+        dict: Symbole -> valeur
+    """
+    ordered = sorted(ranks)
+    counts = Counter(ranks)
+    distinct = _straight_ranks(ranks)
+    longest = max(
+        length for start in range(1, 15)
+        for length in range(0, 6) if all(start + step in distinct for step in range(length))
+    )
+    filled = max(len(distinct & set(range(start, start + 5))) for start in range(1, 11))
+    open_ended = any(len(distinct & set(range(start, start + 4))) >= 2 for start in range(2, 11))
+    return {
+        "$$cr0": ranks[0], "$$cr1": ranks[1], "$$cr2": ranks[2],
+        "rankhicommon": ordered[2], "ranklocommon": ordered[0],
+        "TopFlopCard": ordered[2], "SecondTopFlopCard": ordered[1], "LowestFlopCard": ordered[0],
+        "nsuitedcommon": suited,
+        "nstraightcommon": longest,
+        "nstraightfillcommon": 5 - filled,
+        "PairOnBoard": max(counts.values()) >= 2,
+        "TwoPairOnBoard": False,
+        "TripsOnBoard": max(counts.values()) == 3,
+        "FlushPossible": suited >= 3,
+        "FlushDrawPossible": suited >= 2,
+        "StraightPossible": filled >= 3,
+        "OpenEndedStraightDrawPossibleOnFlop": open_ended,
+    }
+
+
+def enumerate_flops():
+    """
+    Énumère tous les flops distribués, regroupés par symboles de board identiques
+
+    Seuls les rangs dans l'ordre de distribution et le nombre de cartes de même
+    couleur comptent pour les symboles de board: les flops sont regroupés sur ces
+    deux valeurs et chaque groupe est pondéré par son nombre de distributions.
+
+    Returns:
+        list: (symboles du board, nombre de flops distribués), 132 600 flops au total
+    """
+    flops = []
+    for ranks in product(RANKS, repeat=3):
+        weights = Counter()
+        for suits in product(SUITS, repeat=3):
+            cards = set(zip(ranks, suits))
+            if len(cards) == 3:
+                weights[max(Counter(suits).values())] += 1
+        for suited, weight in sorted(weights.items()):
+            flops.append((board_symbols(ranks, suited), weight))
+    return flops
+
+
+class _Board:
+    """
+    Environnement d'évaluation d'un flop: symboles de board connus, fonctions f$ du
+    profil mémorisées, tout autre symbole inconnu
+    """
+
+    def __init__(self, symbols, functions):
+        self.symbols = symbols
+        self.functions = functions
+        self.results = {}
+
+    def lookup(self, name):
+        if name in self.symbols:
+            return self.symbols[name]
+        if name.lower() in RANK_CONSTANTS:
+            return RANK_CONSTANTS[name.lower()]
+        if name.lower() in ("true", "false"):
+            return name.lower() == "true"
+        if name in self.functions:
+            if name not in self.results:
+                # Une récursion éventuelle rend le résultat inconnu au lieu de boucler
+                self.results[name] = None
+                self.results[name] = self.functions[name].evaluate(self)
+            return self.results[name]
+        return None
+
+
+class _Function:
+    """
+    Fonction f$ analysée: suite de (garde, condition, valeur de retour), ou expression
+    """
+
+    def __init__(self, function):
+        self.expression = function.expression
+        self.rules = []
+        guard = None
+        for rule in function.rules:
+            if rule.action is None:
+                guard = rule.condition
+                continue
+            value = rule.action.value if rule.action.kind == "RETURN" else None
+            self.rules.append((guard, rule.condition, value))
+
+    def evaluate(self, env):
+        """
+        Évalue la fonction (première règle vraie); le résultat est inconnu si plusieurs
+        règles peuvent s'appliquer avec des valeurs différentes
+        """
+        if self.expression is not None:
+            return evaluate_expression(self.expression, env)
+        outcomes = set()
+        for guard, condition, value in self.rules:
+            truth = True if condition is None else evaluate_expression(condition, env)
+            if guard is not None:
+                truth = _kleene_and(evaluate_expression(guard, env), truth)
+            if truth is not None and not truth:
+                continue
+            # Une action nue (RaiseMax, ...) n'est pas une valeur de texture: inconnue
+            outcomes.add(None if value is None else evaluate_expression(value, env))
+            if truth is not None:
+                break
+        else:
+            outcomes.add(0)
+        return outcomes.pop() if len(outcomes) == 1 else None
+
+
+def compile_functions(parsed):
+    """
+    Prépare l'évaluation des fonctions f$ d'un profil
+
+    Quand un nom est défini plusieurs fois, la première définition est retenue.
+
+    Args:
+        parsed (ParsedProfile): Profil analysé
+
+    Returns:
+        dict: Nom "f$Nom" -> fonction évaluable
+    """
+    return {name: _Function(function) for name, function in definitions(parsed).items()}
+
+
+def _board_dependency(functions):
+    """
+    Détermine les fonctions qui dépendent (même indirectement) d'un symbole de board
+
+    Args:
+        functions (dict): Nom -> Function (première définition de chaque nom)
+
+    Returns:
+        function: Prédicat sur un terme de condition (nœud d'expression)
+    """
+    names = {name: symbols(function) for name, function in functions.items()}
+    dependent = {}
+
+    def depends(name, visiting=()):
+        if name in BOARD_SYMBOLS:
+            return True
+        if name not in names or name in visiting:
+            return False
+        if name not in dependent:
+            dependent[name] = any(depends(other, visiting + (name,)) for other in names[name])
+        return dependent[name]
+
+    return lambda term: any(depends(name) for name in symbols(term))
+
+
+def _action_text(action):
+    """
+    Écrit l'action d'une règle (RETURN f$X, RaiseBy 50%, RaiseMax)
+    """
+    if action.value is None:
+        return action.kind
+    return f"{action.kind} {format_expression(action.value)}{'%' if action.percent else ''}"
+
+
+def _chains(function):
+    """
+    Découpe les règles d'une fonction en chaînes, comme openppl.rules.split_chains
+
+    WHEN Others et les WHEN sans action interrompent une chaîne; les règles d'un bloc
+    WHEN sans action portent sa condition en garde.
+
+    Yields:
+        list: Règles (garde, Rule) d'une chaîne
+    """
+    chain = []
+    guard = []
+    for rule in function.rules:
+        if rule.action is None or rule.condition is None:
+            if chain:
+                yield chain
+                chain = []
+            if rule.action is None:
+                guard = [] if rule.condition is None else operands(rule.condition, "AND")
+            continue
+        chain.append((guard, rule))
+    if chain:
+        yield chain
+
+
+def analyze_ladders(profile, function=DEFAULT_FUNCTION, flops=None):
+    """
+    Compte, pour chaque règle d'une fonction qui teste une texture, les flops où elle s'applique
+
+    Chaque condition est découpée en termes de texture (qui dépendent du board) et
+    en termes de contexte. Une règle précédente ne masque la règle courante que si
+    ses termes de contexte figurent tous dans ceux de la règle courante.
+
+    Args:
+        profile (str): Code de profil
+        function (str): Fonction à analyser
+        flops (list): Résultat de enumerate_flops (recalculé si absent)
+
+    Returns:
+        TextureReport: Analyse des règles
+
+    Raises:
+        KeyError: Si la fonction n'est pas définie dans le profil
+        ParseError: Si le profil n'est pas reconnu par openppl.parser
+    """
+    parsed = parse_profile(profile)
+    target = definitions(parsed)[function]
+    functions = compile_functions(parsed)
+    is_texture = _board_dependency(definitions(parsed))
+    flops = flops if flops is not None else enumerate_flops()
+    boards = [(_Board(known, functions), weight) for known, weight in flops]
+
+    rules = []
+    for chain in _chains(target):
+        entries = []
+        for guard, rule in chain:
+            terms = guard + operands(rule.condition, "AND")
+            texture = [term for term in terms if is_texture(term)]
+            context = frozenset(format_expression(term) for term in terms if not is_texture(term))
+            entries.append((rule, texture, context))
+        if not any(texture for _, texture, _ in entries):
+            continue
+
+        truths = [[_all_true(texture, board) for board, _ in boards] for _, texture, _ in entries]
+        for index, (rule, texture, context) in enumerate(entries):
+            earlier = [truths[other] for other in range(index) if entries[other][2] <= context]
+            matches = first = possible = 0
+            for position, (_, weight) in enumerate(boards):
+                truth = truths[index][position]
+                if truth is False:
+                    continue
+                if truth:
+                    matches += weight
+                if any(values[position] for values in earlier):
+                    continue
+                possible += weight
+                if truth and all(values[position] is False for values in earlier):
+                    first += weight
+            rules.append(TextureRule(rule.line, format_expression(rule.condition), _action_text(rule.action),
+                                     context, matches, first, possible))
+    return TextureReport(function, sum(weight for _, weight in flops), rules)
+
+
+def _all_true(terms, env):
+    """
+    Conjonction à trois valeurs de termes de texture (vraie si aucun terme)
+    """
+    truth = True
+    for term in terms:
+        truth = _kleene_and(truth, evaluate_expression(term, env))
+        if truth is False:
+            return False
+    return truth
+
+
+def strip_unreachable(profile, report):
+    """
+    Retire d'un profil les règles qu'aucun flop ne peut atteindre
+
+    Args:
+        profile (str): Code de profil analysé
+        report (TextureReport): Résultat de analyze_ladders sur ce profil
+
+    Returns:
+        str: Profil sans les règles inaccessibles
+    """
+    unreachable = {rule.line for rule in report.rules if not rule.possible}
+    if not unreachable:
+        return profile
+    lines = profile.splitlines(keepends=True)
+    return "".join(text for number, text in enumerate(lines, 1) if number not in unreachable)
+
+
+def format_report(report, verbose=False):
+    """
+    Construit le rapport de l'analyse des textures
+
+    Args:
+        report (TextureReport): Résultat de analyze_ladders
+        verbose (bool): Afficher aussi les règles accessibles
+
+    Returns:
+        str: Rapport lisible
+    """
+    lines = []
+    context = None
+    for rule in report.rules:
+        status = "UNREACHABLE" if not rule.possible else "PARTIAL" if rule.first < rule.matches else "ok"
+        if status == "ok" and not verbose:
+            continue
+        if verbose and rule.context != context:
+            context = rule.context
+            lines.append(f"[{' AND '.join(sorted(context)) or 'no context'}]")
+        lines.append(f"{status:>11} line {rule.line}: first on {100.0 * rule.first / report.flops:5.1f}% "
+                     f"(up to {100.0 * rule.possible / report.flops:5.1f}%), texture true on "
+                     f"{100.0 * rule.matches / report.flops:5.1f}% -> {rule.action}")
+    unreachable = sum(1 for rule in report.rules if not rule.possible)
+    partial = sum(1 for rule in report.rules if rule.possible and rule.first < rule.matches)
+    lines.append(f"{report.function}: {len(report.rules)} texture rule(s) over {report.flops} flops, "
+                 f"{unreachable} unreachable, {partial} partly shadowed")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Enumerate every flop to find texture rules that are shadowed by earlier rules."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("--function", default=DEFAULT_FUNCTION,
+                        help=f"Function to analyze (default: {DEFAULT_FUNCTION})")
+    parser.add_argument("-o", "--output", help="Write the profile without unreachable rules")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every texture rule")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'analyse des textures
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8', newline='') as file:
+        profile = file.read()
+
+    try:
+        report = analyze_ladders(profile, args.function)
+    except KeyError:
+        print(f"Function {args.function} not found in {args.profile}", file=sys.stderr)
+        return 1
+    except ParseError as error:
+        print(f"{args.profile}: {error}", file=sys.stderr)
+        return 1
+    print(format_report(report, args.verbose))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(strip_unreachable(profile, report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,582 @@
+"""
+Évaluation d'un profil sur des colonnes NumPy de situations
+Pour les balayages de centaines de milliers de situations synthétiques: chaque
+symbole est une colonne (un tableau par symbole: handrank169, nopponentsplaying,
+rangs du board, ...), chaque condition WHEN devient un masque booléen et la
+première règle vraie est appliquée par affectation masquée. Chaque fonction f$ est
+évaluée une seule fois pour tout le lot.
+
+Les échelles de seuils (toutes les conditions de la forme "X <= constante" sur un
+même opérande, résultats constants: f$OpenRaise_*, tables f$PushFold_*) sont
+précalculées une fois par profil et évaluées par recherche dichotomique
+(numpy.searchsorted).
+
+Les valeurs sont des nombres; une action vaut son code (ACTION_CODES), si bien
+qu'une colonne d'actions (BotsLastPreflopAction) peut être fournie par codes ou
+par noms. Contrairement à openppl.evaluator, une opération invalide sur une action
+(Call < 3) ne lève pas d'erreur.
+
+Nécessite NumPy.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from openppl.dead_code import DEFAULT_LIBRARY, ENTRY_POINTS, load_library
+from openppl.evaluator import ACTIONS, CONSTANTS, EvaluationError, resolve_functions
+from openppl.parser import Binary, Conditional, Number, Symbol, Unary, VALUE_ACTIONS
+
+# Codes des actions: rang dans ce tuple (0: pas d'action)
+ACTION_CODES = ("",) + ACTIONS + tuple(kind for kind in VALUE_ACTIONS.values() if kind != "RETURN")
+ACTION_CODE = {name.lower(): code for code, name in enumerate(ACTION_CODES) if name}
+
+# Opérateurs de comparaison et arithmétiques
+COMPARISONS = {"=": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+               ">": np.greater, ">=": np.greater_equal}
+ARITHMETIC = {"+": np.add, "-": np.subtract, "*": np.multiply, "**": np.power}
+INTEGER_OPERATORS = {"&": np.bitwise_and, "|": np.bitwise_or, "^": np.bitwise_xor,
+                     "<<": np.left_shift, ">>": np.right_shift}
+
+# Opérateurs des échelles de seuils et côté de la recherche dichotomique correspondant
+LADDER_SIDES = {"<=": "left", "<": "right"}
+
+# Valeur d'une fonction sur un lot
+#   values: valeur (nombre, ou code de l'action)
+#   actions: code de l'action (0: la fonction renvoie un nombre)
+#   amounts: montant de RaiseBy / RaiseTo (NaN sinon)
+BatchResult = namedtuple("BatchResult", ["values", "actions", "amounts"])
+
+# Décision sur un lot
+#   actions: nom de l'action par situation ("" si le point d'entrée renvoie un nombre)
+#   codes: code de l'action (voir ACTION_CODES)
+#   amounts: montant de RaiseBy / RaiseTo, valeur renvoyée si pas d'action, NaN sinon
+BatchDecision = namedtuple("BatchDecision", ["actions", "codes", "amounts"])
+
+# Échelle de seuils: opérateur, opérande (symbole ou fonction), seuils croissants
+Ladder = namedtuple("Ladder", ["operator", "operand", "thresholds"])
+
+
+def action_code(name):
+    """
+    Args:
+        name (str): Nom d'action, sans distinction de casse
+
+    Returns:
+        int: Code de l'action
+
+    Raises:
+        EvaluationError: Si le nom n'est pas une action
+    """
+    code = ACTION_CODE.get(name.lower())
+    if code is None:
+        raise EvaluationError(f"unknown action {name}")
+    return code
+
+
+def columns_from_states(states):
+    """
+    Convertit une liste de situations en colonnes
+
+    Args:
+        states (list): Situations {symbole: valeur}, toutes avec les mêmes symboles
+
+    Returns:
+        dict: Symbole -> tableau NumPy
+    """
+    if not states:
+        return {}
+    return {name: np.array([state[name] for state in states]) for name in states[0]}
+
+
+def _truth(value):
+    if isinstance(value, np.ndarray):
+        return value if value.dtype == np.bool_ else value != 0
+    return bool(value)
+
+
+def _operands(node, operator_name):
+    """
+    Opérandes d'une suite d'opérations associatives (a AND b AND c), dans l'ordre
+    """
+    operands = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Binary) and current.operator == operator_name:
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            operands.append(current)
+    return operands
+
+
+def _ladder(function):
+    """
+    Reconnaît une échelle de seuils
+
+    Returns:
+        Ladder: Échelle, ou None si la fonction n'en est pas une
+    """
+    if function.expression is not None or not function.rules:
+        return None
+    operator_name = operand = None
+    thresholds = set()
+    for rule in function.rules:
+        action = rule.action
+        if action is not None and action.value is not None:
+            value = action.value
+            constant = isinstance(value, Number) or (isinstance(value, Symbol) and value.name.lower() in ACTION_CODE)
+            if not constant:
+                return None
+        condition = rule.condition
+        if condition is None:
+            continue
+        if not (isinstance(condition, Binary) and condition.operator in LADDER_SIDES
+                and isinstance(condition.left, Symbol) and isinstance(condition.right, Number)):
+            return None
+        if operand is None:
+            operator_name, operand = condition.operator, condition.left.name
+        elif (condition.operator, condition.left.name) != (operator_name, operand):
+            return None
+        thresholds.add(condition.right.value)
+    if operand is None:
+        return None
+    return Ladder(operator_name, operand, tuple(sorted(thresholds)))
+
+
+def _column(name, column, size):
+    """
+    Convertit une colonne en tableau NumPy (noms d'action en codes) et vérifie sa taille
+    """
+    array = column if isinstance(column, np.ndarray) else np.asarray(column)
+    if array.dtype.kind in "UOS":
+        names, inverse = np.unique(array.astype(str), return_inverse=True)
+        array = np.array([action_code(action) for action in names], np.int16)[inverse.reshape(-1)]
+        array = array.reshape(np.shape(column))
+    if array.ndim == 0:
+        return array.item()
+    if len(array) != size:
+        raise EvaluationError(f"column {name} has {len(array)} values, expected {size}")
+    return array
+
+
+def _batch_size(columns):
+    """
+    Taille d'un lot: longueur de la première colonne qui n'est pas un scalaire (1 sinon)
+    """
+    for column in columns.values():
+        if np.ndim(column):
+            return len(column)
+    return 1
+
+
+class _BatchRun:
+    """
+    Évaluation d'un lot: colonnes converties à la demande et valeurs des fonctions évaluées
+
+    Avec rows, le lot est le sous-ensemble de ces situations des colonnes.
+    """
+
+    def __init__(self, profile, source, size, rows=None):
+        self.profile = profile
+        self.functions = profile.functions
+        self.strict = profile.strict
+        self.source = source
+        self.size = size if rows is None else len(rows)
+        self.source_size = size
+        self.rows = rows
+        self.columns = {}
+        self.results = {}
+        self.active = set()
+        self.everything = np.ones(self.size, np.bool_)
+
+    def column(self, name):
+        array = self.columns.get(name)
+        if array is None and name in self.source:
+            array = _column(name, self.source[name], self.source_size)
+            if self.rows is not None and isinstance(array, np.ndarray):
+                array = array[self.rows]
+            self.columns[name] = array
+        return array
+
+    def symbol(self, name):
+        column = self.column(name)
+        if column is not None:
+            return column
+        if name in self.functions:
+            return self.call(name).values
+        key = name.lower()
+        if key in CONSTANTS:
+            return float(CONSTANTS[key])
+        if key in ACTION_CODE:
+            return float(ACTION_CODE[key])
+        if self.strict:
+            raise EvaluationError(f"symbol {name} is not defined by the profile or the columns")
+        return 0.0
+
+    def call(self, name):
+        result = self.results.get(name)
+        if result is not None:
+            return result
+        if name in self.active:
+            raise EvaluationError(f"recursive call to {name}")
+        self.active.add(name)
+        try:
+            table = self.profile.ladder_table(name)
+            result = self.lookup(table) if table is not None else self.profile.plans[name](self)
+        finally:
+            self.active.discard(name)
+        self.results[name] = result
+        return result
+
+    def lookup(self, table):
+        """
+        Évalue une échelle de seuils par recherche dichotomique
+        """
+        ladder, result = table
+        operand = np.broadcast_to(self.symbol(ladder.operand), (self.size,))
+        index = np.searchsorted(ladder.thresholds, operand, LADDER_SIDES[ladder.operator])
+        return BatchResult(result.values[index], result.actions[index], result.amounts[index])
+
+
+class _Planner:
+    """
+    Traduit une fois par profil les fonctions analysées en fermetures NumPy
+
+    Une expression devient value(run) -> tableau ou scalaire, une condition
+    condition(run, live) -> masque des situations de live pour lesquelles elle est vraie.
+    """
+
+    def __init__(self, functions):
+        self.functions = functions
+
+    def function(self, function):
+        if function.expression is not None:
+            value = self.value(function.expression)
+
+            def expression(run):
+                values = np.empty(run.size)
+                values[:] = value(run)
+                return BatchResult(values, np.zeros(run.size, np.int16), np.full(run.size, np.nan))
+            return expression
+
+        steps = [(rule.action is None,
+                  None if rule.condition is None else self.condition(rule.condition),
+                  None if rule.action is None else self.result(rule.action))
+                 for rule in function.rules]
+
+        def rules(run):
+            # Première règle vraie de chaque situation, par affectation masquée
+            size = run.size
+            values = np.zeros(size)
+            actions = np.zeros(size, np.int16)
+            amounts = np.full(size, np.nan)
+            pending = live = run.everything
+            for header, condition, result in steps:
+                if header:
+                    live = pending if condition is None else condition(run, pending)
+                    continue
+                if not live.any():
+                    continue
+                mask = live if condition is None else condition(run, live)
+                if not mask.any():
+                    continue
+                result(run, mask, values, actions, amounts)
+                pending = pending & ~mask
+                if not pending.any():
+                    break
+                live = live & ~mask
+            return BatchResult(values, actions, amounts)
+        return rules
+
+    def result(self, action):
+        """
+        Fermeture qui écrit le résultat d'une règle dans les situations d'un masque
+        """
+        node = action.value
+        if node is None or action.kind != "RETURN":
+            kind = action.kind
+            code = ACTION_CODE.get(kind.lower())
+            amount = None if node is None else self.value(node)
+
+            def act(run, mask, values, actions, amounts):
+                if code is None:
+                    raise EvaluationError(f"unknown action {kind}")
+                values[mask] = code
+                actions[mask] = code
+                if amount is not None:
+                    np.copyto(amounts, amount(run), where=mask)
+            return act
+
+        value = self.value(node)
+        name = node.name if isinstance(node, Symbol) else None
+        is_function = name in self.functions
+        code = ACTION_CODE.get(name.lower()) if name else None
+
+        def returned(run, mask, values, actions, amounts):
+            if name is not None and name not in run.source:
+                if is_function:
+                    result = run.call(name)
+                    np.copyto(values, result.values, where=mask)
+                    np.copyto(actions, result.actions, where=mask)
+                    np.copyto(amounts, result.amounts, where=mask)
+                    return
+                if code is not None:
+                    values[mask] = code
+                    actions[mask] = code
+                    return
+            np.copyto(values, value(run), where=mask)
+        return returned
+
+    def condition(self, node):
+        if isinstance(node, Binary) and node.operator == "AND":
+            conditions = [self.condition(operand) for operand in _operands(node, "AND")]
+
+            def all_of(run, live):
+                mask = live
+                for condition in conditions:
+                    mask = condition(run, mask)
+                    if not mask.any():
+                        break
+                return mask
+            return all_of
+        if isinstance(node, Binary) and node.operator == "OR":
+            conditions = [self.condition(operand) for operand in _operands(node, "OR")]
+
+            def any_of(run, live):
+                mask = None
+                remaining = live
+                for condition in conditions:
+                    hit = condition(run, remaining)
+                    mask = hit if mask is None else mask | hit
+                    remaining = remaining & ~hit
+                    if not remaining.any():
+                        break
+                return mask
+            return any_of
+        value = self.value(node)
+        return lambda run, live: live & _truth(value(run))
+
+    def value(self, node):
+        if isinstance(node, Number):
+            constant = node.value
+            return lambda run: constant
+        if isinstance(node, Symbol):
+            name = node.name
+            return lambda run: run.symbol(name)
+        if isinstance(node, Binary):
+            operator_name = node.operator
+            if operator_name in ("AND", "OR"):
+                condition = self.condition(node)
+                return lambda run: condition(run, run.everything)
+            left, right = self.value(node.left), self.value(node.right)
+            if operator_name == "XOR":
+                return lambda run: np.not_equal(_truth(left(run)), _truth(right(run)))
+            if operator_name in COMPARISONS:
+                compare = COMPARISONS[operator_name]
+                if isinstance(node.right, Number):
+                    constant = node.right.value
+                    return lambda run: compare(left(run), constant)
+                return lambda run: compare(left(run), right(run))
+            if operator_name in ARITHMETIC:
+                operation = ARITHMETIC[operator_name]
+                return lambda run: operation(np.asarray(left(run), float), right(run))
+            if operator_name in ("/", "%"):
+                operation = np.divide if operator_name == "/" else np.mod
+
+                def divide(run):
+                    # OpenHoldem renvoie 0 pour une division par zéro
+                    numerator, denominator = left(run), right(run)
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        quotient = operation(numerator, denominator)
+                    return np.where(np.equal(denominator, 0), 0.0, quotient)
+                return divide
+            if operator_name in INTEGER_OPERATORS:
+                operation = INTEGER_OPERATORS[operator_name]
+                return lambda run: operation(np.asarray(left(run)).astype(np.int64),
+                                             np.asarray(right(run)).astype(np.int64))
+            raise EvaluationError(f"unknown operator {operator_name}")
+        if isinstance(node, Unary):
+            operand = self.value(node.operand)
+            if node.operator == "NOT":
+                return lambda run: np.logical_not(_truth(operand(run)))
+            if node.operator == "~":
+                return lambda run: np.invert(np.asarray(operand(run)).astype(np.int64))
+            if node.operator == "-":
+                return lambda run: np.negative(operand(run))
+            return operand
+        if isinstance(node, Conditional):
+            condition, then, otherwise = self.value(node.condition), self.value(node.then), self.value(node.otherwise)
+            return lambda run: np.where(_truth(condition(run)), then(run), otherwise(run))
+        raise EvaluationError(f"cannot evaluate {type(node).__name__}")
+
+
+class VectorizedProfile:
+    """
+    Profil évalué sur des colonnes NumPy (définitions retenues: voir openppl.evaluator.resolve_functions)
+    """
+
+    def __init__(self, profile, library=None, strict=True):
+        """
+        Prépare l'évaluation d'un profil
+
+        Args:
+            profile: Texte du profil ou ParsedProfile
+            library: Texte ou ParsedProfile de la bibliothèque de scénarios (None: aucune)
+            strict (bool): Un symbole absent des colonnes est une erreur (sinon il vaut 0)
+        """
+        self.functions = resolve_functions(profile, library)
+        self.strict = strict
+        planner = _Planner(self.functions)
+        self.plans = {name: planner.function(function) for name, function in self.functions.items()}
+        self.ladders = {}
+        for name, function in self.functions.items():
+            ladder = _ladder(function)
+            if ladder is not None:
+                self.ladders[name] = ladder
+        self._tables = {}
+
+    def ladder_table(self, name):
+        """
+        Renvoie la table d'une échelle de seuils, calculée au premier appel
+
+        Args:
+            name (str): Nom de la fonction
+
+        Returns:
+            tuple: (Ladder, BatchResult d'un représentant par intervalle), ou None
+        """
+        table = self._tables.get(name)
+        if table is None and name in self.ladders:
+            ladder = self.ladders[name]
+            thresholds = list(ladder.thresholds)
+            # Un représentant par intervalle entre deux seuils, bornes comprises selon l'opérateur
+            if ladder.operator == "<=":
+                representatives = thresholds + [thresholds[-1] + 1]
+            else:
+                representatives = [thresholds[0] - 1] + thresholds
+            run = _BatchRun(self, {ladder.operand: np.array(representatives, float)}, len(representatives))
+            table = self._tables[name] = (ladder, self.plans[name](run))
+        return table
+
+    def evaluate(self, name, columns):
+        """
+        Évalue une fonction sur un lot
+
+        Args:
+            name (str): Nom de la fonction "f$Nom"
+            columns (dict): Symbole -> tableau (ou scalaire commun à tout le lot)
+
+        Returns:
+            BatchResult: Valeurs, codes d'action et montants
+
+        Raises:
+            EvaluationError: Si la fonction n'est pas définie, si un symbole manque (mode strict)
+                             ou si l'évaluation boucle
+        """
+        if name not in self.functions:
+            raise EvaluationError(f"function {name} is not defined by the profile")
+        return _BatchRun(self, columns, _batch_size(columns)).call(name)
+
+    def decide(self, columns, entry_point=None):
+        """
+        Calcule la décision du profil pour chaque situation d'un lot
+
+        Args:
+            columns (dict): Symbole -> tableau (ou scalaire commun à tout le lot)
+            entry_point (str): Fonction évaluée (par défaut: selon la colonne betround, 1 à 4,
+                               sinon f$preflop)
+
+        Returns:
+            BatchDecision: Actions, codes et montants
+
+        Raises:
+            EvaluationError: Si un symbole manque (mode strict) ou si l'évaluation boucle
+        """
+        size = _batch_size(columns)
+        if entry_point is not None or "betround" not in columns:
+            streets = [(entry_point or ENTRY_POINTS[0], None)]
+        else:
+            betround = np.clip(np.broadcast_to(_column("betround", columns["betround"], size), (size,))
+                               .astype(np.int64), 1, len(ENTRY_POINTS))
+            streets = [(name, np.flatnonzero(betround == street)) for street, name in enumerate(ENTRY_POINTS, 1)]
+            streets = [(name, rows) for name, rows in streets if len(rows)]
+            if len(streets) == 1:
+                streets = [(streets[0][0], None)]
+
+        codes = np.zeros(size, np.int16)
+        amounts = np.full(size, np.nan)
+        for name, rows in streets:
+            if name not in self.functions:
+                raise EvaluationError(f"function {name} is not defined by the profile")
+            result = _BatchRun(self, columns, size, rows).call(name)
+            if rows is None:
+                rows = slice(None)
+            codes[rows] = result.actions
+            amounts[rows] = np.where(result.actions == 0, result.values, result.amounts)
+        return BatchDecision(np.asarray(ACTION_CODES)[codes], codes, amounts)
+
+
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv (list): Arguments (par défaut: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Arguments analysés
+    """
+    parser = argparse.ArgumentParser(
+        description="Evaluate a profile on a batch of game states given as JSON and count the actions."
+    )
+    parser.add_argument("profile", help="Input .ohf file")
+    parser.add_argument("states", help="JSON file with a list of game states or a dict of columns (symbol -> list)")
+    parser.add_argument("--entry-point", help="Function to evaluate (default: from betround, else f$preflop)")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY,
+                        help="Scenario function library (default: custom_function_library.ohf)")
+    parser.add_argument("--no-library", action="store_true", help="Evaluate the profile alone")
+    parser.add_argument("--lenient", action="store_true", help="Treat symbols missing from the states as 0")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Point d'entrée de l'évaluation par lots
+
+    Args:
+        argv (list): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie (1 si le lot ne peut pas être évalué)
+    """
+    args = parse_args(argv)
+    with open(args.profile, 'r', encoding='utf-8') as file:
+        profile = file.read()
+    with open(args.states, 'r', encoding='utf-8') as file:
+        states = json.load(file)
+    columns = columns_from_states(states) if isinstance(states, list) else states
+    library = None if args.no_library else load_library(args.library)
+
+    vectorized = VectorizedProfile(profile, library, strict=not args.lenient)
+    start = time.perf_counter()
+    try:
+        decision = vectorized.decide(columns, args.entry_point)
+    except EvaluationError as error:
+        print(f"ERROR {error}", file=sys.stderr)
+        return 1
+    elapsed = 1000 * (time.perf_counter() - start)
+
+    names, counts = np.unique(decision.actions, return_counts=True)
+    for name, count in sorted(zip(names, counts), key=lambda item: -item[1]):
+        print(f"{name or '(value)':<20} {count:>8}")
+    print(f"{len(decision.actions)} state(s) in {elapsed:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,9 +28,12 @@ def create_config_tab(main_window):
     generate_btn.clicked.connect(main_window.generate_profile)
     save_btn = QPushButton("Save Profile")
     save_btn.clicked.connect(main_window.save_profile)
+    store_btn = QPushButton("Save to Store")
+    store_btn.clicked.connect(main_window.save_to_store)
     
     btn_layout.addWidget(generate_btn)
     btn_layout.addWidget(save_btn)
+    btn_layout.addWidget(store_btn)
     btn_layout.addStretch(1)
     
     config_layout.addWidget(btn_frame)
@@ -6,10 +6,10 @@ from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout,
                            QFileDialog, QMessageBox, QGroupBox, QComboBox, QLabel)
 from PyQt6.QtCore import Qt
 
-from generators.preflop import PreflopProfileGenerator
-from generators.flop import FlopProfileGenerator
-from generators.turn import TurnProfileGenerator
-from generators.river import RiverProfileGenerator
+from generators.profile_builder import ProfileBuilder
+from generators.section_cache import SectionCache
+from openppl.diff import diff_profiles, summarize
+from openppl.store import ProfileStore
 
 from ui.config_tab import create_config_tab
 from ui.preflop_tab import create_preflop_tab
@@ -36,10 +36,12 @@ class OpenHoldemProfileGenerator(QMainWindow):
         self.current_profile = "Personnalisé"
         
         # Create the generators
-        self.preflop_generator = PreflopProfileGenerator()
-        self.flop_generator = FlopProfileGenerator()
-        self.turn_generator = TurnProfileGenerator()
-        self.river_generator = RiverProfileGenerator()
+        # Sections whose settings did not change are reused from the cache between previews
+        self.profile_builder = ProfileBuilder(SectionCache())
+        
+        # Settings of the last generated profile, recorded with it in the profile store
+        self.generated_settings = None
+        self.profile_store = None
         
         # Setup the UI
         self.create_ui()
@@ -322,6 +324,9 @@ class OpenHoldemProfileGenerator(QMainWindow):
         self.call_15_25bb_vs_btn = 18
         self.call_15_25bb_vs_sb = 20
         
+        # Table-driven output (one rule set, thresholds looked up by stack size)
+        self.push_fold_tables = False
+        
     def create_ui(self):
         """Crée l'interface utilisateur principale"""
         # Create central widget with its layout
@@ -573,7 +578,9 @@ class OpenHoldemProfileGenerator(QMainWindow):
             "call_15_25bb_vs_mp": self.call_15_25bb_vs_mp,
             "call_15_25bb_vs_co": self.call_15_25bb_vs_co,
             "call_15_25bb_vs_btn": self.call_15_25bb_vs_btn,
-            "call_15_25bb_vs_sb": self.call_15_25bb_vs_sb
+            "call_15_25bb_vs_sb": self.call_15_25bb_vs_sb,
+            
+            "push_fold_tables": self.push_fold_tables
         }
     
     def collect_flop_settings(self):
@@ -643,28 +650,33 @@ class OpenHoldemProfileGenerator(QMainWindow):
             "aggression": self.aggression
         }
     
+    def collect_settings(self):
+        """Gather the settings of every street, in the format written by export_settings"""
+        return {
+            "preflop": self.collect_preflop_settings(),
+            "flop": self.collect_flop_settings(),
+            "turn": self.collect_turn_settings(),
+            "river": self.collect_river_settings(),
+        }
+    
     def generate_profile(self):
         """Generate the OpenHoldem profile based on current settings"""
-        # Get all settings from UI
-        preflop_settings = self.collect_preflop_settings()
-        flop_settings = self.collect_flop_settings()
-        turn_settings = self.collect_turn_settings()
-        river_settings = self.collect_river_settings()
-        
-        # Generate profile using the generators
-        preflop_profile = self.preflop_generator.generate_preflop_profile(preflop_settings)
-        flop_profile = self.flop_generator.generate_flop_profile(flop_settings)
-        turn_profile = self.turn_generator.generate_turn_profile(turn_settings)
-        river_profile = self.river_generator.generate_river_profile(river_settings)
+        # Generate profile using the generators (same code path as batch_generate.py)
+        self.generated_settings = self.collect_settings()
+        full_profile = self.profile_builder.generate_profile(self.generated_settings)
         
-        # Combine the profiles
-        full_profile = preflop_profile + "\n\n" + flop_profile + "\n\n" + turn_profile + "\n\n" + river_profile
+        # Compare with the previous preview before replacing it
+        previous_profile = self.preview_text.toPlainText()
         
         # Display in preview
         self.preview_text.setText(full_profile)
         
         # Update status bar
-        self.statusBar().showMessage("Profile generated successfully")
+        if previous_profile:
+            changes = summarize(diff_profiles(previous_profile, full_profile))
+            self.statusBar().showMessage(f"Profile generated successfully - {changes}")
+        else:
+            self.statusBar().showMessage("Profile generated successfully")
         
         QMessageBox.information(self, "Profile Generated", "OpenHoldem profile has been generated and is ready to save.")
         
@@ -691,17 +703,34 @@ class OpenHoldemProfileGenerator(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Save Error", f"Could not save profile: {str(e)}")
                 
+    def save_to_store(self):
+        """Save the generated profile and its settings to a content-addressed profile store"""
+        profile = self.preview_text.toPlainText()
+        if not profile.strip():
+            QMessageBox.warning(self, "Empty Profile", "Please generate a profile first.")
+            return
+        
+        # Ask for the store directory once per session
+        if self.profile_store is None:
+            store_dir = QFileDialog.getExistingDirectory(self, "Select Profile Store Directory")
+            if not store_dir:
+                return
+            self.profile_store = ProfileStore(store_dir)
+        
+        try:
+            entry = self.profile_store.put(profile, self.generated_settings, self.current_profile)
+            message = f"Profile stored as {entry['hash'][:12]} ({entry['new_bytes']} new bytes)"
+            QMessageBox.information(self, "Profile Stored", message)
+            self.statusBar().showMessage(message)
+        except Exception as e:
+            QMessageBox.critical(self, "Store Error", f"Could not store profile: {str(e)}")
+    
     def export_settings(self):
         """Export current settings to a JSON file for future use"""
         import json
         
         # Collect all settings
-        settings = {
-            "preflop": self.collect_preflop_settings(),
-            "flop": self.collect_flop_settings(),
-            "turn": self.collect_turn_settings(),
-            "river": self.collect_river_settings(),
-        }
+        settings = self.collect_settings()
         
         # Ask for save location
         file_path, _ = QFileDialog.getSaveFileName(
@@ -788,6 +817,12 @@ class OpenHoldemProfileGenerator(QMainWindow):
                 if hasattr(self, slider_name) and setting_name in preflop:
                     slider = getattr(self, slider_name)
                     slider.setValue(preflop[setting_name])
+            
+            # Table-driven push/fold output
+            if "push_fold_tables" in preflop:
+                self.push_fold_tables = bool(preflop["push_fold_tables"])
+                if hasattr(self, "push_fold_tables_checkbox"):
+                    self.push_fold_tables_checkbox.setChecked(self.push_fold_tables)
         
         # Process flop settings
         if "flop" in settings:
@@ -973,6 +1008,9 @@ class OpenHoldemProfileGenerator(QMainWindow):
             if index >= 0:
                 self.ep1_sizing_combo.setCurrentIndex(index)
         
+        if hasattr(self, "push_fold_tables_checkbox"):
+            self.push_fold_tables_checkbox.setChecked(self.push_fold_tables)
+        
         # Similarly for all other UI components
     
     def add_import_export_buttons(self, config_layout):
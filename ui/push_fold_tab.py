@@ -1,7 +1,7 @@
 """
 Onglet des paramètres Push/Fold pour l'application OpenHoldem Profile Generator
 """
-from PyQt6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+from PyQt6.QtWidgets import QCheckBox, QTabWidget, QVBoxLayout, QWidget
 from ui.components import (create_scroll_area, create_push_fold_position_frame,
                         create_push_fold_call_frame)
 
@@ -17,6 +17,15 @@ def create_push_fold_tab(main_window):
     """
     push_fold_scroll, push_fold_widget, push_fold_layout = create_scroll_area()
     
+    # Table-driven output: one rule set, thresholds looked up by stack size
+    main_window.push_fold_tables_checkbox = QCheckBox("Table-driven push/fold functions")
+    main_window.push_fold_tables_checkbox.setToolTip(
+        "Write one push/fold rule set reading its thresholds from per-position stack tables "
+        "instead of one function per stack size")
+    main_window.push_fold_tables_checkbox.setChecked(main_window.push_fold_tables)
+    main_window.push_fold_tables_checkbox.toggled.connect(lambda v: setattr(main_window, 'push_fold_tables', v))
+    push_fold_layout.addWidget(main_window.push_fold_tables_checkbox)
+    
     # Use a notebook for organization
     pf_notebook = QTabWidget()
     push_fold_layout.addWidget(pf_notebook)